@@ -1,103 +1,167 @@
 #!/usr/bin/env python3
-"""Compare completeness of translation files between main and develop branches"""
+"""Compare completeness of translation files between main and develop branches
+
+Branches are read either from checkout directories or, with --git, straight
+from the git object store, where each distinct locale blob is checked once.
+"""
+import argparse
 import json
+import os
 import sys
+import time
 from pathlib import Path
-from validate_locales import get_all_keys
-from check_english import get_all_strings, is_likely_english_match, should_skip_key
+from locale_engine import (
+    EXCLUDED_FILES,
+    EnglishReference,
+    LocaleData,
+    english_match,
+    load_locale,
+    load_reference,
+    map_locales
+)
+from locale_git import GitBlobReader
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
 
 def check_file_completeness(lang_code, branch_path, en_keys, en_strings):
     """Check if a translation file is complete in a specific branch directory"""
-    file_path = Path(branch_path) / f"{lang_code}.json"
+    ref = EnglishReference(LocaleData("en", en_keys, en_strings))
+    return _check_completeness(ref, lang_code, branch_path)
+
+def _check_completeness(ref, lang_code, branch_path):
+    """Check a branch's translation file against a prepared English reference"""
+    start = time.perf_counter()
+    locale = load_locale(lang_code, branch_path)
+    with phase("check_completeness"):
+        result = _locale_completeness(ref, locale)
+    record_locale(f"{branch_path}:{lang_code}", time.perf_counter() - start, len(locale.strings))
+    return result
+
+def _locale_completeness(ref, locale):
+    """Check a loaded translation against a prepared English reference"""
+    if locale.error:
+        return False, 0
+    
+    columns = ref.columns(locale)
     
-    if not file_path.exists():
+    # Check for missing and extra keys
+    if columns.present != ref.table.all or columns.extra:
         return False, 0
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Get all keys from this language file
-        lang_keys = set(get_all_keys(data))
-        lang_strings = dict(get_all_strings(data))
-        
-        # Check for missing keys
-        missing_keys = en_keys - lang_keys
-        if missing_keys:
-            return False, 0
-        
-        # Check for extra keys
-        extra_keys = lang_keys - en_keys
-        if extra_keys:
+    # Check for untranslated keys (English stubs)
+    values = columns.values
+    for key, i in ref.string_ids:
+        lang_value = values[i]
+        if lang_value is None:
             return False, 0
         
-        # Check for untranslated keys (English stubs)
-        for key, en_value in en_strings.items():
-            if key not in lang_strings:
-                return False, 0
-            
-            # Skip keys that should be excluded from English detection
-            if should_skip_key(key, en_value):
-                continue
-            
-            # Check if the translation matches English
-            lang_value = lang_strings[key]
-            is_match, _ = is_likely_english_match(en_value, lang_value)
-            
-            if is_match:
-                return False, 0
+        # Skip keys that should be excluded from English detection
+        entry = ref.entries[key]
+        if entry.skip:
+            continue
         
-        # All checks passed - file is complete
-        total_keys = len(en_keys)
-        return True, total_keys
-        
-    except (json.JSONDecodeError, Exception):
-        return False, 0
+        # Check if the translation matches English
+        if english_match(entry, lang_value):
+            return False, 0
+    
+    # All checks passed - file is complete
+    return True, len(ref.table)
 
-def get_complete_languages(branch_path, en_keys, en_strings):
-    """Get set of complete language codes for a branch"""
-    complete = {}
+def _discover_branch_languages(branch_path):
+    """Get sorted language codes of the translation files in a branch directory"""
     branch_dir = Path(branch_path)
-    
     if not branch_dir.exists():
-        return complete
-    
-    # Discover all language files in the branch
-    json_files = list(branch_dir.glob("*.json"))
-    excluded_files = {"en", "translation_stats"}
-    
-    for json_file in json_files:
-        lang_code = json_file.stem
-        if lang_code not in excluded_files:
-            is_complete, key_count = check_file_completeness(
-                lang_code, branch_path, en_keys, en_strings
-            )
-            if is_complete:
-                complete[lang_code] = key_count
+        return []
     
-    return complete
+    return sorted(
+        json_file.stem
+        for json_file in branch_dir.glob("*.json")
+        if json_file.stem not in EXCLUDED_FILES
+    )
 
-def compare_branches(main_path, develop_path):
+def _collect_complete(tasks, results):
+    """Return {lang: key count} for the tasks whose file is complete"""
+    return {
+        lang: key_count
+        for (lang, _), (is_complete, key_count) in zip(tasks, results)
+        if is_complete
+    }
+
+def get_complete_languages(branch_path, en_keys, en_strings, jobs=1):
+    """Get set of complete language codes for a branch"""
+    ref = EnglishReference(LocaleData("en", en_keys, en_strings))
+    tasks = [(lang, branch_path) for lang in _discover_branch_languages(branch_path)]
+    return _collect_complete(tasks, map_locales(ref, _check_completeness, tasks, jobs))
+
+def compare_branches(main_path, develop_path, jobs=1):
     """Compare completeness between main and develop branches"""
     # Load English file as reference (use main branch as source of truth)
-    en_file = Path(main_path) / "en.json"
-    if not en_file.exists():
-        en_file = Path(develop_path) / "en.json"
+    en_dir = main_path
+    if not (Path(main_path) / "en.json").exists():
+        en_dir = develop_path
     
-    if not en_file.exists():
+    if not (Path(en_dir) / "en.json").exists():
         print("[ERROR] en.json not found in either branch")
         return None
     
-    with open(en_file, 'r', encoding='utf-8') as f:
-        en_data = json.load(f)
-    
-    en_keys = set(get_all_keys(en_data))
-    en_strings = dict(get_all_strings(en_data))
-    
-    # Get complete languages from each branch
-    main_complete = get_complete_languages(main_path, en_keys, en_strings)
-    develop_complete = get_complete_languages(develop_path, en_keys, en_strings)
+    ref = load_reference(en_dir)
+    if ref.locale.error:
+        print(f"[ERROR] Could not load en.json: {ref.locale.error}")
+        return None
     
+    # Get complete languages from each branch, checking both in one pool
+    main_tasks = [(lang, main_path) for lang in _discover_branch_languages(main_path)]
+    develop_tasks = [(lang, develop_path) for lang in _discover_branch_languages(develop_path)]
+    results = map_locales(ref, _check_completeness, main_tasks + develop_tasks, jobs)
+    main_complete = _collect_complete(main_tasks, results[:len(main_tasks)])
+    develop_complete = _collect_complete(develop_tasks, results[len(main_tasks):])
+    return _compare_complete(main_complete, develop_complete)
+
+def get_complete_languages_at_ref(reader, ref, git_ref, verdicts=None):
+    """Get {lang: key count} of the complete languages at a git ref
+
+    verdicts maps blob SHAs to completeness results and is shared between
+    refs, so a file that is identical on several refs is checked once.
+    """
+    if verdicts is None:
+        verdicts = {}
+    complete = {}
+    for lang, sha in sorted(reader.locale_shas(git_ref).items()):
+        if lang in EXCLUDED_FILES:
+            continue
+        if sha not in verdicts:
+            start = time.perf_counter()
+            locale = reader.load_blob(lang, sha)
+            with phase("check_completeness"):
+                verdicts[sha] = _locale_completeness(ref, locale)
+            record_locale(f"{git_ref}:{lang}", time.perf_counter() - start, len(locale.strings))
+        is_complete, key_count = verdicts[sha]
+        if is_complete:
+            complete[lang] = key_count
+    return complete
+
+def compare_refs(main_ref, develop_ref, repo_dir="."):
+    """Compare completeness between two git refs without checking them out"""
+    with GitBlobReader(repo_dir) as reader:
+        # Use main branch as source of truth for English
+        en_ref = main_ref if "en" in reader.locale_shas(main_ref) else develop_ref
+        if "en" not in reader.locale_shas(en_ref):
+            print("[ERROR] en.json not found in either branch")
+            return None
+        
+        en = reader.load_locale(en_ref, "en")
+        with phase("reference"):
+            ref = EnglishReference(en)
+        if ref.locale.error:
+            print(f"[ERROR] Could not load en.json: {ref.locale.error}")
+            return None
+        
+        verdicts = {}
+        main_complete = get_complete_languages_at_ref(reader, ref, main_ref, verdicts)
+        develop_complete = get_complete_languages_at_ref(reader, ref, develop_ref, verdicts)
+    return _compare_complete(main_complete, develop_complete)
+
+def _compare_complete(main_complete, develop_complete):
+    """Build the comparison result from each branch's complete languages"""
     # Compare results
     ready_to_move = {
         lang: count 
@@ -127,17 +191,37 @@ def compare_branches(main_path, develop_path):
 
 def main():
     """Main function to run branch comparison"""
-    if len(sys.argv) < 3:
-        print("Usage: check_complete_compare.py <main_branch_path> <develop_branch_path>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Compare translation completeness between main and develop branches"
+    )
+    parser.add_argument("main_path", help="Checkout of the main branch (git ref with --git)")
+    parser.add_argument("develop_path", help="Checkout of the develop branch (git ref with --git)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--git", action="store_true",
+                        help="Read both branches from the git object store instead of checkouts")
+    parser.add_argument("--repo", default=".",
+                        help="Locale directory inside the git repository, with --git (default: .)")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
     
-    main_path = sys.argv[1]
-    develop_path = sys.argv[2]
+    main_path = args.main_path
+    develop_path = args.develop_path
     
     print("[BRANCH COMPARISON - Completeness Status]")
     print()
     
-    results = compare_branches(main_path, develop_path)
+    with profiling(args, "check_complete_compare"):
+        if args.git:
+            try:
+                results = compare_refs(main_path, develop_path, args.repo)
+            except RuntimeError as e:
+                print(f"[ERROR] git failed: {e}")
+                sys.exit(1)
+        else:
+            # Worker processes would not report to the profiler
+            jobs = 1 if args.profile else args.jobs
+            results = compare_branches(main_path, develop_path, jobs)
     
     if results is None:
         sys.exit(1)
@@ -1,12 +1,43 @@
 #!/usr/bin/env python3
-"""Generate translation statistics using functions from check_english.py"""
+"""Generate translation statistics using functions from check_english.py
+
+Each language is read from several branch checkouts and overlaid in
+precedence order. Every branch's file is flattened once into dotted key maps
+and string lookups walk the branches from highest precedence down, so no
+merged tree is ever built or copied.
+"""
+import argparse
 import json
+import time
+from collections import namedtuple
 from pathlib import Path
-from check_english import (
-    get_all_strings,
-    is_likely_english_match,
-    should_skip_key
+from check_english import get_all_strings
+from locale_checkers import english_match
+from locale_engine import (
+    GENERATED_FILES,
+    EnglishReference,
+    LocaleData,
+    discover_languages,
+    flatten
 )
+from locale_async import DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT, load_sources, parse_source
+from locale_bundle import BUNDLE_FILE, build_bundle, write_bundle
+from locale_git import GitBlobReader
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
+from locale_reuse import ReuseIndex
+from locale_search import SEARCH_FILE, SearchIndex
+
+# Branch checkouts to read, highest precedence first
+DEFAULT_BRANCHES = ['develop', 'main']
+
+STATS_FILE = "translation_stats.json"
+
+# One branch's locale file flattened for overlay lookups
+Layer = namedtuple("Layer", [
+    "strings",  # {key path: string value}
+    "leaves",   # Key paths holding any value that is not an object, strings included
+    "tables",   # Key paths holding an object, empty ones included
+])
 
 def deep_merge(main, develop):
     """Merge develop branch data into main, with develop taking precedence"""
@@ -37,12 +68,91 @@ def deep_merge(main, develop):
     
     return merged
 
-def calculate_stats(lang_code, en_strings, lang_data):
-    """Calculate translation statistics for a language"""
+def flatten_layer(data, prefix='', layer=None):
+    """Flatten a nested dict into a Layer in one walk"""
+    if layer is None:
+        layer = Layer({}, set(), set())
+    for k, v in data.items():
+        key_path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            layer.tables.add(key_path)
+            flatten_layer(v, key_path, layer)
+        else:
+            layer.leaves.add(key_path)
+            if isinstance(v, str):
+                layer.strings[key_path] = v
+    return layer
+
+class BranchOverlay:
+    """Read-only view of several flattened branches, as deep_merge() would combine them
+
+    A key takes its value from the highest precedence branch that defines it.
+    A value that is not an object hides everything lower branches have below
+    that path, and an object hides a lower branch's value at that exact path.
+    """
+
+    def __init__(self, layers):
+        """layers: Layer objects, highest precedence first"""
+        self.layers = layers
+
+    def get(self, key, default=None):
+        """Return the string value of a dotted key path, or default"""
+        for layer in self.layers:
+            value = layer.strings.get(key)
+            if value is not None:
+                return value
+            if key in layer.leaves or key in layer.tables or self._hidden(layer, key):
+                return default
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def keys(self):
+        """Return every key path with a visible string value, highest precedence branch first"""
+        keys = {}
+        for layer in self.layers:
+            for key in layer.strings:
+                if key not in keys and self.get(key) is not None:
+                    keys[key] = None
+        return list(keys)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    @staticmethod
+    def _hidden(layer, key):
+        """Check if a layer holds a non-object value above a key path"""
+        # Only the deepest path the layer defines matters; usually the parent is an object
+        dot = key.rfind('.')
+        while dot != -1:
+            parent = key[:dot]
+            if parent in layer.tables:
+                return False
+            if parent in layer.leaves:
+                return True
+            dot = key.rfind('.', 0, dot)
+        return False
+
+def english_reference(en_data):
+    """Compile the EnglishReference of loaded en.json data"""
+    keys, strings = flatten(en_data)
+    return EnglishReference(LocaleData("en", set(keys), strings))
+
+def calculate_stats(lang_code, ref, lang_data, reuse=None):
+    """Calculate translation statistics for a language
+
+    ref is the EnglishReference (see english_reference()). With a ReuseIndex
+    over its strings, the result also suggests an existing translation of the
+    same English text for each missing key.
+    """
     if lang_code == 'en':
         # For English, return 100% as it's the reference
-        en_strings_list = list(en_strings.items())
-        return {
+        en_strings_list = list(ref.strings.items())
+        stats = {
             'total': len(en_strings_list),
             'translated': len(en_strings_list),
             'missing': 0,
@@ -51,9 +161,15 @@ def calculate_stats(lang_code, en_strings, lang_data):
             'missingKeys': [],
             'untranslatedKeys': []
         }
+        if reuse is not None:
+            stats['suggestions'] = {}
+        return stats
     
     # Get all string values from target language
-    lang_strings = dict(get_all_strings(lang_data))
+    if isinstance(lang_data, BranchOverlay):
+        lang_strings = lang_data
+    else:
+        lang_strings = dict(get_all_strings(lang_data))
     
     total = 0
     translated = 0
@@ -62,22 +178,20 @@ def calculate_stats(lang_code, en_strings, lang_data):
     untranslated_keys = []
     
     # Compare each English string with the translation
-    for key, en_value in en_strings.items():
+    for key, entry in ref.entries.items():
         # Skip keys that should be excluded
-        if should_skip_key(key, en_value):
+        if entry.skip:
             continue
         
         total += 1
         
-        if key not in lang_strings:
+        lang_value = lang_strings.get(key)
+        if lang_value is None:
             # Key is missing
             missing_keys.append(key)
         else:
-            lang_value = lang_strings[key]
             # Check if translation matches English
-            is_match, _ = is_likely_english_match(en_value, lang_value)
-            
-            if is_match:
+            if english_match(entry, lang_value) is not None:
                 untranslated += 1
                 untranslated_keys.append(key)
             else:
@@ -85,7 +199,7 @@ def calculate_stats(lang_code, en_strings, lang_data):
     
     completeness = f"{((translated / total) * 100):.1f}" if total > 0 else '0.0'
     
-    return {
+    stats = {
         'total': total,
         'translated': translated,
         'missing': len(missing_keys),
@@ -94,6 +208,15 @@ def calculate_stats(lang_code, en_strings, lang_data):
         'missingKeys': missing_keys,
         'untranslatedKeys': untranslated_keys
     }
+    if reuse is not None:
+        # Existing translations of the same English text, for the missing-keys export
+        stats['suggestions'] = {}
+        for key in missing_keys:
+            suggestion = reuse.suggest(key, lang_strings)
+            if suggestion:
+                source, value = suggestion
+                stats['suggestions'][key] = {'from': source, 'value': value}
+    return stats
 
 def load_language_file(branch, lang_code):
     """Load a language file from a specific branch"""
@@ -101,7 +224,7 @@ def load_language_file(branch, lang_code):
         # Try to read from branch-specific path
         # In workflow, we'll have both branches checked out
         path = f"{branch}/{lang_code}.json" if Path(f"{branch}/{lang_code}.json").exists() else f"{lang_code}.json"
-        with open(path, 'r', encoding='utf-8') as f:
+        with phase("decode"), open(path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
         return None
@@ -109,49 +232,207 @@ def load_language_file(branch, lang_code):
         print(f"[WARN] Failed to parse {lang_code}.json from {branch}: {e}")
         return None
 
-def generate_stats():
-    """Generate translation statistics for all language files, merging main and develop branches"""
-    # Load English as reference (from current branch, should be same in both)
-    en_data = None
-    for branch in ['main', 'develop', '.']:
-        en_data = load_language_file(branch, 'en')
+def load_ref_language_file(reader, ref, lang_code):
+    """Load a language file as it is at a git ref, read through a GitBlobReader"""
+    sha = reader.locale_shas(ref).get(lang_code)
+    if sha is None:
+        return None
+    content = reader.blob(sha)
+    try:
+        with phase("decode"):
+            return json.loads(content.decode('utf-8'))
+    except ValueError as e:
+        print(f"[WARN] Failed to parse {lang_code}.json from {ref}: {e}")
+        return None
+
+def find_languages(branches, reader=None):
+    """Return the language codes found in any branch, en first
+
+    Without a reader, branches are checkout directories and the current
+    directory is searched too; with one, they are git refs.
+    """
+    found = set()
+    if reader is None:
+        for branch in [*branches, '.']:
+            found.update(discover_languages(branch))
+    else:
+        for ref in branches:
+            found.update(reader.locale_shas(ref))
+    found -= GENERATED_FILES
+    found.discard('en')
+    return ['en', *sorted(found)]
+
+def load_branch_data(branches, lang_code):
+    """Load a language from every branch that has it, highest precedence first"""
+    datas = [data for data in (load_language_file(branch, lang_code) for branch in branches) if data]
+
+    # If no branch has it, try current directory
+    if not datas:
+        data = load_language_file('.', lang_code)
+        if data:
+            datas.append(data)
+    return datas
+
+def overlay_data(datas):
+    """Flatten loaded branch data, highest precedence first, into a BranchOverlay or None"""
+    layers = []
+    for data in datas:
+        with phase("flatten"):
+            layers.append(flatten_layer(data))
+    return BranchOverlay(layers) if layers else None
+
+def load_overlay(branches, lang_code):
+    """Load a language from every branch and overlay them, or return None"""
+    return overlay_data(load_branch_data(branches, lang_code))
+
+def load_ref_overlay(reader, refs, lang_code):
+    """Load a language from every git ref and overlay them, or return None"""
+    layers = []
+    seen = set()
+    for ref in refs:
+        sha = reader.locale_shas(ref).get(lang_code)
+        # A blob already overlaid from a higher precedence ref adds nothing
+        if sha is None or sha in seen:
+            continue
+        seen.add(sha)
+        data = load_ref_language_file(reader, ref, lang_code)
+        if data:
+            with phase("flatten"):
+                layers.append(flatten_layer(data))
+    return BranchOverlay(layers) if layers else None
+
+def load_english(branches, reader=None):
+    """Load the English reference, or return None
+
+    English is read from the lowest precedence branch that has it; it should
+    be the same in all of them.
+    """
+    if reader is None:
+        for branch in [*reversed(branches), '.']:
+            en_data = load_language_file(branch, 'en')
+            if en_data:
+                return en_data
+        return None
+    for ref in reversed(branches):
+        en_data = load_ref_language_file(reader, ref, 'en')
         if en_data:
-            break
-    
+            return en_data
+    return None
+
+def generate_stats(branches=DEFAULT_BRANCHES, languages=None, reader=None, loaded=None):
+    """Generate translation statistics for all language files, overlaying the branches
+
+    branches are checkout directories, highest precedence first, or git refs
+    read through reader when one is given. languages defaults to every
+    language found in them. loaded holds files fetched beforehand by
+    locale_async.load_sources(), {lang: [data, highest precedence first]};
+    branches then only name the sources in messages.
+    """
+    if loaded is not None:
+        en_data = loaded['en'][-1] if loaded.get('en') else None
+    else:
+        en_data = load_english(branches, reader)
     if not en_data:
         print("[ERROR] Could not load en.json from any branch")
         return {}
-    
-    en_strings = dict(get_all_strings(en_data))
-    
-    # Get list of all language files to check
-    language_files = ['en', 'de', 'es', 'fr', 'ja', 'ko', 'pt']
-    
+
+    ref = english_reference(en_data)
+    en_strings = ref.strings
+    reuse = ReuseIndex(ref)
+
+    if languages is None:
+        languages = list(loaded) if loaded is not None else find_languages(branches, reader)
+
     stats = {}
-    
-    for lang_code in language_files:
-        # Load from both branches
-        main_data = load_language_file('main', lang_code)
-        develop_data = load_language_file('develop', lang_code)
-        
-        # If neither exists, try current directory
-        if not main_data and not develop_data:
-            main_data = load_language_file('.', lang_code)
-        
-        # Merge data (develop takes precedence)
-        lang_data = deep_merge(main_data, develop_data) if main_data or develop_data else None
-        
+    overlays = {}
+
+    for lang_code in languages:
+        if lang_code == 'en':
+            stats[lang_code] = calculate_stats(lang_code, ref, en_data, reuse)
+            continue
+
+        start = time.perf_counter()
+        if loaded is not None:
+            lang_data = overlay_data(loaded.get(lang_code, []))
+        elif reader is None:
+            lang_data = load_overlay(branches, lang_code)
+        else:
+            lang_data = load_ref_overlay(reader, branches, lang_code)
         if lang_data:
-            stats[lang_code] = calculate_stats(lang_code, en_strings, lang_data)
+            overlays[lang_code] = lang_data
+            with phase("calculate_stats"):
+                stats[lang_code] = calculate_stats(lang_code, ref, lang_data, reuse)
+            record_locale(lang_code, time.perf_counter() - start, stats[lang_code]['total'])
         else:
-            print(f"[WARN] {lang_code}.json not found in main or develop branches, skipping...")
-    
+            print(f"[WARN] {lang_code}.json not found in {' or '.join(reversed(branches))} branches, skipping...")
+
     # Write stats to JSON file
-    with open("translation_stats.json", 'w', encoding='utf-8') as f:
+    with phase("write"), open(STATS_FILE, 'w', encoding='utf-8') as f:
         json.dump(stats, f, indent=2, ensure_ascii=False)
-    
-    print(f"[OK] Generated translation_stats.json with statistics for {len(stats)} languages")
+
+    # The same data in one compact file for the dashboard
+    with phase("bundle"):
+        write_bundle(build_bundle(en_strings, overlays, stats), BUNDLE_FILE)
+
+    with phase("search_index"):
+        merged = {
+            lang_code: en_strings if lang_code == 'en'
+            else {key: overlays[lang_code].get(key) for key in overlays[lang_code].keys()}
+            for lang_code in stats
+        }
+        SearchIndex.from_locales(merged).save(SEARCH_FILE)
+
+    print(f"[OK] Generated {STATS_FILE}, {BUNDLE_FILE} and {SEARCH_FILE} "
+          f"with statistics for {len(stats)} languages")
     return stats
 
+def main():
+    parser = argparse.ArgumentParser(description="Generate translation statistics across branch checkouts")
+    parser.add_argument("--branch", action="append", dest="branches",
+                        help="Branch checkout directory, highest precedence first; repeatable "
+                             f"(default: {' '.join(DEFAULT_BRANCHES)})")
+    parser.add_argument("--lang", action="append", dest="languages",
+                        help="Language code to include; repeatable (default: all found)")
+    parser.add_argument("--git", action="store_true",
+                        help="Treat branches as git refs and read them from the object store")
+    parser.add_argument("--source", action="append", dest="sources", metavar="SPEC",
+                        help="Load concurrently from a directory, git:REF or http(s) raw-file "
+                             "base URL instead of --branch, highest precedence first; repeatable")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Files fetched at once with --source (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help=f"Seconds allowed per --source file (default: {DEFAULT_TIMEOUT})")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "generate_stats"):
+        return _run(args)
+
+def _run(args):
+    """Generate the statistics selected by parsed command line arguments"""
+    if args.sources:
+        sources = [parse_source(spec, args.timeout) for spec in args.sources]
+        try:
+            loaded, errors = load_sources(sources, args.languages, args.concurrency)
+        except RuntimeError as e:
+            print(f"[ERROR] git failed: {e}")
+            return 1
+        for (name, lang_code), error in errors.items():
+            print(f"[WARN] Failed to load {lang_code}.json from {name}: {error}")
+        generate_stats([source.name for source in sources], args.languages, loaded=loaded)
+        return 0
+
+    branches = args.branches or DEFAULT_BRANCHES
+    if not args.git:
+        generate_stats(branches, args.languages)
+        return 0
+    try:
+        with GitBlobReader() as reader:
+            generate_stats(branches, args.languages, reader)
+    except RuntimeError as e:
+        print(f"[ERROR] git failed: {e}")
+        return 1
+    return 0
+
 if __name__ == "__main__":
-    generate_stats()
+    exit(main())
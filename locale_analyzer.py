@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Single-scan string analyzer shared by every per-string check
+
+analyze() walks a string's placeholders once and returns every feature the
+checks use, memoized by string value so a string that appears in many
+locales (or many keys) is analyzed only once.
+
+The checks historically use two placeholder patterns: find_placeholders()
+matches {name} with word characters only, while normalize_for_comparison()
+strips any {...} without a closing brace inside. Both results come from the
+same scan: every strict {name} ends at the closing brace of a broad {...}
+match, so it is the part of that match after its last '{'.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# Broad placeholder pattern used when normalizing for comparison
+_BROAD = re.compile(r'\{([^}]+)\}')
+_WORD = re.compile(r'\w+')
+_EMOJI_OR_SPACE = re.compile(r'[\U0001F300-\U0001F9FF\U00002600-\U000026FF\U00002700-\U000027BF\s]*')
+_TECHNICAL = re.compile(r'[A-Z_]+')
+
+ANALYZE_CACHE_SIZE = 1 << 16
+
+StringFeatures = namedtuple("StringFeatures", [
+    "placeholders",   # Names of {name} placeholders in order, repeats included
+    "spans",          # (start, end) of each of those placeholders
+    "stripped",       # Text with every {...} removed, then stripped
+    "emoji_only",     # Only emoji and whitespace, and not blank
+    "technical",      # Stripped text is only A-Z and underscores, e.g. "USER_ID"
+    "length",         # Length in code points
+    "utf16_length",   # Length in UTF-16 code units, as Discord counts
+])
+
+
+@lru_cache(maxsize=ANALYZE_CACHE_SIZE)
+def analyze(text):
+    """Return the StringFeatures of a string"""
+    names = []
+    spans = []
+    parts = []
+    last = 0
+    for match in _BROAD.finditer(text):
+        start, end = match.span()
+        parts.append(text[last:start])
+        last = end
+
+        inner = match.group(1)
+        brace = inner.rfind("{")
+        name = inner[brace + 1:]
+        if name and _WORD.fullmatch(name):
+            names.append(name)
+            spans.append((start + 1 + brace, end))
+
+    trimmed = text.strip()
+    if parts:
+        parts.append(text[last:])
+        stripped = "".join(parts).strip()
+    else:
+        stripped = trimmed
+
+    utf16_length = len(text) if text.isascii() else len(text.encode('utf-16-le')) // 2
+    return StringFeatures(
+        tuple(names),
+        tuple(spans),
+        stripped,
+        bool(trimmed) and _EMOJI_OR_SPACE.fullmatch(text) is not None,
+        _TECHNICAL.fullmatch(trimmed) is not None,
+        len(text),
+        utf16_length,
+    )
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Concurrent loading of locale files from many directories, git refs and HTTP mirrors
+
+AsyncLocaleLoader fetches every (source, language) pair at once on an
+asyncio event loop instead of one file after another, so loading dozens of
+branches and locales takes about as long as the slowest fetch:
+
+- DirectorySource reads <dir>/<lang>.json in the default thread pool.
+- GitSource reads blobs of a ref through a shared GitBlobReader. Its one
+  cat-file process handles a single request at a time, so those reads are
+  serialized; they are local and fast.
+- HttpSource GETs <base>/<lang>.json from a raw-file mirror through
+  HttpClient, which keeps idle connections alive and reuses them.
+
+A semaphore bounds the fetches in flight. Each source has its own timeout.
+Requests for a pair that is already being fetched wait on that fetch
+instead of starting another.
+"""
+import asyncio
+import gzip
+import json
+import ssl
+import threading
+from urllib.parse import urlsplit
+from locale_engine import GENERATED_FILES, discover_languages
+from locale_git import GitBlobReader
+from locale_profile import phase
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 10.0
+
+# Idle keep-alive connections kept per host
+MAX_IDLE_PER_HOST = 8
+
+
+class HttpError(Exception):
+    """An HTTP response that is neither a success nor a 404"""
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 GET client with a keep-alive connection pool per host"""
+
+    def __init__(self, max_idle=MAX_IDLE_PER_HOST):
+        self.max_idle = max_idle
+        self._idle = {}  # (scheme, host, port) -> [(reader, writer)]
+        self._ssl = None
+
+    async def _connect(self, scheme, host, port):
+        if scheme == "https" and self._ssl is None:
+            self._ssl = ssl.create_default_context()
+        return await asyncio.open_connection(host, port, ssl=self._ssl if scheme == "https" else None)
+
+    async def get(self, url):
+        """Return (status, body) of a GET request"""
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        host = parts.hostname
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+        request = (f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                   "Accept-Encoding: gzip\r\nConnection: keep-alive\r\n\r\n").encode('ascii')
+
+        pool = self._idle.setdefault((scheme, host, port), [])
+        while True:
+            reused = bool(pool)
+            reader, writer = pool.pop() if reused else await self._connect(scheme, host, port)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, body, keep_alive = await self._read_response(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                if reused:
+                    continue  # The server closed an idle connection; retry on a fresh one
+                raise
+            except BaseException:
+                # Timed out or cancelled mid-response: the connection can't be reused
+                writer.close()
+                raise
+            if keep_alive and len(pool) < self.max_idle:
+                pool.append((reader, writer))
+            else:
+                writer.close()
+            if headers.get("content-encoding") == "gzip":
+                body = gzip.decompress(body)
+            return status, body
+
+    @staticmethod
+    async def _read_response(reader):
+        """Return (status, headers, body, keep_alive) of one response"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before the response")
+        version, status = status_line.split(None, 2)[:2]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # Trailers
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return int(status), headers, body, keep_alive
+
+    async def close(self):
+        """Close every idle connection"""
+        for pool in self._idle.values():
+            for _, writer in pool:
+                writer.close()
+        self._idle.clear()
+
+
+class DirectorySource:
+    """Locale files in a local directory, such as a branch checkout"""
+
+    def __init__(self, path, timeout=DEFAULT_TIMEOUT):
+        self.path = path
+        self.name = path
+        self.timeout = timeout
+
+    async def languages(self, loader):
+        """Return the language codes of the *.json files in the directory"""
+        return await asyncio.get_running_loop().run_in_executor(None, discover_languages, self.path)
+
+    async def fetch(self, loader, lang_code):
+        """Return the bytes of <path>/<lang>.json, or None if it does not exist"""
+        def read():
+            try:
+                with open(f"{self.path}/{lang_code}.json", 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+        return await asyncio.get_running_loop().run_in_executor(None, read)
+
+
+class GitSource:
+    """Locale files of a git ref, read through the loader's GitBlobReader"""
+
+    def __init__(self, ref, timeout=DEFAULT_TIMEOUT):
+        self.ref = ref
+        self.name = f"git:{ref}"
+        self.timeout = timeout
+
+    async def _call(self, loader, func, *args):
+        """Run a GitBlobReader call in a thread, one at a time
+
+        The lock is taken in the thread, so a call abandoned by a timeout
+        still finishes before the next one uses the cat-file process.
+        """
+        def call():
+            with loader.git_lock:
+                return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+
+    async def languages(self, loader):
+        return list(await self._call(loader, loader.git_reader().locale_shas, self.ref))
+
+    async def fetch(self, loader, lang_code):
+        """Return the blob of <lang>.json at the ref, or None if it has none"""
+        reader = loader.git_reader()
+        sha = (await self._call(loader, reader.locale_shas, self.ref)).get(lang_code)
+        if sha is None:
+            return None
+        return await self._call(loader, reader.blob, sha)
+
+
+class HttpSource:
+    """Locale files served as <base url>/<lang>.json, e.g. a raw.githubusercontent.com branch"""
+
+    def __init__(self, base_url, timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.name = self.base_url
+        self.timeout = timeout
+
+    async def languages(self, loader):
+        """A mirror can't be listed; languages must come from another source or --lang"""
+        return None
+
+    async def fetch(self, loader, lang_code):
+        """Return the body of <base>/<lang>.json, or None on a 404"""
+        status, body = await loader.http.get(f"{self.base_url}/{lang_code}.json")
+        if status == 404:
+            return None
+        if not 200 <= status < 300:
+            raise HttpError(f"HTTP {status}")
+        return body
+
+
+def parse_source(spec, timeout=DEFAULT_TIMEOUT):
+    """Return the source for a command line spec: a directory, git:REF or an http(s) URL"""
+    if spec.startswith(("http://", "https://")):
+        return HttpSource(spec, timeout)
+    if spec.startswith("git:"):
+        return GitSource(spec[len("git:"):], timeout)
+    return DirectorySource(spec, timeout)
+
+
+class AsyncLocaleLoader:
+    """Fetch locale files from many sources concurrently
+
+    Use as an async context manager so pooled connections and the git
+    process are released.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, repo_dir="."):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.http = HttpClient()
+        self.git_lock = threading.Lock()
+        self.repo_dir = repo_dir
+        self.errors = {}      # (source name, lang) -> error message
+        self._git = None
+        self._in_flight = {}  # (source name, lang) -> Task
+
+    def git_reader(self):
+        """Return the shared GitBlobReader, starting it on first use"""
+        if self._git is None:
+            self._git = GitBlobReader(self.repo_dir)
+        return self._git
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.http.close()
+        if self._git is not None:
+            self._git.close()
+
+    async def _fetch(self, source, lang_code):
+        async with self.semaphore:
+            try:
+                return await asyncio.wait_for(source.fetch(self, lang_code), source.timeout)
+            except asyncio.TimeoutError:
+                self.errors[source.name, lang_code] = f"timed out after {source.timeout}s"
+            except (OSError, ValueError, RuntimeError, HttpError) as e:
+                self.errors[source.name, lang_code] = str(e) or type(e).__name__
+            return None
+
+    async def fetch(self, source, lang_code):
+        """Return the bytes of a source's locale file, or None if it is missing or failed
+
+        Failures are recorded in errors. Concurrent requests for the same
+        file share one fetch.
+        """
+        key = (source.name, lang_code)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(source, lang_code))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await task
+
+    async def languages(self, sources):
+        """Return every language code listed by any source, en first"""
+        found = set()
+        for listed in await asyncio.gather(*(source.languages(self) for source in sources)):
+            found.update(listed or ())
+        found -= GENERATED_FILES
+        found.discard("en")
+        return ["en", *sorted(found)]
+
+    async def fetch_all(self, sources, languages):
+        """Return {lang: [(source name, bytes) of each source that has it]}, in source order"""
+        pairs = [(source, lang) for lang in languages for source in sources]
+        contents = await asyncio.gather(*(self.fetch(source, lang) for source, lang in pairs))
+        loaded = {lang: [] for lang in languages}
+        for (source, lang), content in zip(pairs, contents):
+            if content is not None:
+                loaded[lang].append((source.name, content))
+        return loaded
+
+
+def load_sources(sources, languages=None, concurrency=DEFAULT_CONCURRENCY):
+    """Fetch and decode every language of every source concurrently
+
+    Returns ({lang: [data of each source that has it, in source order]},
+    {(source name, lang): error}). languages defaults to every language the
+    sources can list; en is always loaded, first.
+    """
+    async def run():
+        async with AsyncLocaleLoader(concurrency) as loader:
+            if languages:
+                codes = ["en", *(code for code in languages if code != "en")]
+            else:
+                codes = await loader.languages(sources)
+            with phase("read"):
+                contents = await loader.fetch_all(sources, codes)
+            return contents, loader.errors
+
+    contents, errors = asyncio.run(run())
+    loaded = {}
+    for lang, files in contents.items():
+        datas = []
+        for name, content in files:
+            try:
+                with phase("decode"):
+                    data = json.loads(content.decode('utf-8'))
+            except ValueError as e:
+                errors[name, lang] = f"Invalid JSON: {e}"
+                continue
+            if data:
+                datas.append(data)
+        loaded[lang] = datas
+    return loaded, errors
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""Benchmark the locale checkers on synthetic corpora
+
+generate_corpus() writes an en.json shaped like the real events.* tree plus
+translated locales, with configurable size, nesting depth, placeholder
+density, emoji share and untranslated ratio. The benchmark times every
+checker on corpora of several scales, can save the timings as a JSON
+baseline and fails when a later run is slower than that baseline by more
+than a threshold.
+
+Keep baselines outside the locale directory: every *.json file there is
+treated as a locale.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from locale_profile import add_profile_arguments, profiling
+
+BENCH_VERSION = 1
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# Times each placeholder string is formatted by the formatting benchmarks
+EVENTS_PER_STRING = 100
+
+# Corpus shapes, smallest first
+SCALES = {
+    "small": {"keys": 400, "depth": 4, "locales": 6},
+    "medium": {"keys": 4000, "depth": 4, "locales": 12},
+    "large": {"keys": 20000, "depth": 5, "locales": 24},
+}
+
+LANGUAGE_CODES = ["de", "es", "fr", "ja", "ko", "pt", "it", "nl", "pl", "ru", "sv", "tr",
+                  "uk", "cs", "da", "fi", "el", "hu", "id", "no", "ro", "th", "vi", "zh"]
+
+_CATEGORIES = ["moderation", "voice", "message", "channel", "role", "server", "modmail"]
+_GROUPS = ["member_banned", "member_kicked", "channel_join", "message_deleted", "role_updated",
+           "invite_created", "thread_closed", "server_muted", "nickname_changed", "timeout_set"]
+_LEAVES = ["title", "user", "user_id", "reason", "channel", "created_by", "account_created",
+           "banned_by", "before", "after"]
+_WORDS = ["Member", "Banned", "Channel", "Role", "Updated", "Reason", "User", "ID", "Message",
+          "Deleted", "Server", "Created", "Account", "Thread", "Invite", "by", "the", "in", "was"]
+_PLACEHOLDERS = ["user", "channel", "role", "reason", "count", "duration", "moderator"]
+_EMOJI = ["🚫", "🔨", "✅", "⚠️", "🎙️", "📝", "🔇"]
+
+
+def _name(names, index):
+    """Return a realistic key name, suffixed once the list runs out"""
+    name = names[index % len(names)]
+    return name if index < len(names) else f"{name}_{index // len(names)}"
+
+
+def _english_value(rng, placeholder_density, emoji_share):
+    """Return one synthetic English string"""
+    if rng.random() < emoji_share:
+        return rng.choice(_EMOJI)
+    words = rng.choices(_WORDS, k=rng.randint(1, 10))
+    if rng.random() < placeholder_density:
+        for name in rng.sample(_PLACEHOLDERS, rng.randint(1, 2)):
+            words.insert(rng.randint(0, len(words)), f"{{{name}}}")
+    return " ".join(words)
+
+
+def _translate(value, lang_code):
+    """Return a deterministic pseudo-translation that keeps placeholders intact"""
+    return " ".join(
+        word if word.startswith("{") else f"{word[::-1].lower()}{lang_code}"
+        for word in value.split(" ")
+    )
+
+
+def _set_path(tree, path, value):
+    """Set a dotted key path in a nested dict"""
+    *parents, leaf = path.split(".")
+    for part in parents:
+        tree = tree.setdefault(part, {})
+    tree[leaf] = value
+
+
+def generate_corpus(out_dir, keys=400, depth=4, locales=6, placeholder_density=0.3,
+                    emoji_share=0.02, untranslated_ratio=0.1, missing_ratio=0.02, seed=0):
+    """Write en.json and translated locale files shaped like en.json's events.* tree
+
+    depth counts the object levels above each leaf, "events" included, and is
+    at least 2. Returns the list of locale codes written besides en.
+    """
+    rng = random.Random(seed)
+    depth = max(depth, 2)
+    leaves_per_group = 8
+    groups = math.ceil(keys / leaves_per_group)
+    # Fan-out of each level between "events" and the groups
+    inner_levels = depth - 2
+    fanout = math.ceil(groups ** (1 / inner_levels)) if inner_levels else 1
+
+    paths = []
+    for i in range(keys):
+        group, leaf = divmod(i, leaves_per_group)
+        parts = ["events"]
+        for level in range(inner_levels):
+            index = group // fanout ** (inner_levels - level - 1) % fanout
+            parts.append(_name(_CATEGORIES if level == 0 else _GROUPS, index))
+        if not inner_levels:
+            parts[0] = f"events_{group}" if group else "events"
+        parts.append(_name(_LEAVES, leaf))
+        paths.append(".".join(parts))
+
+    en_values = [_english_value(rng, placeholder_density, emoji_share) for _ in paths]
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(lang_code, values):
+        tree = {}
+        for path, value in zip(paths, values):
+            if value is not None:
+                _set_path(tree, path, value)
+        with open(out_dir / f"{lang_code}.json", 'w', encoding='utf-8') as f:
+            json.dump(tree, f, indent=2, ensure_ascii=False)
+
+    write("en", en_values)
+    codes = [_name(LANGUAGE_CODES, i) for i in range(locales)]
+    for lang_code in codes:
+        values = []
+        for value in en_values:
+            roll = rng.random()
+            if roll < missing_ratio:
+                values.append(None)
+            elif roll < missing_ratio + untranslated_ratio:
+                values.append(value)
+            else:
+                values.append(_translate(value, lang_code))
+        write(lang_code, values)
+    return codes
+
+
+@contextlib.contextmanager
+def _in_directory(path):
+    """Run the block in another working directory with stdout discarded"""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        os.chdir(previous)
+
+
+def _load_corpus(corpus_dir):
+    """Return (en data, {lang: data}) of a corpus"""
+    corpus_dir = Path(corpus_dir)
+    data = {}
+    for path in sorted(corpus_dir.glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            data[path.stem] = json.load(f)
+    return data.pop("en"), data
+
+
+def benchmarks(corpus_dir):
+    """Return {name: callable} timing each checker on a corpus"""
+    from check_complete_compare import compare_branches
+    from check_english import check_english
+    from check_lengths import check_lengths
+    from check_placeholders import check_placeholders
+    from generate_stats import calculate_stats
+    from locale_checkers import CHECKERS, Batch, collect
+    from locale_engine import (
+        EnglishReference,
+        LocaleData,
+        english_issue,
+        flatten,
+        get_all_keys,
+        get_all_strings,
+        length_issue,
+        placeholder_issue
+    )
+    from locale_template import compile_templates
+    from validate_locales import validate_locale_file
+
+    en_data, locales = _load_corpus(corpus_dir)
+    en_keys = set(get_all_keys(en_data))
+    en_strings = dict(get_all_strings(en_data))
+    ref = EnglishReference(LocaleData("en", en_keys, en_strings))
+
+    def validate():
+        with _in_directory(corpus_dir):
+            for lang_code in locales:
+                validate_locale_file(lang_code, en_keys, en_strings)
+
+    def stats():
+        for lang_code, lang_data in locales.items():
+            calculate_stats(lang_code, ref, lang_data)
+
+    def in_corpus(check):
+        def run():
+            with _in_directory(corpus_dir):
+                check()
+        return run
+
+    def compare():
+        with _in_directory(corpus_dir):
+            compare_branches(".", ".")
+
+    # One event per placeholder string, formatted EVENTS_PER_STRING times
+    formatted = {key: value for key, value in en_strings.items() if "{" in value}
+    templates = compile_templates(formatted)
+    events = [
+        {name: f"{name}-{n}" for name in template.names}
+        for n, template in enumerate(templates.values())
+    ]
+
+    def str_format():
+        for _ in range(EVENTS_PER_STRING):
+            for value, values in zip(formatted.values(), events):
+                value.format(**values)
+
+    def render_templates():
+        for _ in range(EVENTS_PER_STRING):
+            for template, values in zip(templates.values(), events):
+                template.render(values)
+
+    def render_batches():
+        for template, values in zip(templates.values(), events):
+            template.render_many([values] * EVENTS_PER_STRING)
+
+    # The placeholder, English-stub and length checks, per key and as batch checkers
+    flattened = {lang_code: flatten(lang_data)[1] for lang_code, lang_data in locales.items()}
+    checkers = [CHECKERS[name] for name in ("placeholders", "english", "lengths")]
+
+    def per_key_checks():
+        for lang_code, strings in flattened.items():
+            for key, value in strings.items():
+                placeholder_issue(ref, key, value)
+                english_issue(ref, key, value)
+                length_issue(lang_code, key, value)
+
+    def batch_checks():
+        for lang_code, strings in flattened.items():
+            batch = Batch(ref, lang_code, strings)
+            for checker in checkers:
+                collect(checker, batch)
+
+    return {
+        "validate_locale_file": validate,
+        "check_placeholders": in_corpus(check_placeholders),
+        "check_english": in_corpus(check_english),
+        "check_lengths": in_corpus(check_lengths),
+        "calculate_stats": stats,
+        "compare_branches": compare,
+        "str_format": str_format,
+        "render_templates": render_templates,
+        "render_many": render_batches,
+        "per_key_checks": per_key_checks,
+        "batch_checks": batch_checks,
+    }
+
+
+def time_call(func, repeat=3):
+    """Return the best wall time of func over repeat runs, after one warm-up run
+
+    The string analyzer's memo is cleared before each run so every run
+    starts as cold as a fresh process would.
+    """
+    from locale_analyzer import analyze
+
+    func()
+    best = math.inf
+    for _ in range(repeat):
+        analyze.cache_clear()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(scales, repeat=3, only=None):
+    """Time every checker at each scale and return {scale: {checker: seconds}}"""
+    results = {}
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            generate_corpus(tmp, **SCALES[scale])
+            timings = {}
+            for name, func in benchmarks(tmp).items():
+                if only and name not in only:
+                    continue
+                timings[name] = time_call(func, repeat)
+                print(f"[BENCH] {scale:<6} {name:<20} {timings[name] * 1000:9.1f} ms")
+            results[scale] = timings
+    return results
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Print each timing against the baseline and return the regressions
+
+    A regression is a timing more than threshold (a fraction) slower than the
+    baseline. Checkers missing from the baseline are not compared.
+    """
+    regressions = []
+    for scale, timings in results.items():
+        for name, seconds in timings.items():
+            base = baseline.get(scale, {}).get(name)
+            if not base:
+                continue
+            change = seconds / base - 1
+            status = "REGRESSION" if change > threshold else "ok"
+            print(f"  {scale:<6} {name:<20} {base * 1000:9.1f} ms -> {seconds * 1000:9.1f} ms "
+                  f"({change:+.0%}) {status}")
+            if change > threshold:
+                regressions.append((scale, name, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the locale checkers on synthetic corpora")
+    parser.add_argument("--scale", action="append", choices=list(SCALES),
+                        help="Corpus scale to run; repeatable (default: all)")
+    parser.add_argument("--only", action="append", metavar="CHECKER",
+                        help="Only time this checker; repeatable")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per checker (default: 3)")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help=f"Save timings as the baseline (default path: {DEFAULT_BASELINE})")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH",
+                        help="Fail if slower than this baseline by more than --threshold")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD})")
+
+    corpus = parser.add_argument_group("corpus generator")
+    corpus.add_argument("--generate", metavar="DIR", help="Only write a synthetic corpus to DIR")
+    corpus.add_argument("--keys", type=int, default=400, help="Keys per locale")
+    corpus.add_argument("--depth", type=int, default=4, help="Object levels above each leaf")
+    corpus.add_argument("--locales", type=int, default=6, help="Translated locales besides en")
+    corpus.add_argument("--placeholder-density", type=float, default=0.3,
+                        help="Share of strings with placeholders")
+    corpus.add_argument("--emoji-share", type=float, default=0.02, help="Share of emoji-only strings")
+    corpus.add_argument("--untranslated-ratio", type=float, default=0.1,
+                        help="Share of translated strings left in English")
+    corpus.add_argument("--seed", type=int, default=0, help="Random seed")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "locale_bench"):
+        return _run(args)
+
+
+def _run(args):
+    """Run the benchmarks selected by parsed command line arguments"""
+    if args.generate:
+        codes = generate_corpus(
+            args.generate, args.keys, args.depth, args.locales, args.placeholder_density,
+            args.emoji_share, args.untranslated_ratio, seed=args.seed
+        )
+        print(f"[OK] Wrote en.json and {len(codes)} locales to {args.generate}")
+        return 0
+
+    results = run_benchmarks(args.scale or list(SCALES), args.repeat, args.only)
+
+    if args.save:
+        path = Path(args.save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": BENCH_VERSION,
+                "python": platform.python_version(),
+                "results": results,
+            }, f, indent=2)
+        print(f"[OK] Saved baseline to {path}")
+
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[ERROR] Could not load baseline {args.compare}: {e}")
+            return 1
+        if baseline.get("version") != BENCH_VERSION:
+            print(f"[ERROR] Baseline {args.compare} has an unsupported version")
+            return 1
+
+        print(f"[COMPARE] Against {args.compare} (threshold {args.threshold:.0%})")
+        regressions = compare_to_baseline(results, baseline["results"], args.threshold)
+        if regressions:
+            print(f"[FAIL] {len(regressions)} checker(s) regressed past the threshold")
+            return 1
+        print("[OK] No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
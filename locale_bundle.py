@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compact dashboard bundle holding every language's stats and merged values
+
+generate_stats writes the bundle next to translation_stats.json so the
+dashboard loads everything with one request and no client-side merge. It is
+gzipped JSON:
+
+  version    BUNDLE_VERSION; readers ignore bundles of other versions
+  keys       en.json's string keys, the shared key table (id = position)
+  en         en.json's values, aligned to keys
+  languages  {lang: {
+    stats         the translation_stats.json counts, without the key lists
+    absent        hex bitmap (bit i = id i) of table keys the language lacks
+    missing       hex bitmap of stats' missingKeys
+    untranslated  hex bitmap of stats' untranslatedKeys
+    values        {id: value} where the language's value differs from English
+    extra         {key: value} of keys that are not in en.json
+    suggestions   stats' reuse suggestions
+  }}
+
+A value that is present and not in values equals English, so the bundle
+grows with the differences between translations and en.json rather than with
+languages x keys.
+"""
+import gzip
+import json
+import os
+from pathlib import Path
+from locale_table import KeyTable
+
+BUNDLE_FILE = "dashboard_bundle.json.gz"
+
+# Bump whenever the layout above changes
+BUNDLE_VERSION = 1
+
+# The stats fields stored as counts; the key lists become bitmaps
+STATS_COUNTS = ['total', 'translated', 'missing', 'untranslated', 'completeness']
+
+
+def hex_bitmap(table, keys):
+    """Return the hex string of the bitmap of some table keys"""
+    ids = table.ids
+    return format(table.bitmap(ids[key] for key in keys), 'x')
+
+
+def language_entry(table, en_strings, lang_strings, stats):
+    """Return the bundle entry of one language
+
+    lang_strings is the language's merged {key: value} view, anything with
+    get() and keys(), or None for English itself.
+    """
+    entry = {
+        'stats': {field: stats[field] for field in STATS_COUNTS},
+        'absent': '0',
+        'missing': hex_bitmap(table, stats['missingKeys']),
+        'untranslated': hex_bitmap(table, stats['untranslatedKeys']),
+        'values': {},
+        'extra': {},
+        'suggestions': stats.get('suggestions', {}),
+    }
+    if lang_strings is None:
+        return entry
+
+    absent = []
+    values = entry['values']
+    for i, (key, en_value) in enumerate(en_strings.items()):
+        value = lang_strings.get(key)
+        if value is None:
+            absent.append(i)
+        elif value != en_value:
+            values[str(i)] = value
+    entry['absent'] = format(table.bitmap(absent), 'x')
+    entry['extra'] = {key: lang_strings.get(key) for key in lang_strings.keys() if key not in table}
+    return entry
+
+
+def build_bundle(en_strings, languages, stats):
+    """Build the bundle from English strings, {lang: merged strings} and {lang: stats}
+
+    Languages appear in the order of stats; en has no entry in languages.
+    """
+    table = KeyTable(en_strings)
+    return {
+        'version': BUNDLE_VERSION,
+        'keys': table.keys,
+        'en': list(en_strings.values()),
+        'languages': {
+            lang_code: language_entry(table, en_strings, languages.get(lang_code), lang_stats)
+            for lang_code, lang_stats in stats.items()
+        },
+    }
+
+
+def write_bundle(bundle, path=BUNDLE_FILE):
+    """Write a bundle as gzipped JSON, byte-identical for identical content"""
+    body = json.dumps(bundle, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+    # mtime=0 keeps the gzip header stable so unchanged stats don't produce a diff
+    with open(tmp_path, 'wb') as f:
+        f.write(gzip.compress(body, mtime=0))
+    os.replace(tmp_path, path)
+
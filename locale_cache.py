@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Persistent cache of flattened locale files, keyed by file content hash
+
+Entries hold the (keys, strings) pair produced by locale_engine.flatten() in
+marshal format, which loads much faster than decoding and re-flattening the
+JSON. Any other marshal-able value can be stored the same way. Entry names
+include the flattening logic version, so bumping
+locale_engine.FLATTEN_VERSION invalidates every older entry. The directory is
+bounded in size and evicts least recently used entries first.
+"""
+import argparse
+import hashlib
+import marshal
+import os
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = ".locale_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_SUFFIX = ".marshal"
+
+
+def content_hash(content):
+    """Return the hex digest used to key a file's bytes"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class LocaleCache:
+    """Size-bounded LRU directory of marshal-able values keyed by content hash
+
+    The modification time of an entry records its last use; reads touch it
+    and writes evict the oldest entries once the directory exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, version=1, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, digest):
+        return self.cache_dir / f"v{self.version}-{digest}{ENTRY_SUFFIX}"
+
+    def get(self, digest):
+        """Return the value cached for a content hash, or None"""
+        path = self._entry_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                # A single read is far faster than letting marshal.load() pull small chunks
+                value = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return value
+
+    def put(self, digest, value):
+        """Store a value for a content hash and enforce the size bound"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._entry_path(digest)
+        # Write to a temporary name first so concurrent workers never read a partial entry
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(marshal.dumps(value))
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove stale-version entries, then least recently used ones over max_bytes"""
+        current_prefix = f"v{self.version}-"
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                if not path.name.startswith(current_prefix):
+                    path.unlink()
+                    continue
+                stat = path.stat()
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove every entry"""
+        for path in self.cache_dir.glob(f"*{ENTRY_SUFFIX}"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the flattened locale cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--clear", action="store_true", help="Remove all cache entries")
+    args = parser.parse_args()
+
+    cache = LocaleCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+        print(f"[OK] Cleared {cache.cache_dir}")
+        return 0
+
+    entries = list(cache.cache_dir.glob(f"*{ENTRY_SUFFIX}"))
+    size = sum(path.stat().st_size for path in entries)
+    print(f"[INFO] {len(entries)} cached locale(s), {size / 1024:.1f} KiB in {cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Binary locale catalog the bot can mmap instead of parsing JSON in every shard
+
+compile_catalog() writes every locale of a directory into one file:
+
+  header     "<4sHHII": MAGIC, CATALOG_VERSION, reserved, locale count, key count
+  locales    per locale "<16sI": language code (UTF-8, NUL padded), offset of its value table
+  key index  key count + 1 "<I" offsets of the keys in the key pool
+  key pool   the UTF-8 key paths of all locales, sorted bytewise, back to back
+  values     per locale, per key id "<II": offset and length of the value in
+             the string pool, or MISSING and 0 when the locale lacks the key
+  strings    UTF-8 values, each distinct value stored once
+
+All offsets are absolute and little-endian. LocaleCatalog maps the file read
+only, so every process opening it shares the same page cache pages. A lookup
+binary searches the sorted key pool and slices the value out of the map;
+get_bytes() returns that slice without copying it.
+
+Only string values are stored, so a locale file with any other leaf value
+(numbers, lists, null) is left out of the catalog with a warning rather than
+compiled without those keys; the other locales are still compiled.
+verify_catalog() loads each locale back from the catalog and runs the
+engine's per-locale checks on it and on the JSON file, so a catalog is only
+trusted when both give identical results.
+"""
+import argparse
+import mmap
+import os
+import struct
+from pathlib import Path
+from locale_cache import DEFAULT_CACHE_DIR, LocaleCache
+from locale_engine import (
+    FLATTEN_VERSION,
+    GENERATED_FILES,
+    LocaleData,
+    check_keys,
+    check_locale_english,
+    check_locale_lengths,
+    check_locale_placeholders,
+    discover_languages,
+    load_locale,
+    load_reference
+)
+from locale_profile import add_profile_arguments, profiling
+
+DEFAULT_CATALOG = "locales.catalog"
+
+MAGIC = b"LCAT"
+# Bump whenever the layout above changes
+CATALOG_VERSION = 1
+
+HEADER = struct.Struct("<4sHHII")
+LOCALE_ENTRY = struct.Struct("<16sI")
+OFFSET = struct.Struct("<I")
+VALUE_ENTRY = struct.Struct("<II")
+MISSING = 0xFFFFFFFF
+
+# Per-locale checks whose results must not change between JSON and catalog
+VERIFY_CHECKS = [check_keys, check_locale_placeholders, check_locale_english, check_locale_lengths]
+
+
+def compile_catalog(locales, path=DEFAULT_CATALOG):
+    """Write {lang: {key: value}} string mappings to a catalog file"""
+    keys = sorted({key.encode('utf-8') for strings in locales.values() for key in strings})
+    key_ids = {key.decode('utf-8'): i for i, key in enumerate(keys)}
+
+    locales_pos = HEADER.size
+    key_index_pos = locales_pos + LOCALE_ENTRY.size * len(locales)
+    key_pool_pos = key_index_pos + OFFSET.size * (len(keys) + 1)
+    key_offsets = [key_pool_pos]
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+    values_pos = key_offsets[-1]
+    table_size = VALUE_ENTRY.size * len(keys)
+    strings_pos = values_pos + table_size * len(locales)
+
+    directory = []
+    tables = []
+    pool = []
+    pooled = {}  # encoded value -> absolute offset
+    pool_end = strings_pos
+    for n, (lang, strings) in enumerate(locales.items()):
+        code = lang.encode('utf-8')
+        if len(code) > 16:
+            raise ValueError(f"Language code too long for the catalog: {lang}")
+        directory.append(LOCALE_ENTRY.pack(code, values_pos + table_size * n))
+        table = [(MISSING, 0)] * len(keys)
+        for key, value in strings.items():
+            data = value.encode('utf-8')
+            offset = pooled.get(data)
+            if offset is None:
+                offset = pooled[data] = pool_end
+                pool.append(data)
+                pool_end += len(data)
+            table[key_ids[key]] = (offset, len(data))
+        tables.append(b"".join(VALUE_ENTRY.pack(*entry) for entry in table))
+    if pool_end > MISSING:
+        raise ValueError("Catalog exceeds 4 GiB")
+
+    tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, CATALOG_VERSION, 0, len(locales), len(keys)))
+        f.write(b"".join(directory))
+        f.write(b"".join(OFFSET.pack(offset) for offset in key_offsets))
+        f.write(b"".join(keys))
+        f.write(b"".join(tables))
+        f.write(b"".join(pool))
+    # Replacing the file leaves processes that still map the old one unaffected
+    os.replace(tmp_path, path)
+
+
+class LocaleCatalog:
+    """Read-only, memory-mapped view of a compiled catalog"""
+
+    def __init__(self, path=DEFAULT_CATALOG):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, _, locale_count, self.key_count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != CATALOG_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {CATALOG_VERSION} locale catalog")
+
+        self.tables = {}  # lang -> offset of its value table
+        for n in range(locale_count):
+            code, table = LOCALE_ENTRY.unpack_from(self._map, HEADER.size + LOCALE_ENTRY.size * n)
+            self.tables[code.rstrip(b"\0").decode('utf-8')] = table
+        self._key_index = HEADER.size + LOCALE_ENTRY.size * locale_count
+
+    @property
+    def languages(self):
+        return list(self.tables)
+
+    def _key_bounds(self, key_id):
+        """Return the (start, end) offsets of a key in the key pool"""
+        pos = self._key_index + OFFSET.size * key_id
+        return OFFSET.unpack_from(self._map, pos)[0], OFFSET.unpack_from(self._map, pos + OFFSET.size)[0]
+
+    def key_id(self, key):
+        """Return the id of a key path by binary search, or None"""
+        target = key.encode('utf-8')
+        low, high = 0, self.key_count
+        while low < high:
+            middle = (low + high) // 2
+            start, end = self._key_bounds(middle)
+            candidate = self._map[start:end]
+            if candidate == target:
+                return middle
+            if candidate < target:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def key(self, key_id):
+        """Return the key path of an id"""
+        start, end = self._key_bounds(key_id)
+        return self._map[start:end].decode('utf-8')
+
+    def _value_bounds(self, lang, key_id):
+        """Return the (start, end) offsets of a locale's value, or None if it lacks it"""
+        table = self.tables.get(lang)
+        if table is None or key_id is None:
+            return None
+        offset, length = VALUE_ENTRY.unpack_from(self._map, table + VALUE_ENTRY.size * key_id)
+        return None if offset == MISSING else (offset, offset + length)
+
+    def get_bytes(self, lang, key):
+        """Return the UTF-8 value of a key as a memoryview into the map, or None"""
+        bounds = self._value_bounds(lang, self.key_id(key))
+        return None if bounds is None else self._view[bounds[0]:bounds[1]]
+
+    def get(self, lang, key, default=None):
+        """Return the string value of a key in a locale, or default"""
+        bounds = self._value_bounds(lang, self.key_id(key))
+        if bounds is None:
+            return default
+        return str(self._view[bounds[0]:bounds[1]], 'utf-8')
+
+    def strings(self, lang):
+        """Return a locale's {key: value}, in key order"""
+        strings = {}
+        for key_id in range(self.key_count):
+            bounds = self._value_bounds(lang, key_id)
+            if bounds is not None:
+                strings[self.key(key_id)] = str(self._view[bounds[0]:bounds[1]], 'utf-8')
+        return strings
+
+    def locale(self, lang):
+        """Load a locale back as locale_engine.LocaleData, e.g. to run the checks on it"""
+        if lang not in self.tables:
+            return LocaleData(lang, error=f"Not in catalog: {lang}")
+        strings = self.strings(lang)
+        return LocaleData(lang, set(strings), strings)
+
+    def close(self):
+        """Release the map; memoryviews from get_bytes() must be released first"""
+        if self._map is not None:
+            self._view.release()
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def non_string_error(locale):
+    """Return why a loaded locale can't be stored in a catalog, or None"""
+    other = locale.keys - locale.strings.keys()
+    if other:
+        return f"{min(other)} is not a string; the catalog only stores strings"
+    return None
+
+
+def load_directory(locale_dir=".", cache=None):
+    """Return ({lang: strings}, {lang: error}, {lang: reason}) for the locale files
+
+    The first holds every locale that can be compiled, the second those that
+    fail to load and the third those skipped for a non-string leaf value.
+    """
+    locales, errors, skipped = {}, {}, {}
+    for lang in discover_languages(locale_dir, GENERATED_FILES):
+        locale = load_locale(lang, locale_dir, cache)
+        reason = None if locale.error else non_string_error(locale)
+        if locale.error:
+            errors[lang] = locale.error
+        elif reason:
+            skipped[lang] = reason
+        else:
+            locales[lang] = locale.strings
+    return locales, errors, skipped
+
+
+def _unordered(result):
+    """Sort a check's issue list; the catalog keeps keys sorted, not in file order"""
+    return sorted(result) if isinstance(result, list) else result
+
+
+def verify_catalog(catalog, locale_dir=".", cache=None):
+    """Compare a catalog with the JSON files through the engine's checks
+
+    Returns ({lang: problem}, {lang: reason}): the locales whose catalog copy
+    differs, and those that compile_catalog() skips and the catalog rightly lacks.
+    """
+    problems, skipped = {}, {}
+    ref = load_reference(locale_dir, cache)
+    if ref.locale.error:
+        return {"en": f"Could not load en.json: {ref.locale.error}"}, skipped
+
+    languages = discover_languages(locale_dir, GENERATED_FILES)
+    for lang in sorted(set(catalog.languages) - set(languages)):
+        problems[lang] = "in the catalog but has no JSON file"
+    for lang in languages:
+        source = ref.locale if lang == "en" else load_locale(lang, locale_dir, cache)
+        reason = None if source.error else non_string_error(source)
+        if reason and lang not in catalog.tables:
+            skipped[lang] = reason
+            continue
+        compiled = catalog.locale(lang)
+        error = source.error or compiled.error or reason
+        if error:
+            problems[lang] = error
+        elif compiled.strings != source.strings:
+            problems[lang] = "values differ from the JSON file"
+        else:
+            for check in VERIFY_CHECKS:
+                if _unordered(check(ref, compiled)) != _unordered(check(ref, source)):
+                    problems[lang] = f"{check.__name__} results differ from the JSON file"
+                    break
+    return problems, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile locale files into an mmap-able catalog")
+    parser.add_argument("command", choices=["compile", "verify", "get"],
+                        help="compile the catalog, verify it against the JSON files, "
+                             "or look up one key")
+    parser.add_argument("lookup", nargs="*", metavar="LANG KEY", help="For get: language and key")
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG,
+                        help=f"Catalog file (default: {DEFAULT_CATALOG})")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Cache of flattened locales (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse every locale")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.command == "get" and len(args.lookup) != 2:
+        parser.error("get takes LANG KEY")
+
+    with profiling(args, "locale_catalog"):
+        return _run(args)
+
+
+def _run(args):
+    """Run the command selected by parsed command line arguments"""
+    cache = None if args.no_cache else LocaleCache(args.cache_dir, FLATTEN_VERSION)
+
+    if args.command == "compile":
+        locales, errors, skipped = load_directory(args.dir, cache)
+        for lang, reason in skipped.items():
+            print(f"[WARN] {lang}.json: {reason}; left out of the catalog")
+        for lang, error in errors.items():
+            print(f"[FAIL] {lang}.json: {error}")
+        if errors:
+            print("[FAIL] Catalog not written")
+            return 1
+        compile_catalog(locales, args.catalog)
+        print(f"[OK] Compiled {len(locales)} locales into {args.catalog} "
+              f"({os.path.getsize(args.catalog)} bytes)")
+        return 0
+
+    try:
+        catalog = LocaleCatalog(args.catalog)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] Could not open catalog: {e}")
+        return 1
+    with catalog:
+        if args.command == "get":
+            value = catalog.get(*args.lookup)
+            if value is None:
+                print(f"[FAIL] {args.lookup[0]}: {args.lookup[1]} not found")
+                return 1
+            print(value)
+            return 0
+
+        problems, skipped = verify_catalog(catalog, args.dir, cache)
+        for lang in catalog.languages:
+            if lang not in problems:
+                print(f"[OK] {lang}: catalog matches {lang}.json")
+        for lang, reason in skipped.items():
+            print(f"[WARN] {lang}: {reason}; not in the catalog")
+        for lang, problem in problems.items():
+            print(f"[FAIL] {lang}: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Columnar per-locale checkers and the registry that plugins add rules to
+
+A Batch holds one locale's string values, in file order, with the columns a
+rule needs aligned row by row: key paths, ids in the English KeyTable, the
+English ReferenceEntry of each key (None for keys not in en.json) and the
+StringFeatures of each value (locale_analyzer.analyze()), computed on first
+use. A Checker gets a whole Batch and returns an issue column: one message,
+or None, per row. The engine loads and checks locales one at a time, in a
+process pool with --jobs, so a rule sees one locale's batch per call.
+
+With NumPy installed, Batch.array() returns a column as an array and the
+length check flags rows in bulk; without it every checker runs in pure
+Python with the same results.
+
+Rules are classes decorated with @register. locale_engine.py --plugin MODULE
+imports a module of such classes, and its rules run and report like the
+built-in ones without any change to the engine's loops:
+
+    from locale_checkers import Checker, register
+
+    @register
+    class TrailingSpaceChecker(Checker):
+        name = "trailing-space"
+        title = "Check for trailing whitespace"
+
+        def check(self, batch):
+            return [f"{key}: trailing whitespace" if value != value.rstrip() else None
+                    for key, value in zip(batch.keys, batch.values)]
+"""
+import importlib
+from locale_analyzer import analyze
+
+try:
+    import numpy
+except ImportError:  # Optional; the checkers fall back to pure Python
+    numpy = None
+
+DISCORD_LIMITS = {
+    "embed_title": 256,
+    "embed_description": 4096,
+    "field_name": 256,
+    "field_value": 1024,
+    "footer_text": 2048,
+}
+
+# JSON files the scripts write next to the locales; they are not translations.
+# locale_engine.GENERATED_FILES re-exports this set
+GENERATED_FILES = frozenset({"translation_stats", "completeness_results"})
+
+# name -> registered Checker instance, in registration order
+CHECKERS = {}
+
+
+class Batch:
+    """One locale's string values with aligned per-row columns"""
+
+    __slots__ = ("ref", "lang", "keys", "values", "_ids", "_entries", "_features", "_arrays")
+
+    def __init__(self, ref, lang, strings):
+        """ref is the locale_engine.EnglishReference, strings the locale's {key: value}"""
+        self.ref = ref
+        self.lang = lang
+        self.keys = list(strings)
+        self.values = list(strings.values())
+        self._ids = None
+        self._entries = None
+        self._features = None
+        self._arrays = {}
+
+    @classmethod
+    def from_locale(cls, ref, locale):
+        """Build the batch of a locale_engine.LocaleData"""
+        return cls(ref, locale.code, locale.strings)
+
+    def __len__(self):
+        return len(self.keys)
+
+    # The derived columns are built on first use; most checkers need only some
+
+    @property
+    def ids(self):
+        """Id of each key in the English KeyTable, or None"""
+        if self._ids is None:
+            ids = self.ref.table.ids
+            self._ids = [ids.get(key) for key in self.keys]
+        return self._ids
+
+    @property
+    def entries(self):
+        """English ReferenceEntry of each key, or None"""
+        if self._entries is None:
+            entries = self.ref.entries
+            self._entries = [entries.get(key) for key in self.keys]
+        return self._entries
+
+    def features(self):
+        """Return the StringFeatures of every value"""
+        if self._features is None:
+            self._features = [analyze(value) for value in self.values]
+        return self._features
+
+    def feature(self, row):
+        """Return the StringFeatures of one value, without computing the whole column"""
+        if self._features is not None:
+            return self._features[row]
+        return analyze(self.values[row])
+
+    def array(self, column):
+        """Return a column, or a StringFeatures field of the values, as a NumPy array
+
+        Only available when NumPy is installed.
+        """
+        array = self._arrays.get(column)
+        if array is None:
+            if column in ("keys", "values", "ids", "entries"):
+                array = numpy.array(getattr(self, column), dtype=object)
+            else:
+                array = numpy.array([getattr(f, column) for f in self.features()])
+            self._arrays[column] = array
+        return array
+
+
+class Checker:
+    """A per-locale rule over Batches; subclass, set name and decorate with @register"""
+
+    name = None
+    title = None
+    # Languages the rule skips: the generated files, which are not locales.
+    # Rules that compare with English add "en"
+    excluded = GENERATED_FILES
+    # Report issues in en.json key order instead of the locale file's order
+    reference_order = False
+    fail_header = "has issues"
+    ok_message = "No issues found"
+
+    def check(self, batch):
+        """Return one issue message or None for every row of a batch"""
+        raise NotImplementedError
+
+
+def register(cls):
+    """Class decorator adding a Checker to CHECKERS"""
+    checker = cls()
+    if not checker.name:
+        raise ValueError(f"{cls.__name__} has no name")
+    if checker.name in CHECKERS:
+        raise ValueError(f"A checker named {checker.name} is already registered")
+    CHECKERS[checker.name] = checker
+    return cls
+
+
+def load_plugins(modules):
+    """Import plugin modules and return the Checkers they registered"""
+    before = set(CHECKERS)
+    for module in modules:
+        importlib.import_module(module)
+    return [checker for name, checker in CHECKERS.items() if name not in before]
+
+
+def collect(checker, batch):
+    """Return (row, message) of the rows a checker flags, in report order"""
+    column = checker.check(batch)
+    flagged = [(row, message) for row, message in enumerate(column) if message is not None]
+    if checker.reference_order:
+        positions = batch.ref.positions
+        keys = batch.keys
+        end = len(positions)
+        flagged.sort(key=lambda item: positions.get(keys[item[0]], end))
+    return flagged
+
+
+def english_match(entry, lang_value, features=None):
+    """is_likely_english_match() against a compiled entry; returns the match type or None
+
+    Only the translation side is lowercased and normalized here. features
+    are the translation's StringFeatures when already computed.
+    """
+    if entry.value == lang_value:
+        return "exact"
+    if entry.lower == lang_value.lower():
+        return "case-insensitive"
+
+    if entry.normalized:
+        lang_normalized = (features or analyze(lang_value)).stripped
+        if lang_normalized:
+            if entry.normalized == lang_normalized:
+                return "normalized-exact"
+            if entry.normalized_lower == lang_normalized.lower():
+                return "normalized-case-insensitive"
+    return None
+
+
+def english_stub_message(ref, key, entry, lang_value, features=None):
+    """Return the English-stub issue of a translated value, or None
+
+    entry is the key's ReferenceEntry and must not be skipped.
+    """
+    match_type = english_match(entry, lang_value, features)
+    index = ref.similarity
+    if index is None:
+        if match_type is None:
+            return None
+        description = f"{match_type} match"
+    elif match_type is not None:
+        description = f"{match_type} match, similarity {index.score(key, lang_value):.2f}"
+    else:
+        near = index.best_match(lang_value, key)
+        if near is None:
+            return None
+        score, english_key = near
+        of = "" if english_key == key else f" of {english_key}"
+        description = f"near-duplicate match{of}, similarity {score:.2f}"
+
+    # Show a preview of the value (truncate if too long)
+    preview = lang_value[:50] + "..." if len(lang_value) > 50 else lang_value
+    return f"{key}: '{preview}' ({description})"
+
+
+def placeholder_message(key, en_placeholders, lang_placeholders):
+    """Return the placeholder mismatch of a key, or None; en_placeholders is a set"""
+    lang_ph = set(lang_placeholders)
+    if lang_ph == en_placeholders:
+        return None
+    return f"{key}: missing {en_placeholders - lang_ph}, extra {lang_ph - en_placeholders}"
+
+
+def length_message(lang, key, length):
+    """Return the Discord length limit issue of a string of the given length, or None"""
+    # Most strings are field values or titles
+    if length > DISCORD_LIMITS["field_value"]:
+        return f"{lang}.json: {key} ({length} chars) exceeds field_value limit (1024)"
+    if length > DISCORD_LIMITS["embed_title"] and 'title' in key.lower():
+        return f"{lang}.json: {key} ({length} chars) may exceed title limit (256)"
+    return None
+
+
+@register
+class PlaceholderChecker(Checker):
+    """Placeholders of each translation must match the English string's"""
+
+    name = "placeholders"
+    title = "Check placeholders"
+    excluded = frozenset({"en"})
+    reference_order = True
+    fail_header = "has placeholder issues"
+    ok_message = "All placeholders preserved"
+
+    def check(self, batch):
+        placeholders = batch.ref.placeholders
+        column = [None] * len(batch)
+        for row, key in enumerate(batch.keys):
+            en_ph = placeholders.get(key)
+            if en_ph is not None:
+                column[row] = placeholder_message(key, en_ph, batch.feature(row).placeholders)
+        return column
+
+
+@register
+class EnglishStubChecker(Checker):
+    """Translations should not still hold the English text"""
+
+    name = "english"
+    title = "Check for untranslated English text"
+    excluded = frozenset({"en"})
+    reference_order = True
+    fail_header = "has potential untranslated English text"
+    ok_message = "No untranslated English text detected"
+
+    def check(self, batch):
+        ref = batch.ref
+        keys = batch.keys
+        values = batch.values
+        features = batch.features()
+        column = [None] * len(batch)
+        for row, entry in enumerate(batch.entries):
+            if entry is not None and not entry.skip:
+                column[row] = english_stub_message(
+                    ref, keys[row], entry, values[row], features[row]
+                )
+        return column
+
+
+@register
+class LengthChecker(Checker):
+    """Strings should fit Discord's embed limits
+
+    Unlike other rules it runs on every JSON file, the generated ones
+    included, as check_lengths.py always has.
+    """
+
+    name = "lengths"
+    title = "Check string lengths"
+    excluded = frozenset()
+
+    def _flagged(self, lengths, keys):
+        """Return the rows whose length may exceed a limit"""
+        field = DISCORD_LIMITS["field_value"]
+        title = DISCORD_LIMITS["embed_title"]
+        if numpy is None:
+            return [
+                row for row, length in enumerate(lengths)
+                if length > field or (length > title and 'title' in keys[row].lower())
+            ]
+        lengths = numpy.asarray(lengths)
+        # Only the few rows over the title limit need their key looked at
+        over_title = numpy.flatnonzero(lengths > title)
+        titled = numpy.fromiter(('title' in keys[row].lower() for row in over_title), bool,
+                                len(over_title))
+        return over_title[(lengths[over_title] > field) | titled].tolist()
+
+    def _column(self, batch, rows, lengths):
+        column = [None] * len(batch)
+        keys = batch.keys
+        for row in rows:
+            column[row] = length_message(batch.lang, keys[row], int(lengths[row]))
+        return column
+
+    def check(self, batch):
+        lengths = [f.length for f in batch.features()]
+        return self._column(batch, self._flagged(lengths, batch.keys), lengths)
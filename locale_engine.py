@@ -0,0 +1,907 @@
+#!/usr/bin/env python3
+"""Single-pass validation engine shared by all locale checks
+
+Each locale file is loaded and flattened exactly once, then every requested
+check runs over that shared representation. The individual check scripts
+(validate_locales.py, check_placeholders.py, ...) are thin wrappers around
+run_checks() and keep their original output and exit codes.
+"""
+import argparse
+import functools
+import json
+import marshal
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from pathlib import Path
+from locale_analyzer import analyze
+from locale_cache import DEFAULT_CACHE_DIR, LocaleCache, content_hash
+from locale_checkers import (
+    CHECKERS,
+    DISCORD_LIMITS,
+    GENERATED_FILES,
+    Batch,
+    collect,
+    english_match,
+    english_stub_message,
+    length_message,
+    load_plugins,
+    placeholder_message
+)
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
+from locale_similarity import SimilarityIndex
+from locale_stream import file_hash, flatten_file
+from locale_table import KeyTable, LocaleColumns
+
+# Reference and generated files that are not translations
+EXCLUDED_FILES = {"en", *GENERATED_FILES}
+
+# Bump whenever flatten() output changes so cached locales are invalidated
+FLATTEN_VERSION = 1
+
+# Compiled English reference stored next to en.json; bump the version whenever
+# ReferenceEntry or the way it is computed changes
+REFERENCE_FILE = "en.reference"
+REFERENCE_VERSION = 2
+
+# Order in which the checks run when all of them are requested
+CHECK_ORDER = ["keys", "placeholders", "english", "lengths", "complete"]
+
+
+def get_all_keys(d, prefix=''):
+    """Recursively get all keys from a nested dictionary"""
+    keys = []
+    for k, v in d.items():
+        key_path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            keys.extend(get_all_keys(v, key_path))
+        else:
+            keys.append(key_path)
+    return keys
+
+
+def get_all_strings(d, prefix=''):
+    """Get all string values from nested dict"""
+    strings = []
+    for k, v in d.items():
+        key_path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            strings.extend(get_all_strings(v, key_path))
+        elif isinstance(v, str):
+            strings.append((key_path, v))
+    return strings
+
+
+def flatten(d, prefix='', keys=None, strings=None):
+    """Flatten a nested dict into (leaf key paths, {key path: string value}) in one walk"""
+    if keys is None:
+        keys = []
+    if strings is None:
+        strings = {}
+    for k, v in d.items():
+        key_path = f"{prefix}.{k}" if prefix else k
+        if isinstance(v, dict):
+            flatten(v, key_path, keys, strings)
+        else:
+            keys.append(key_path)
+            if isinstance(v, str):
+                strings[key_path] = v
+    return keys, strings
+
+
+def find_placeholders(text):
+    """Find all {placeholder} patterns in text"""
+    return list(analyze(text).placeholders)
+
+
+def normalize_for_comparison(text):
+    """Normalize text for comparison by removing placeholders"""
+    # Remove {placeholder} patterns for comparison
+    return analyze(text).stripped
+
+
+def is_emoji_only(text):
+    """Check if text contains only emoji and whitespace"""
+    return analyze(text).emoji_only
+
+
+def is_likely_english_match(en_value, lang_value):
+    """Determine if lang_value is likely untranslated English"""
+    # Exact match (case-sensitive)
+    if en_value == lang_value:
+        return True, "exact"
+
+    # Case-insensitive match
+    if en_value.lower() == lang_value.lower():
+        return True, "case-insensitive"
+
+    # Normalized comparison (ignoring placeholders)
+    en_normalized = normalize_for_comparison(en_value)
+    lang_normalized = normalize_for_comparison(lang_value)
+
+    if en_normalized and lang_normalized:
+        # Exact normalized match
+        if en_normalized == lang_normalized:
+            return True, "normalized-exact"
+        # Case-insensitive normalized match
+        if en_normalized.lower() == lang_normalized.lower():
+            return True, "normalized-case-insensitive"
+
+    return False, None
+
+
+def should_skip_key(key_path, value):
+    """Determine if a key should be skipped from English detection checks"""
+    # Skip very short strings (might be single words that are the same)
+    if len(value.strip()) <= 1:
+        return True
+
+    features = analyze(value)
+
+    # Skip emoji-only strings (they're universal)
+    if features.emoji_only:
+        return True
+
+    # Skip strings that are purely technical (IDs, etc.)
+    # These often appear in technical fields like "user_id", "channel_id"
+    if features.technical:
+        return True
+
+    return False
+
+
+class LocaleData:
+    """Flattened contents of one locale file, or the error that prevented loading it"""
+
+    def __init__(self, code, keys=None, strings=None, error=None, duplicates=None):
+        self.code = code
+        self.keys = keys if keys is not None else set()
+        self.strings = strings if strings is not None else {}
+        self.error = error
+        # (key path, line, column) of repeated keys; only found by the streaming loader
+        self.duplicates = duplicates if duplicates is not None else []
+        # LocaleColumns view against the English key table, built on first use
+        self.columns = None
+        # locale_checkers.Batch of the string values, built on first use
+        self.batch = None
+
+
+# Everything the checks need to know about one English string, computed once
+ReferenceEntry = namedtuple("ReferenceEntry", [
+    "value",             # The English string
+    "lower",             # value.lower()
+    "normalized",        # normalize_for_comparison(value)
+    "normalized_lower",  # normalized.lower()
+    "skip",              # should_skip_key() result
+    "placeholders",      # find_placeholders(value) as a tuple
+])
+
+
+def compile_entry(key, value):
+    """Precompute the ReferenceEntry of one English string"""
+    normalized = normalize_for_comparison(value)
+    return ReferenceEntry(
+        value,
+        value.lower(),
+        normalized,
+        normalized.lower(),
+        should_skip_key(key, value),
+        tuple(find_placeholders(value)),
+    )
+
+
+class EnglishReference:
+    """Values derived from en.json once and shared by every check
+
+    entries maps every English string key to its ReferenceEntry; pass
+    precompiled entries (see load_reference()) to skip recomputing them.
+    """
+
+    def __init__(self, en, entries=None):
+        self.locale = en
+        self.keys = en.keys
+        self.strings = en.strings
+        if entries is None:
+            entries = {key: compile_entry(key, value) for key, value in en.strings.items()}
+        self.entries = entries
+
+        # Ids follow sorted key order, so keys read back from bitmaps come out sorted
+        self.table = KeyTable(sorted(en.keys))
+        ids = self.table.ids
+        # (key, id) of every English string, in en.json order
+        self.string_ids = [(key, ids[key]) for key in en.strings]
+        # The same for the strings the English-stub check does not skip
+        self.english_ids = [(key, i) for key, i in self.string_ids if not entries[key].skip]
+        self.placeholders = {
+            key: set(entry.placeholders)
+            for key, entry in entries.items() if entry.placeholders
+        }
+        self.placeholder_ids = [(key, ids[key]) for key in self.placeholders]
+        # Position of every English string key in en.json order
+        self.positions = {key: n for n, key in enumerate(en.strings)}
+        # Near-duplicate index, see enable_similarity()
+        self.similarity = None
+
+    def enable_similarity(self, threshold):
+        """Also flag translations at least threshold similar to an English value
+
+        Builds a MinHash LSH index over the values the English-stub check
+        does not skip; English-stub issues then carry a similarity score.
+        """
+        with phase("similarity_index"):
+            self.similarity = SimilarityIndex(
+                {key: self.strings[key] for key, _ in self.english_ids}, threshold
+            )
+
+    def save(self, path, en_hash):
+        """Write the compiled reference for the en.json content with hash en_hash"""
+        data = {
+            "version": REFERENCE_VERSION,
+            "flatten": FLATTEN_VERSION,
+            "en_hash": en_hash,
+            "keys": sorted(self.keys),
+            "strings": self.strings,
+            "entries": {key: tuple(entry) for key, entry in self.entries.items()},
+        }
+        tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps(data))
+        os.replace(tmp_path, path)
+
+    def columns(self, locale):
+        """Return a locale's values aligned to the English key table"""
+        if locale.columns is None or locale.columns.table is not self.table:
+            locale.columns = LocaleColumns.from_locale(self.table, locale)
+        return locale.columns
+
+    def batch(self, locale):
+        """Return a locale's string values as a locale_checkers.Batch"""
+        if locale.batch is None or locale.batch.ref is not self:
+            locale.batch = Batch.from_locale(self, locale)
+        return locale.batch
+
+
+def parse_locale(lang_code, content, cache=None):
+    """Decode and flatten the raw bytes of a locale file
+
+    With a LocaleCache, content that was flattened before is read from the
+    cache instead of being decoded and flattened again.
+    """
+    try:
+        if cache:
+            with phase("cache"):
+                digest = content_hash(content)
+                cached = cache.get(digest)
+            if cached:
+                keys, strings = cached
+                return LocaleData(lang_code, set(keys), strings)
+
+        with phase("decode"):
+            data = json.loads(content.decode('utf-8'))
+        with phase("flatten"):
+            keys, strings = flatten(data)
+        if cache:
+            with phase("cache"):
+                cache.put(digest, (keys, strings))
+        return LocaleData(lang_code, set(keys), strings)
+    except json.JSONDecodeError as e:
+        return LocaleData(lang_code, error=f"Invalid JSON: {e}")
+    except Exception as e:
+        return LocaleData(lang_code, error=f"Error: {e}")
+
+
+def stream_locale(lang_code, file_path, cache=None):
+    """Flatten a locale file with the bounded-memory streaming flattener
+
+    Duplicate keys are recorded on the returned LocaleData. Cache entries are
+    kept apart from parse_locale() ones because they also hold duplicates.
+    """
+    try:
+        cached = None
+        if cache:
+            with phase("cache"):
+                digest = f"stream-{file_hash(file_path)}"
+                cached = cache.get(digest)
+        if cached:
+            keys, strings, duplicates = cached
+        else:
+            with phase("stream"):
+                keys, strings, duplicates = flatten_file(file_path)
+            if cache:
+                with phase("cache"):
+                    cache.put(digest, (keys, strings, duplicates))
+        return LocaleData(lang_code, set(keys), strings, duplicates=duplicates)
+    except json.JSONDecodeError as e:
+        return LocaleData(lang_code, error=f"Invalid JSON: {e}")
+    except Exception as e:
+        return LocaleData(lang_code, error=f"Error: {e}")
+
+
+def load_locale(lang_code, locale_dir=".", cache=None, stream=False):
+    """Load and flatten a single locale file, streaming it when stream is set"""
+    file_path = Path(locale_dir) / f"{lang_code}.json"
+
+    if not file_path.exists():
+        return LocaleData(lang_code, error=f"File not found: {file_path}")
+    if stream:
+        return stream_locale(lang_code, file_path, cache)
+
+    try:
+        with phase("read"), open(file_path, 'rb') as f:
+            content = f.read()
+    except Exception as e:
+        return LocaleData(lang_code, error=f"Error: {e}")
+    return parse_locale(lang_code, content, cache)
+
+
+def load_reference(locale_dir=".", cache=None, stream=False):
+    """Load the compiled English reference stored next to en.json
+
+    The stored reference is used when it was compiled from the current
+    en.json content; otherwise en.json is loaded, compiled and the reference
+    rewritten. Check ref.locale.error for an en.json that failed to load.
+    """
+    en_path = Path(locale_dir) / "en.json"
+    reference_path = Path(locale_dir) / REFERENCE_FILE
+    try:
+        with phase("read"):
+            en_hash = file_hash(en_path)
+    except OSError:
+        en = load_locale("en", locale_dir, cache, stream)
+        with phase("reference"):
+            return EnglishReference(en)
+
+    try:
+        with phase("reference"):
+            with open(reference_path, 'rb') as f:
+                data = marshal.loads(f.read())
+            if (data["version"] == REFERENCE_VERSION and data["flatten"] == FLATTEN_VERSION
+                    and data["en_hash"] == en_hash):
+                en = LocaleData("en", set(data["keys"]), data["strings"])
+                entries = {key: ReferenceEntry._make(entry) for key, entry in data["entries"].items()}
+                return EnglishReference(en, entries)
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        pass  # Missing, unreadable or stale: rebuild it below
+
+    en = load_locale("en", locale_dir, cache, stream)
+    with phase("reference"):
+        ref = EnglishReference(en)
+        if not ref.locale.error:
+            try:
+                ref.save(reference_path, en_hash)
+            except OSError:
+                pass  # Read-only checkout; the reference is simply rebuilt next time
+    return ref
+
+
+def discover_languages(locale_dir=".", excluded=()):
+    """Return the sorted language codes of all *.json files in locale_dir"""
+    languages = []
+    with phase("discover"):
+        for json_file in Path(locale_dir).glob("*.json"):
+            lang_code = json_file.stem  # Get filename without extension
+            if lang_code not in excluded:
+                languages.append(lang_code)
+    languages.sort()  # Sort for consistent output
+    return languages
+
+
+def english_issue(ref, key, lang_value):
+    """Return the English-stub issue for one translated key, or None"""
+    entry = ref.entries.get(key)
+
+    # Skip certain types of strings that may legitimately match
+    if entry is None or entry.skip:
+        return None
+    return english_stub_message(ref, key, entry, lang_value)
+
+
+def placeholder_issue(ref, key, lang_value):
+    """Return the placeholder mismatch for one translated key, or None"""
+    en_ph = ref.placeholders.get(key)
+    if en_ph is None:
+        return None
+    return placeholder_message(key, en_ph, analyze(lang_value).placeholders)
+
+
+def length_issue(lang, key, value):
+    """Return the Discord length limit issue for one string, or None"""
+    return length_message(lang, key, analyze(value).length)
+
+
+def keys_result(missing_keys, extra_keys, untranslated_keys, duplicates=()):
+    """Build the (valid, message, missing_keys, untranslated_keys) result of check_keys()"""
+    issues = []
+    if missing_keys:
+        issues.append(f"Missing {len(missing_keys)} keys")
+    if untranslated_keys:
+        issues.append(f"{len(untranslated_keys)} untranslated (English stubs)")
+    if extra_keys:
+        issues.append(f"Extra {len(extra_keys)} keys")
+    if duplicates:
+        examples = ", ".join(
+            f"{key} at {line}:{column}" for key, line, column in duplicates[:5]
+        )
+        if len(duplicates) > 5:
+            examples += ", ..."
+        issues.append(f"Duplicate {len(duplicates)} keys ({examples})")
+
+    if issues:
+        return False, "; ".join(issues), missing_keys, untranslated_keys
+    return True, "All keys present and translated", [], []
+
+
+def check_keys(ref, locale):
+    """Check a locale for missing, extra and untranslated keys
+
+    Returns (valid, message, missing_keys, untranslated_keys) like
+    validate_locales.validate_locale_file().
+    """
+    if locale.error:
+        return False, locale.error, [], []
+
+    columns = ref.columns(locale)
+
+    # Check for missing keys (keys that don't exist in the translation file)
+    missing_keys = columns.missing()
+
+    # Check for extra keys (keys in translation but not in English)
+    extra_keys = sorted(columns.extra)
+
+    # Check for English stubs (keys that exist but match English values)
+    values = columns.values
+    untranslated_keys = sorted(
+        key for key, i in ref.english_ids
+        if values[i] is not None and english_issue(ref, key, values[i])
+    )
+
+    return keys_result(missing_keys, extra_keys, untranslated_keys, locale.duplicates)
+
+
+def _checker_issues(name, ref, locale):
+    """Run a registered checker on a locale and return its issue messages in report order"""
+    return [message for _, message in collect(CHECKERS[name], ref.batch(locale))]
+
+
+def check_locale_placeholders(ref, locale):
+    """Return placeholder mismatches between English and a locale"""
+    if locale.error:
+        return [locale.error]
+    return _checker_issues("placeholders", ref, locale)
+
+
+def check_locale_english(ref, locale):
+    """Return keys in a locale that still hold untranslated English text"""
+    if locale.error:
+        return [locale.error]
+    return _checker_issues("english", ref, locale)
+
+
+def check_locale_lengths(ref, locale):
+    """Return strings in a locale that exceed Discord's character limits"""
+    if locale.error:
+        return [f"{locale.code}.json: {locale.error}"]
+    return _checker_issues("lengths", ref, locale)
+
+
+class CheckerCall:
+    """Per-locale check function of a plugin Checker, as CHECKS holds them
+
+    Picklable, so plugin checks also run in the process pool.
+    """
+
+    def __init__(self, checker):
+        self.checker = checker
+        self.__name__ = f"check_{checker.name}"
+
+    def __call__(self, ref, locale):
+        if locale.error:
+            return [locale.error]
+        return [message for _, message in collect(self.checker, ref.batch(locale))]
+
+
+def _print_examples(label, keys, limit=5):
+    """Print the first few keys of a list followed by a count of the rest"""
+    examples = ", ".join(keys[:limit])
+    if len(keys) > limit:
+        examples += f", ... ({len(keys) - limit} more)"
+    print(f"  - {label}: {examples}")
+
+
+def report_keys(ref, results):
+    """Print validate_locales.py output, return True if every locale is valid"""
+    print(f"English file has {len(ref.keys)} keys")
+    print()
+
+    if not results:
+        print("[WARN] No language files found (except en.json)")
+        return True
+
+    all_valid = True
+    for lang, (valid, message, missing_keys, untranslated_keys) in results:
+        status = "[OK]" if valid else "[FAIL]"
+        print(f"{status} {lang}.json: {message}")
+
+        # Show detailed information for failed validations
+        if not valid:
+            all_valid = False
+            if missing_keys:
+                _print_examples(f"Missing {len(missing_keys)} keys", missing_keys)
+            if untranslated_keys:
+                _print_examples(
+                    f"Untranslated {len(untranslated_keys)} keys (English stubs)",
+                    untranslated_keys
+                )
+
+    print()
+    if all_valid:
+        print("[OK] All locale files are valid and complete!")
+    else:
+        print("[FAIL] Some locale files have issues")
+    return all_valid
+
+
+def _report_per_locale(results, fail_header, ok_message, limit):
+    """Print per-locale issue lists, return True if no locale has issues"""
+    all_ok = True
+    for lang, issues in results:
+        if issues:
+            print(f"[FAIL] {lang}.json {fail_header}:")
+            for issue in issues[:limit]:
+                print(f"  - {issue}")
+            if len(issues) > limit:
+                print(f"  ... and {len(issues) - limit} more")
+            all_ok = False
+        else:
+            print(f"[OK] {lang}.json: {ok_message}")
+    return all_ok
+
+
+def report_placeholders(ref, results):
+    """Print check_placeholders.py output, return True if all placeholders match"""
+    if not results:
+        print("[WARN] No language files found (except en.json)")
+        all_ok = True
+    else:
+        all_ok = _report_per_locale(
+            results, "has placeholder issues", "All placeholders preserved", 5
+        )
+
+    if all_ok:
+        print("\n[OK] All placeholders are correctly preserved!")
+    else:
+        print("\n[FAIL] Some placeholders are missing or incorrect")
+    return all_ok
+
+
+def report_english(ref, results):
+    """Print check_english.py output, return True if no English stubs were found"""
+    if not results:
+        print("[WARN] No language files found (except en.json)")
+        all_ok = True
+    else:
+        all_ok = _report_per_locale(
+            results, "has potential untranslated English text",
+            "No untranslated English text detected", 10
+        )
+
+    if all_ok:
+        print("\n[OK] No untranslated English text found in translation files!")
+    else:
+        print("\n[FAIL] Some translation files may contain untranslated English text")
+    return all_ok
+
+
+def report_lengths(ref, results):
+    """Print check_lengths.py output, return True if no string is too long"""
+    if not results:
+        print("[WARN] No language files found")
+        return True
+
+    total = sum(len(lang_issues) for _, lang_issues in results)
+    if total:
+        print(f"Found {total} potential length issues:")
+        # Show first 10
+        for issue in islice(chain.from_iterable(issues for _, issues in results), 10):
+            print(f"  - {issue}")
+        if total > 10:
+            print(f"  ... and {total - 10} more")
+        return False
+
+    print("[OK] No strings exceed Discord character limits")
+    return True
+
+
+def report_complete(ref, results):
+    """Print check_complete.py output; informational, always returns True"""
+    if not results:
+        print("[WARN] No language files found (except en.json)")
+        return True
+
+    total_keys = len(ref.keys)
+    complete_files = []
+    for lang, (valid, _, _, _) in results:
+        if valid:
+            complete_files.append((lang, total_keys))
+            print(f"[COMPLETE] {lang}.json: 100% complete ({total_keys}/{total_keys} keys translated)")
+
+    print()
+    if complete_files:
+        print(f"[INFO] {len(complete_files)} translation file(s) are complete:")
+        for lang, count in complete_files:
+            print(f"  - {lang}.json ({count} keys)")
+    else:
+        print("[INFO] No translation files are currently complete")
+    return True
+
+
+def report_checker(checker, ref, results):
+    """Print a plugin checker's per-locale issues, return True if no locale has any"""
+    if not results:
+        print("[WARN] No language files found")
+        return True
+
+    all_ok = _report_per_locale(results, checker.fail_header, checker.ok_message, 10)
+    if all_ok:
+        print(f"\n[OK] {checker.title or checker.name}: no issues found")
+    else:
+        print(f"\n[FAIL] {checker.title or checker.name}: some locale files have issues")
+    return all_ok
+
+
+# name -> (languages excluded from the check, per-locale check, reporter)
+CHECKS = {
+    "keys": (EXCLUDED_FILES, check_keys, report_keys),
+    "placeholders": ({"en"}, check_locale_placeholders, report_placeholders),
+    "english": ({"en"}, check_locale_english, report_english),
+    "lengths": (set(), check_locale_lengths, report_lengths),
+    "complete": (EXCLUDED_FILES, check_keys, report_complete),
+}
+
+CHECK_TITLES = {
+    "keys": "Validate locale files structure",
+    "placeholders": "Check placeholders",
+    "english": "Check for untranslated English text",
+    "lengths": "Check string lengths",
+    "complete": "Report complete translation files",
+}
+
+
+def add_checker(checker):
+    """Make a plugin locale_checkers.Checker a check that run_checks() runs and reports"""
+    CHECKS[checker.name] = (
+        set(checker.excluded), CheckerCall(checker), functools.partial(report_checker, checker)
+    )
+    CHECK_TITLES[checker.name] = checker.title or checker.name
+    if checker.name not in CHECK_ORDER:
+        CHECK_ORDER.append(checker.name)
+
+
+def add_plugins(modules):
+    """Import plugin modules and add the checkers they register; returns their names"""
+    names = []
+    for checker in load_plugins(modules):
+        add_checker(checker)
+        names.append(checker.name)
+    return names
+
+
+# Checkers registered before this module was imported are checks too. When
+# locale_engine.py runs as a script, modules importing locale_engine get a
+# second copy of it, which picks up the plugins the script loaded here.
+for _checker in CHECKERS.values():
+    if _checker.name not in CHECKS:
+        add_checker(_checker)
+
+
+# English reference installed in each pool worker by _init_worker()
+_WORKER_REF = None
+
+
+def _init_worker(ref):
+    """Process pool initializer: receive the English reference once per worker"""
+    global _WORKER_REF
+    _WORKER_REF = ref
+
+
+def _call_with_ref(call):
+    """Run func(ref, *args) against the worker's English reference"""
+    func, args = call
+    return func(_WORKER_REF, *args)
+
+
+def map_locales(ref, func, tasks, jobs=1):
+    """Call func(ref, *task) for every task and return the results in task order
+
+    With jobs > 1 the tasks run in a process pool. The English reference is
+    sent to each worker once through the pool initializer instead of being
+    pickled with every task, and results keep the order of tasks so output is
+    identical to a serial run.
+    """
+    tasks = list(tasks)
+    if jobs <= 1 or len(tasks) <= 1:
+        return [func(ref, *task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)),
+                             initializer=_init_worker, initargs=(ref,)) as executor:
+        return list(executor.map(_call_with_ref, [(func, task) for task in tasks]))
+
+
+def check_locale(ref, lang_code, locale_dir, checks, cache=None, stream=False):
+    """Load one locale and run every given per-locale check on it
+
+    Returns a list of results in the order of checks.
+    """
+    start = time.perf_counter()
+    if lang_code == "en":
+        locale = ref.locale
+    else:
+        locale = load_locale(lang_code, locale_dir, cache, stream)
+    results = []
+    for check in checks:
+        with phase(check.__name__):
+            results.append(check(ref, locale))
+    record_locale(lang_code, time.perf_counter() - start, len(locale.strings))
+    return results
+
+
+def report_checks(ref, check_names, languages, result_for, headers=False):
+    """Print every check's report from per-locale results
+
+    result_for(check, lang) returns the result of a per-locale check function
+    for a language, or None if the language was not checked.
+    Returns {check name: passed}.
+    """
+    outcome = {}
+    for index, name in enumerate(check_names):
+        excluded, check, report = CHECKS[name]
+        results = []
+        for lang in languages:
+            if lang not in excluded:
+                result = result_for(check, lang)
+                if result is not None:
+                    results.append((lang, result))
+
+        with phase("report"):
+            if headers:
+                if index:
+                    print()
+                print(f"[CHECK] {CHECK_TITLES[name]}")
+            outcome[name] = report(ref, results)
+
+    return outcome
+
+
+def run_checks(check_names=CHECK_ORDER, locale_dir=".", headers=False, jobs=1, cache=None,
+               stream=False, similarity=None):
+    """Run the named checks over locale_dir, loading every locale only once
+
+    Locales are checked independently, in a pool of `jobs` processes when
+    jobs > 1, and read through `cache` when one is given. With stream set,
+    files are flattened by locale_stream instead of json.load(). With a
+    similarity threshold, near-duplicates of English also count as English
+    stubs (see EnglishReference.enable_similarity()).
+    Returns {check name: passed}.
+    """
+    ref = load_reference(locale_dir, cache, stream)
+    if ref.locale.error:
+        print(f"[ERROR] Could not load en.json: {ref.locale.error}")
+        return {name: False for name in check_names}
+    if similarity is not None:
+        ref.enable_similarity(similarity)
+
+    # Work out which distinct checks each language needs ("complete" reuses "keys")
+    tasks = []
+    for lang in discover_languages(locale_dir):
+        checks = []
+        for name in check_names:
+            excluded, check, _ = CHECKS[name]
+            if lang not in excluded and check not in checks:
+                checks.append(check)
+        if checks:
+            tasks.append((lang, locale_dir, checks, cache, stream))
+
+    computed = {}  # (check, lang) -> result
+    for (lang, _, checks, _, _), results in zip(tasks, map_locales(ref, check_locale, tasks, jobs)):
+        for check, result in zip(checks, results):
+            computed[check, lang] = result
+
+    return report_checks(
+        ref, check_names, [task[0] for task in tasks],
+        lambda check, lang: computed.get((check, lang)), headers
+    )
+
+
+def main(argv=None):
+    # Plugins add check names, so they are imported before --check is parsed
+    plugin_parser = argparse.ArgumentParser(add_help=False)
+    plugin_parser.add_argument("--plugin", action="append", default=[])
+    try:
+        add_plugins(plugin_parser.parse_known_args(argv)[0].plugin)
+    except (ImportError, ValueError) as e:
+        print(f"[ERROR] Could not load plugin: {e}")
+        return 1
+
+    parser = argparse.ArgumentParser(description="Validate all locale files in a single pass")
+    parser.add_argument("--check", action="append", choices=CHECK_ORDER,
+                        help="Run only this check (may be repeated, default: all)")
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--jobs", type=int,
+                        help="Number of worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Cache of flattened locales (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse every locale")
+    parser.add_argument("--stream", action="store_true",
+                        help="Flatten files with the bounded-memory streaming parser "
+                             "and report duplicate keys")
+    parser.add_argument("--since", metavar="REF",
+                        help="Only re-check what changed since a git ref, reusing stored verdicts")
+    parser.add_argument("--similarity", type=float, metavar="THRESHOLD",
+                        help="Also flag translations whose trigram similarity to English is at "
+                             "least THRESHOLD (0-1, e.g. 0.8) and report similarity scores")
+    parser.add_argument("--format", choices=["text", "ndjson", "sarif"], default="text",
+                        help="Print the human-readable report (default), or stream every "
+                             "issue as NDJSON or SARIF records as it is found")
+    parser.add_argument("--output", metavar="PATH",
+                        help="With --format ndjson or sarif, write records here (default: stdout)")
+    parser.add_argument("--plugin", action="append", metavar="MODULE",
+                        help="Import a module of locale_checkers rules and run them as checks too; "
+                             "repeatable")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    # stream_checks() has neither an incremental nor a parallel mode
+    if args.format != "text" and args.since:
+        parser.error(f"--since cannot be combined with --format {args.format}")
+    if args.format != "text" and args.jobs is not None:
+        parser.error(f"--jobs cannot be combined with --format {args.format}")
+
+    with profiling(args, "locale_engine"):
+        return _run(args)
+
+
+def _run(args):
+    """Run the checks selected by parsed command line arguments"""
+    cache = None if args.no_cache else LocaleCache(args.cache_dir, FLATTEN_VERSION)
+    check_names = [name for name in CHECK_ORDER if name in (args.check or CHECK_ORDER)]
+
+    if args.format != "text":
+        # Imported here because locale_report builds on this module
+        from locale_report import WRITERS, stream_checks
+        output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        try:
+            outcome = stream_checks(check_names, WRITERS[args.format](output), args.dir, cache,
+                                    args.stream, args.similarity)
+        finally:
+            if args.output:
+                output.close()
+        return 0 if all(outcome.values()) else 1
+
+    if args.since:
+        if any(isinstance(CHECKS[name][1], CheckerCall) for name in check_names):
+            print("[ERROR] --since only runs the built-in checks; select them with --check")
+            return 1
+        # Imported here because locale_incremental builds on this module
+        from locale_incremental import run_incremental_checks, verdict_store
+        try:
+            outcome = run_incremental_checks(
+                check_names, args.since, args.dir, cache,
+                verdict_store(args.cache_dir), headers=len(check_names) > 1,
+                similarity=args.similarity
+            )
+        except RuntimeError as e:
+            print(f"[ERROR] git failed: {e}")
+            return 1
+        return 0 if all(outcome.values()) else 1
+
+    # Worker processes would not report to the profiler
+    jobs = 1 if args.profile else args.jobs or os.cpu_count() or 1
+    outcome = run_checks(check_names, args.dir, headers=len(check_names) > 1,
+                         jobs=jobs, cache=cache, stream=args.stream, similarity=args.similarity)
+    return 0 if all(outcome.values()) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Read locale files straight from the git object store
+
+GitBlobReader keeps one `git cat-file --batch` process open and reads the
+trees and blobs of any number of refs through it, so no branch has to be
+checked out. Locale blobs are parsed once per SHA: a file that is identical
+on several refs is decoded and flattened a single time.
+"""
+import subprocess
+from locale_engine import LocaleData, parse_locale
+from locale_profile import phase
+
+
+class GitBlobReader:
+    """Locale files of git refs, read through one long-lived cat-file process"""
+
+    def __init__(self, repo_dir=".", cache=None):
+        """repo_dir is the locale directory inside a git work tree or repository"""
+        self.repo_dir = repo_dir
+        self.cache = cache
+        self._process = None
+        self._shas = {}     # ref -> {lang: blob sha}
+        self._locales = {}  # blob sha -> (keys, strings, error)
+
+    def _batch(self):
+        """Return the running cat-file process, starting it on first use"""
+        if self._process is None:
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"], cwd=self.repo_dir,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        return self._process
+
+    def read_object(self, spec):
+        """Return (sha, type, content) of an object name such as "main:./en.json", or None"""
+        with phase("git"):
+            process = self._batch()
+            try:
+                process.stdin.write(spec.encode('utf-8') + b"\n")
+                process.stdin.flush()
+            except OSError:
+                # cat-file already exited, e.g. outside a repository
+                header = b""
+            else:
+                header = process.stdout.readline()
+            if not header:
+                error = process.stderr.read().decode('utf-8', errors='replace').strip()
+                self.close()
+                raise RuntimeError(error or "git cat-file exited")
+            if header.endswith((b" missing\n", b" ambiguous\n")):
+                return None
+
+            sha, kind, size = header.split()
+            content = process.stdout.read(int(size))
+            process.stdout.read(1)  # Newline after the content
+        return sha.decode('ascii'), kind.decode('ascii'), content
+
+    def locale_shas(self, ref):
+        """Return {lang: blob sha} for the *.json files of the locale directory at a ref
+
+        A ref without the directory has no locales, like a missing checkout.
+        """
+        shas = self._shas.get(ref)
+        if shas is not None:
+            return shas
+
+        shas = {}
+        tree = self.read_object(f"{ref}:./")
+        if tree and tree[1] == "tree":
+            tree_sha, _, content = tree
+            hash_size = len(tree_sha) // 2
+            pos = 0
+            # Entries are "<mode> <name>\0<binary sha>"
+            while pos < len(content):
+                space = content.index(b" ", pos)
+                nul = content.index(b"\0", space)
+                mode = content[pos:space]
+                name = content[space + 1:nul].decode('utf-8')
+                pos = nul + 1 + hash_size
+                if mode.startswith(b"100") and name.endswith(".json"):
+                    shas[name[:-len(".json")]] = content[nul + 1:pos].hex()
+        self._shas[ref] = shas
+        return shas
+
+    def blob(self, sha):
+        """Return the content of a blob"""
+        obj = self.read_object(sha)
+        if obj is None:
+            raise RuntimeError(f"Missing blob {sha}")
+        return obj[2]
+
+    def load_blob(self, lang_code, sha):
+        """Load and flatten a locale blob, parsing each distinct blob once"""
+        parsed = self._locales.get(sha)
+        if parsed is None:
+            locale = parse_locale(lang_code, self.blob(sha), self.cache)
+            parsed = (locale.keys, locale.strings, locale.error)
+            self._locales[sha] = parsed
+        keys, strings, error = parsed
+        return LocaleData(lang_code, set(keys), strings, error)
+
+    def load_locale(self, ref, lang_code):
+        """Load and flatten a locale file as it is at a ref"""
+        sha = self.locale_shas(ref).get(lang_code)
+        if sha is None:
+            return LocaleData(lang_code, error=f"File not found: {ref}:{lang_code}.json")
+        return self.load_blob(lang_code, sha)
+
+    def close(self):
+        """Stop the cat-file process"""
+        if self._process is not None:
+            process, self._process = self._process, None
+            try:
+                process.stdin.close()
+            except OSError:
+                pass  # It already exited; read_object() reports why
+            process.wait()
+            process.stdout.close()
+            process.stderr.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""Completeness history of every language over the commits of main and develop
+
+update_history() walks the first-parent history of each branch with one
+`git log --raw` and replays the blob SHAs of the locale files commit by
+commit, so no commit is checked out. Statistics are the counts of
+generate_stats.calculate_stats(), computed once per (en.json blob, locale
+blob) pair against an EnglishReference compiled once per en.json blob. A
+locale version that did not change between commits, or that is identical on
+both branches, costs a dictionary lookup.
+
+The history is an append-only file of JSON lines in gzip members, one member
+per update, so each push appends only what is new:
+
+  {"type": "history", "version": HISTORY_VERSION}         first line
+  {"type": "stats", "en": sha, "lang": sha,                stats of a blob pair,
+   "s": [total, translated, missing, untranslated],        null when a file
+   "n": {namespace: [total, translated, missing, untranslated]}}  fails to parse
+  {"type": "commit", "ref": "main", "commit": sha, "time": unix time,
+   "blobs": {lang: blob sha, or null when the file was deleted}}
+  {"type": "head", "ref": "main", "commit": sha}           last commit walked
+  {"type": "reset", "ref": "main", "keep": N}              the branch was rewritten;
+                                                           only its first N commits remain
+
+Commit records only list the files a commit changed; the series of a branch
+is rebuilt by replaying them. Namespaces are the first segment of the dotted
+key paths (commands, events, ...).
+"""
+import argparse
+import gzip
+import json
+import subprocess
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from generate_stats import DEFAULT_BRANCHES
+from locale_engine import EXCLUDED_FILES, EnglishReference, english_match
+from locale_git import GitBlobReader
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
+
+HISTORY_FILE = "translation_history.jsonl.gz"
+
+# Bump whenever the record layout or the statistics change
+HISTORY_VERSION = 1
+
+# (total, translated, missing, untranslated) of a language or one of its namespaces
+Counts = namedtuple("Counts", ["total", "translated", "missing", "untranslated"])
+
+# Statistics of one (en.json blob, locale blob) pair
+PairStats = namedtuple("PairStats", ["counts", "namespaces"])
+
+# One commit of a branch that changed a language
+Point = namedtuple("Point", ["commit", "time", "stats"])
+
+NULL_SHA = "0" * 40
+
+
+def completeness(counts):
+    """Return the completeness percentage of Counts, formatted like calculate_stats()"""
+    return f"{((counts.translated / counts.total) * 100):.1f}" if counts.total > 0 else '0.0'
+
+
+def namespace(key):
+    """Return the namespace of a dotted key path: its first segment"""
+    return key.split(".", 1)[0]
+
+
+def _git(args, cwd):
+    """Run a git command in cwd and return (exit code, stdout text)"""
+    with phase("git"):
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True)
+    return result.returncode, result.stdout.decode('utf-8', errors='replace')
+
+
+class History:
+    """The records of a history file, indexed for replay"""
+
+    def __init__(self):
+        self.stats = {}  # (en sha, lang sha) -> PairStats, or None for a file that fails to parse
+        self.commits = {}  # ref -> [(commit, time, {lang: sha or None})]
+        self.heads = {}  # ref -> last commit walked
+        self.pending = []  # records not yet written
+
+    def add(self, record):
+        """Apply a record and queue it for the next save()"""
+        self._apply(record)
+        self.pending.append(record)
+
+    def _apply(self, record):
+        kind = record["type"]
+        if kind == "stats":
+            s = record["s"]
+            self.stats[record["en"], record["lang"]] = None if s is None else PairStats(
+                Counts(*s), {ns: Counts(*counts) for ns, counts in record["n"].items()}
+            )
+        elif kind == "commit":
+            self.commits.setdefault(record["ref"], []).append(
+                (record["commit"], record["time"], record["blobs"])
+            )
+        elif kind == "head":
+            self.heads[record["ref"]] = record["commit"]
+        elif kind == "reset":
+            commits = self.commits.get(record["ref"], [])
+            del commits[record["keep"]:]
+            self.heads.pop(record["ref"], None)
+
+    @classmethod
+    def load(cls, path=HISTORY_FILE):
+        """Read a history file; returns None if it is missing, damaged or outdated"""
+        history = cls()
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+                if header.get("type") != "history" or header.get("version") != HISTORY_VERSION:
+                    return None
+                for line in f:
+                    history._apply(json.loads(line))
+        except (OSError, EOFError, ValueError):
+            return None
+        return history
+
+    def save(self, path=HISTORY_FILE, rewrite=False):
+        """Append the pending records as a new gzip member, or write a new file"""
+        if not self.pending and not rewrite:
+            return
+        lines = [json.dumps(record, separators=(',', ':')) + "\n" for record in self.pending]
+        if rewrite:
+            lines.insert(0, json.dumps({"type": "history", "version": HISTORY_VERSION}) + "\n")
+        with phase("write"), open(path, 'wb' if rewrite else 'ab') as f:
+            f.write(gzip.compress("".join(lines).encode('utf-8'), mtime=0))
+        self.pending = []
+
+    def series(self, ref, lang):
+        """Return the Points of a branch where a language's statistics changed
+
+        Points without a parseable en.json or locale file are left out.
+        """
+        blobs = {}
+        points = []
+        last = None
+        for commit, when, changed in self.commits.get(ref, []):
+            blobs.update(changed)
+            en, sha = blobs.get("en"), blobs.get(lang)
+            if not en or not sha:
+                continue
+            stats = self.stats.get((en, sha))
+            if stats is not None and stats != last:
+                points.append(Point(commit, when, stats))
+                last = stats
+        return points
+
+    def languages(self, ref=None):
+        """Return the language codes of any file ever seen on a branch (or any branch)"""
+        found = set()
+        for name, commits in self.commits.items():
+            if ref is None or name == ref:
+                for _, _, changed in commits:
+                    found.update(changed)
+        return sorted(found - EXCLUDED_FILES)
+
+
+def english_rows(ref):
+    """Return (key, English value, ReferenceEntry, namespace) of the keys the stats count"""
+    return [
+        (key, entry.value, entry, namespace(key))
+        for key, entry in ref.entries.items() if not entry.skip
+    ]
+
+
+def pair_stats(rows, lang_strings, matches=None):
+    """Return the counts of a locale against English, overall and per namespace
+
+    rows are the english_rows() of an EnglishReference. The counts are those
+    calculate_stats() gives, as [total, translated, missing, untranslated]
+    lists like the stats records store them. matches memoizes
+    {(English value, translation): is English} across calls; successive
+    versions of a file share most of their values.
+    """
+    if matches is None:
+        matches = {}
+    namespaces = {}
+    for key, en_value, entry, ns in rows:
+        lang_value = lang_strings.get(key)
+        if lang_value is None:
+            column = 2
+        else:
+            is_english = matches.get((en_value, lang_value))
+            if is_english is None:
+                is_english = english_match(entry, lang_value) is not None
+                matches[en_value, lang_value] = is_english
+            column = 3 if is_english else 1
+        counts = namespaces.get(ns)
+        if counts is None:
+            counts = namespaces[ns] = [0, 0, 0, 0]
+        counts[0] += 1
+        counts[column] += 1
+    totals = [sum(counts[i] for counts in namespaces.values()) for i in range(4)]
+    return totals, namespaces
+
+
+def _walk(ref, since, locale_dir):
+    """Yield (commit, time, {file: sha or None}) of the locale files each commit changed
+
+    Commits are walked oldest first along the first parents of ref, after
+    since when it is given. Commits that change no locale file are skipped.
+    """
+    revision = f"{since}..{ref}" if since else ref
+    code, output = _git(["log", "--reverse", "-m", "--first-parent", "--raw", "--no-abbrev",
+                         "--no-renames", "--relative", "--format=commit %H %ct", revision, "--", "."],
+                        locale_dir)
+    if code != 0:
+        raise RuntimeError(f"git log {revision} failed")
+
+    commit = None
+    for line in output.splitlines():
+        if line.startswith("commit "):
+            if commit and commit[2]:
+                yield commit
+            _, sha, when = line.split()
+            commit = (sha, int(when), {})
+        elif line.startswith(":"):
+            meta, path = line.split("\t", 1)
+            new_sha = meta.split()[3]
+            if path.endswith(".json") and "/" not in path:
+                commit[2][path[:-len(".json")]] = None if new_sha == NULL_SHA else new_sha
+    if commit and commit[2]:
+        yield commit
+
+
+def update_history(history, refs, reader, locale_dir="."):
+    """Walk each {name: revision} branch from its last recorded head, adding records
+
+    Locale blobs are read through a GitBlobReader of locale_dir.
+
+    Returns the number of commits added.
+    """
+    references = {}  # en blob sha -> english_rows() of its EnglishReference, None if invalid
+    matches = {}  # (English value, translation) -> is English, see pair_stats()
+    added = 0
+    for name, revision in refs.items():
+        code, head = _git(["rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}"], locale_dir)
+        if code != 0:
+            print(f"[WARN] {revision} not found, skipping it")
+            continue
+        head = head.strip()
+        since = history.heads.get(name)
+        if since == head:
+            continue
+        if since is not None and _git(["merge-base", "--is-ancestor", since, head], locale_dir)[0] != 0:
+            # Keep the recorded commits the rewritten branch still has and walk on from there
+            kept = set(_git(["rev-list", "--first-parent", head], locale_dir)[1].split())
+            recorded = history.commits.get(name, [])
+            keep = 0
+            while keep < len(recorded) and recorded[keep][0] in kept:
+                keep += 1
+            print(f"[WARN] {name} was rewritten, dropping {len(recorded) - keep} recorded commits")
+            history.add({"type": "reset", "ref": name, "keep": keep})
+            since = recorded[keep - 1][0] if keep else None
+
+        # Replay the files as they were at the last recorded commit
+        blobs = {}
+        for _, _, changed in history.commits.get(name, []):
+            blobs.update(changed)
+
+        for commit, when, changed in _walk(revision, since, locale_dir):
+            blobs.update(changed)
+            _add_stats(history, reader, references, matches, blobs, changed)
+            history.add({"type": "commit", "ref": name, "commit": commit, "time": when,
+                         "blobs": changed})
+            added += 1
+        history.add({"type": "head", "ref": name, "commit": head})
+    return added
+
+
+def _add_stats(history, reader, references, matches, blobs, changed):
+    """Compute the statistics of the blob pairs a commit introduced"""
+    en = blobs.get("en")
+    if not en:
+        return
+    langs = blobs if "en" in changed else changed
+    for lang in langs:
+        sha = blobs.get(lang)
+        if lang in EXCLUDED_FILES or not sha or (en, sha) in history.stats:
+            continue
+        start = time.perf_counter()
+        if en not in references:
+            en_locale = reader.load_blob("en", en)
+            with phase("reference"):
+                references[en] = None if en_locale.error else english_rows(
+                    EnglishReference(en_locale)
+                )
+        rows = references[en]
+        locale = reader.load_blob(lang, sha)
+        record = {"type": "stats", "en": en, "lang": sha, "s": None, "n": {}}
+        if rows is not None and not locale.error:
+            with phase("stats"):
+                record["s"], record["n"] = pair_stats(rows, locale.strings, matches)
+        history.add(record)
+        record_locale(lang, time.perf_counter() - start, len(locale.strings))
+
+
+def parse_refs(specs):
+    """Return {name: revision} of NAME or NAME=REVISION command line specs"""
+    refs = {}
+    for spec in specs:
+        name, _, revision = spec.partition("=")
+        refs[name] = revision or name
+    return refs
+
+
+def print_series(history, ref, lang, ns=None):
+    """Print the completeness trend of a language (or one of its namespaces) on a branch"""
+    points = history.series(ref, lang)
+    if not points:
+        print(f"[WARN] No history for {lang} on {ref}")
+        return False
+    print(f"{lang} {ns} on {ref}:" if ns else f"{lang} on {ref}:")
+    last = None
+    for commit, when, stats in points:
+        counts = stats.counts if ns is None else stats.namespaces.get(ns)
+        if counts is None or counts == last:
+            continue
+        last = counts
+        day = datetime.fromtimestamp(when, timezone.utc).strftime("%Y-%m-%d")
+        print(f"  {day} {commit[:10]} {completeness(counts):>5}% "
+              f"({counts.translated}/{counts.total}, {counts.missing} missing, "
+              f"{counts.untranslated} untranslated)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track translation completeness over the git history")
+    parser.add_argument("command", choices=["update", "show"],
+                        help="update the history file from git, or show a language's trend")
+    parser.add_argument("lang", nargs="?", help="For show: language code")
+    parser.add_argument("--ref", action="append", metavar="NAME[=REVISION]",
+                        help="Branch to track, e.g. main=origin/main; repeatable "
+                             f"(default: {' '.join(DEFAULT_BRANCHES)})")
+    parser.add_argument("--namespace", help="For show: only this top-level key namespace")
+    parser.add_argument("--file", default=HISTORY_FILE, help=f"History file (default: {HISTORY_FILE})")
+    parser.add_argument("--dir", default=".", help="Locale directory inside the git work tree")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "locale_history"):
+        return _run(args)
+
+
+def _run(args):
+    """Run the command selected by parsed command line arguments"""
+    refs = parse_refs(args.ref or DEFAULT_BRANCHES)
+    history = History.load(args.file)
+
+    if args.command == "show":
+        if history is None:
+            print(f"[ERROR] Could not load {args.file}")
+            return 1
+        if not args.lang:
+            print(f"Languages: {', '.join(history.languages())}")
+            return 0
+        shown = [print_series(history, name, args.lang, args.namespace) for name in refs]
+        return 0 if any(shown) else 1
+
+    start = time.perf_counter()
+    rewrite = history is None
+    if rewrite:
+        history = History()
+    try:
+        with GitBlobReader(args.dir) as reader:
+            added = update_history(history, refs, reader, args.dir)
+    except RuntimeError as e:
+        print(f"[ERROR] git failed: {e}")
+        return 1
+    history.save(args.file, rewrite)
+    print(f"[OK] Added {added} commits to {args.file} "
+          f"({len(history.stats)} blob pairs, {time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Incremental validation of the locale files changed since a git ref
+
+Per-locale verdicts (missing/extra keys plus the English-stub, placeholder and
+length issues of every key) are stored by the git blob SHAs of en.json and the
+locale file. A locale whose blob is unchanged reuses its stored verdict
+without being loaded. A changed locale starts from the verdict stored for its
+version at the base ref and re-checks only the dotted keys whose values
+differ, plus the English keys that changed when en.json itself changed.
+Locales with no usable stored verdict are checked in full and stored.
+
+With near-duplicate detection on, a key's English-stub verdict depends on
+every English value, so a change to en.json re-checks every locale in full.
+
+The store's version includes a hash of the checker modules' source, so any
+change to the checks' code starts from fresh verdicts without a manual bump.
+"""
+import functools
+import importlib.util
+import subprocess
+import time
+from pathlib import Path
+from locale_cache import DEFAULT_CACHE_DIR, LocaleCache, content_hash
+from locale_engine import (
+    FLATTEN_VERSION,
+    check_keys,
+    check_locale_english,
+    check_locale_lengths,
+    discover_languages,
+    english_issue,
+    keys_result,
+    length_issue,
+    load_locale,
+    load_reference,
+    parse_locale,
+    placeholder_issue,
+    report_checks
+)
+from locale_profile import phase, record_locale
+
+# Bump whenever the verdict format changes; check logic is covered by checker_hash()
+VERDICT_VERSION = 2
+
+VERDICT_DIR = "verdicts"
+
+# Modules whose code decides a verdict
+CHECKER_MODULES = [
+    "locale_analyzer",
+    "locale_checkers",
+    "locale_engine",
+    "locale_incremental",
+    "locale_similarity",
+    "locale_stream",
+    "locale_table",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def checker_hash():
+    """Return a short hash of the source of CHECKER_MODULES"""
+    sources = []
+    for name in CHECKER_MODULES:
+        with open(importlib.util.find_spec(name).origin, 'rb') as f:
+            sources.append(f.read())
+    return content_hash(b"\0".join(sources))[:16]
+
+
+def verdict_store(cache_dir=DEFAULT_CACHE_DIR):
+    """Return the LocaleCache holding per-locale verdicts under cache_dir"""
+    return LocaleCache(Path(cache_dir) / VERDICT_DIR,
+                       f"{VERDICT_VERSION}.{FLATTEN_VERSION}.{checker_hash()}")
+
+
+def _git(args, cwd):
+    """Run a git command in cwd and return its stdout bytes"""
+    with phase("git"):
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.decode('utf-8', errors='replace').strip())
+    return result.stdout
+
+
+def ref_blob_shas(ref, locale_dir="."):
+    """Return {lang: blob sha} for the *.json files of locale_dir at a git ref"""
+    output = _git(["ls-tree", "-z", ref, "--", "."], locale_dir)
+    shas = {}
+    for entry in output.decode('utf-8').split("\0"):
+        if not entry:
+            continue
+        meta, path = entry.split("\t", 1)
+        _, kind, sha = meta.split()
+        if kind == "blob" and path.endswith(".json") and "/" not in path:
+            shas[path[:-len(".json")]] = sha
+    return shas
+
+
+def worktree_blob_shas(languages, locale_dir="."):
+    """Return {lang: blob sha} of the working tree files, as git would store them"""
+    if not languages:
+        return {}
+    output = _git(["hash-object", "--", *[f"{lang}.json" for lang in languages]], locale_dir)
+    return dict(zip(languages, output.decode('ascii').split()))
+
+
+def load_ref_locale(ref, lang_code, locale_dir=".", cache=None):
+    """Load and flatten a locale file as it is at a git ref"""
+    content = _git(["show", f"{ref}:./{lang_code}.json"], locale_dir)
+    return parse_locale(lang_code, content, cache)
+
+
+def changed_keys(old, new):
+    """Return the dotted keys added, removed or changed between two flattened locales"""
+    changed = old.keys ^ new.keys
+    old_strings = old.strings
+    for key, value in new.strings.items():
+        if old_strings.get(key) != value:
+            changed.add(key)
+    changed.update(key for key in old_strings if key not in new.strings)
+    return changed
+
+
+def _key_issues(ref, locale, keys):
+    """Run the per-key checks for the given keys of a locale
+
+    Returns (english, placeholders, lengths) dicts of {key: issue}.
+    """
+    english, placeholders, lengths = {}, {}, {}
+    lang_strings = locale.strings
+    translation = locale.code != "en"
+    for key in keys:
+        value = lang_strings.get(key)
+        if value is None:
+            continue
+        if translation:
+            issue = english_issue(ref, key, value)
+            if issue:
+                english[key] = issue
+            issue = placeholder_issue(ref, key, value)
+            if issue:
+                placeholders[key] = issue
+        issue = length_issue(locale.code, key, value)
+        if issue:
+            lengths[key] = issue
+    return english, placeholders, lengths
+
+
+def compute_verdict(ref, locale):
+    """Check every key of a locale and return its verdict"""
+    if locale.error:
+        return {"error": locale.error}
+
+    english, placeholders, lengths = _key_issues(ref, locale, locale.strings)
+    columns = ref.columns(locale)
+    return {
+        "missing": columns.missing(),
+        "extra": sorted(columns.extra),
+        "english": english,
+        "placeholders": placeholders,
+        "lengths": lengths,
+    }
+
+
+def patch_verdict(ref, locale, base, keys):
+    """Update a base verdict by re-checking only the given keys of a locale"""
+    if locale.error:
+        return {"error": locale.error}
+
+    english, placeholders, lengths = _key_issues(ref, locale, keys)
+    columns = ref.columns(locale)
+    verdict = {
+        "missing": columns.missing(),
+        "extra": sorted(columns.extra),
+    }
+    for name, fresh in (("english", english), ("placeholders", placeholders), ("lengths", lengths)):
+        issues = {key: issue for key, issue in base[name].items() if key not in keys}
+        issues.update(fresh)
+        verdict[name] = issues
+
+    # Length issues are reported in file order
+    if lengths:
+        position = {key: index for index, key in enumerate(locale.strings)}
+        verdict["lengths"] = {
+            key: verdict["lengths"][key]
+            for key in sorted(verdict["lengths"], key=position.__getitem__)
+        }
+    return verdict
+
+
+def _verdict_result(ref, order, lang, verdict, check):
+    """Turn a stored verdict into the result a per-locale check function returns"""
+    error = verdict.get("error")
+    if check is check_keys:
+        if error:
+            return False, error, [], []
+        return keys_result(verdict["missing"], verdict["extra"], sorted(verdict["english"]))
+    if check is check_locale_lengths:
+        if error:
+            return [f"{lang}.json: {error}"]
+        return list(verdict["lengths"].values())
+
+    if error:
+        return [error]
+    issues = verdict["english" if check is check_locale_english else "placeholders"]
+    return [issues[key] for key in sorted(issues, key=order.__getitem__)]
+
+
+def run_incremental_checks(check_names, since, locale_dir=".", cache=None,
+                           verdicts=None, headers=False, similarity=None):
+    """Run the named checks, re-checking only what changed since a git ref
+
+    Returns {check name: passed}, like locale_engine.run_checks().
+    """
+    if verdicts is None:
+        verdicts = verdict_store()
+
+    ref = load_reference(locale_dir, cache)
+    en = ref.locale
+    if en.error:
+        print(f"[ERROR] Could not load en.json: {en.error}")
+        return {name: False for name in check_names}
+    # Verdicts hold issue messages, which differ with near-duplicate detection
+    suffix = ""
+    if similarity is not None:
+        ref.enable_similarity(similarity)
+        suffix = f"-s{similarity}"
+
+    languages = discover_languages(locale_dir)
+    base_shas = ref_blob_shas(since, locale_dir)
+    current_shas = worktree_blob_shas(languages, locale_dir)
+
+    # English keys to re-check in every locale; None to re-check every key, when
+    # there is no base en.json or a near-duplicate may match any English value
+    en_changed = None
+    if "en" in base_shas:
+        en_changed = set()
+        if base_shas["en"] != current_shas["en"]:
+            if similarity is None:
+                en_changed = changed_keys(load_ref_locale(since, "en", locale_dir, cache), en)
+            else:
+                en_changed = None
+
+    results = {}
+    for lang in languages:
+        start = time.perf_counter()
+        digest = f"{current_shas['en']}-{current_shas[lang]}{suffix}"
+        with phase("cache"):
+            verdict = verdicts.get(digest)
+        if verdict is None:
+            locale = en if lang == "en" else load_locale(lang, locale_dir, cache)
+            base = None
+            if en_changed is not None and lang in base_shas and not locale.error:
+                base = verdicts.get(f"{base_shas['en']}-{base_shas[lang]}{suffix}")
+
+            if base is None or "error" in base:
+                with phase("verdict"):
+                    verdict = compute_verdict(ref, locale)
+            else:
+                keys = set(en_changed)
+                if base_shas[lang] != current_shas[lang]:
+                    keys |= changed_keys(load_ref_locale(since, lang, locale_dir, cache), locale)
+                with phase("verdict"):
+                    verdict = patch_verdict(ref, locale, base, keys)
+            with phase("cache"):
+                verdicts.put(digest, verdict)
+            record_locale(lang, time.perf_counter() - start, len(locale.strings))
+        results[lang] = verdict
+
+    order = {key: index for index, key in enumerate(ref.strings)}
+    return report_checks(
+        ref, check_names, languages,
+        lambda check, lang: _verdict_result(ref, order, lang, results[lang], check),
+        headers
+    )
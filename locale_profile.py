@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Phase timing, per-locale timing and memory profiling for the locale scripts
+
+Code marks its phases with `with phase("decode"):` and reports per-locale
+work with record_locale(). Both do nothing unless a Profiler is active, so
+the instrumentation costs one function call per phase when profiling is off.
+Entry points add the --profile options with add_profile_arguments() and wrap
+their work in profiling(args, name), which writes a JSON report at the end.
+
+Phases nest. Each records its inclusive wall time and its self time, which
+excludes nested phases. With cProfile enabled every phase gets its own
+profiler, switched as phases nest, and the stats of the phase with the most
+self time are saved next to the report.
+"""
+import argparse
+import contextlib
+import cProfile
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_VERSION = 1
+DEFAULT_REPORT = ".locale_profile/report.json"
+TOP_FUNCTIONS = 25
+
+_NULL_PHASE = contextlib.nullcontext()
+_active = None
+
+
+def phase(name):
+    """Return a context manager timing a named phase of the active profiler"""
+    if _active is None:
+        return _NULL_PHASE
+    return _active.phase(name)
+
+
+def record_locale(lang_code, seconds, strings=0):
+    """Add one locale's processing time and string count to the active profiler"""
+    if _active is not None:
+        _active.record_locale(lang_code, seconds, strings)
+
+
+class Profiler:
+    """Collects phase and locale timings for one run of an entry point"""
+
+    def __init__(self, memory=False, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.phases = {}   # name -> {"calls", "seconds", "self_seconds"[, "peak_bytes"]}
+        self.locales = {}  # lang -> {"calls", "seconds", "strings"}
+        self.peak_bytes = 0
+        self.wall_seconds = 0.0
+        self._stack = []     # [name, start, nested seconds] of the open phases
+        self._profiles = {}  # phase name -> cProfile.Profile
+        self._start = None
+
+    def start(self):
+        """Make this the active profiler"""
+        global _active
+        if self.memory:
+            tracemalloc.start()
+        self._start = time.perf_counter()
+        _active = self
+
+    def stop(self):
+        """Stop collecting"""
+        global _active
+        self.wall_seconds = time.perf_counter() - self._start
+        if self.memory:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        _active = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time a phase, attributing nested phases' time to them instead"""
+        parent = self._stack[-1] if self._stack else None
+        if self.cprofile:
+            if parent:
+                self._profiles[parent[0]].disable()
+            self._profiles.setdefault(name, cProfile.Profile()).enable()
+        if self.memory and parent is None:
+            self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self._stack.pop()
+            stats = self.phases.setdefault(name, {"calls": 0, "seconds": 0.0, "self_seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] += elapsed
+            stats["self_seconds"] += elapsed - frame[2]
+            if parent:
+                parent[2] += elapsed
+            if self.memory:
+                # Peak since the outermost open phase started
+                peak = tracemalloc.get_traced_memory()[1]
+                stats["peak_bytes"] = max(stats.get("peak_bytes", 0), peak)
+                self.peak_bytes = max(self.peak_bytes, peak)
+            if self.cprofile:
+                self._profiles[name].disable()
+                if parent:
+                    self._profiles[parent[0]].enable()
+
+    def record_locale(self, lang_code, seconds, strings=0):
+        """Add one locale's processing time and string count"""
+        stats = self.locales.setdefault(lang_code, {"calls": 0, "seconds": 0.0, "strings": 0})
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["strings"] += strings
+
+    def hottest_phase(self):
+        """Return the name of the phase with the most self time, or None"""
+        if not self.phases:
+            return None
+        return max(self.phases, key=lambda name: self.phases[name]["self_seconds"])
+
+    def report(self, entry, argv=None):
+        """Return the timing report as a JSON-serializable dict"""
+        attributed = sum(stats["self_seconds"] for stats in self.phases.values())
+        report = {
+            "version": PROFILE_VERSION,
+            "entry": entry,
+            "argv": list(sys.argv[1:] if argv is None else argv),
+            "python": platform.python_version(),
+            "wall_seconds": self.wall_seconds,
+            "unattributed_seconds": max(self.wall_seconds - attributed, 0.0),
+            "hottest_phase": self.hottest_phase(),
+            "phases": dict(sorted(self.phases.items(), key=lambda item: -item[1]["self_seconds"])),
+            "locales": dict(sorted(self.locales.items())),
+            "counts": {
+                "locales": len(self.locales),
+                "strings": sum(stats["strings"] for stats in self.locales.values()),
+            },
+        }
+        if self.memory:
+            report["peak_bytes"] = self.peak_bytes
+        return report
+
+    def write(self, path, entry, argv=None):
+        """Write the JSON report, plus the hottest phase's cProfile stats when enabled"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report(entry, argv)
+
+        hottest = report["hottest_phase"]
+        if self.cprofile and hottest in self._profiles:
+            stats_path = path.with_suffix(".prof")
+            profile = self._profiles[hottest]
+            profile.dump_stats(stats_path)
+            top = sorted(pstats.Stats(profile).stats.items(), key=lambda item: -item[1][2])
+            report["cprofile"] = {
+                "phase": hottest,
+                "stats_file": str(stats_path),
+                "top": [
+                    {
+                        "function": f"{file}:{line}({func})",
+                        "calls": calls,
+                        "self_seconds": self_seconds,
+                        "cumulative_seconds": cumulative,
+                    }
+                    for (file, line, func), (_, calls, self_seconds, cumulative, _)
+                    in top[:TOP_FUNCTIONS]
+                ],
+            }
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return report
+
+
+def add_profile_arguments(parser):
+    """Add the --profile options to an argparse parser"""
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_REPORT, metavar="PATH",
+                        help="Write a JSON timing report of phases and locales "
+                             f"(default path: {DEFAULT_REPORT}); runs single-process")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="With --profile, also record peak memory with tracemalloc (slower)")
+    parser.add_argument("--profile-cprofile", action="store_true",
+                        help="With --profile, also save cProfile stats of the hottest phase")
+
+
+def parse_profile_arguments(description, argv=None):
+    """Parse the command line of an entry point that only takes the --profile options"""
+    parser = argparse.ArgumentParser(description=description)
+    add_profile_arguments(parser)
+    return parser.parse_args(argv)
+
+
+@contextlib.contextmanager
+def profiling(args, entry):
+    """Profile the block when args.profile is set and write the report afterwards"""
+    if not getattr(args, "profile", None):
+        yield None
+        return
+
+    profiler = Profiler(args.profile_memory, args.profile_cprofile)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        report = profiler.write(args.profile, entry)
+        # stderr keeps the checks' own output unchanged
+        print(f"[PROFILE] {report['wall_seconds']:.3f}s total, hottest phase "
+              f"{report['hottest_phase']}; report written to {args.profile}", file=sys.stderr)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Streaming issue reports: NDJSON or SARIF records written as issues are found
+
+stream_checks() runs the engine's checks one locale at a time and hands each
+issue to a writer the moment it is found, instead of collecting every issue
+in lists and printing the first few. Only the locale being checked is held
+in memory, and nothing is truncated.
+
+NdjsonWriter writes one JSON object per line:
+
+  {"type": "run", "checks": [...], "english_keys": N, "error": null}
+  {"type": "locale", "lang": "fr", "checks": [...]}     before that locale's issues
+  {"type": "issue", "check": "keys", "kind": "missing", "lang": "fr",
+   "file": "fr.json", "key": "a.b", "message": "..."}
+
+Issue kinds are missing, extra, untranslated and duplicate (check "keys";
+duplicates also carry line and column), placeholder, english and length,
+issue for the checks of locale_engine.py --plugin modules, or error when the
+file could not be loaded. SarifWriter writes the same issues
+as a SARIF 2.1.0 log for code scanning UIs.
+
+summarize() reads an NDJSON stream back and prints exactly what
+locale_engine.py prints for the same checks, keeping only the counts and the
+first few issues of each locale.
+"""
+import argparse
+import json
+import sys
+import time
+from locale_checkers import collect
+from locale_engine import (
+    CHECKS,
+    CheckerCall,
+    add_plugins,
+    check_keys,
+    discover_languages,
+    english_issue,
+    keys_result,
+    length_issue,
+    load_locale,
+    load_reference,
+    placeholder_issue,
+    report_checks
+)
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# (check, kind) -> (SARIF rule id, level, description)
+RULES = {
+    ("keys", "missing"): ("keys/missing", "error", "Key of en.json missing from the locale"),
+    ("keys", "extra"): ("keys/extra", "error", "Key not in en.json"),
+    ("keys", "untranslated"): ("keys/untranslated", "error", "Value still holds English text"),
+    ("keys", "duplicate"): ("keys/duplicate", "error", "Key repeated in the same object"),
+    ("placeholders", "placeholder"): ("placeholders/mismatch", "error",
+                                      "Placeholders differ from en.json"),
+    ("english", "english"): ("english/stub", "warning", "Possibly untranslated English text"),
+    ("lengths", "length"): ("lengths/limit", "warning", "String may exceed a Discord limit"),
+    ("keys", "error"): ("file/error", "error", "Locale file could not be loaded"),
+}
+
+# Issues kept per locale and check by summarize(); the reports print at most this many
+SUMMARY_LIMIT = 10
+
+
+def _issue(check, kind, lang, key, message, **extra):
+    record = {"type": "issue", "check": check, "kind": kind, "lang": lang,
+              "file": f"{lang}.json", "key": key, "message": message}
+    record.update(extra)
+    return record
+
+
+def iter_issues(ref, locale, check_names):
+    """Yield the issue records of one locale for the named checks, in report order
+
+    check_names must not contain "complete"; it is derived from the keys check.
+    """
+    lang = locale.code
+    if locale.error:
+        for name in check_names:
+            message = f"{lang}.json: {locale.error}" if name == "lengths" else locale.error
+            yield _issue(name, "error", lang, None, message)
+        return
+
+    columns = ref.columns(locale)
+    values = columns.values
+    if "keys" in check_names:
+        for key in columns.missing():
+            yield _issue("keys", "missing", lang, key, f"{key} is missing")
+        for key in sorted(columns.extra):
+            yield _issue("keys", "extra", lang, key, f"{key} is not in en.json")
+        # Key ids follow sorted key order, like check_keys() sorts untranslated keys
+        entries = ref.entries
+        for i, key in enumerate(ref.table.keys):
+            entry = entries.get(key)
+            if entry is None or entry.skip or values[i] is None:
+                continue
+            message = english_issue(ref, key, values[i])
+            if message:
+                yield _issue("keys", "untranslated", lang, key, message)
+        for key, line, column in locale.duplicates:
+            yield _issue("keys", "duplicate", lang, key, f"{key} is repeated",
+                         line=line, column=column)
+
+    if "placeholders" in check_names:
+        for key, i in ref.placeholder_ids:
+            if values[i] is not None:
+                message = placeholder_issue(ref, key, values[i])
+                if message:
+                    yield _issue("placeholders", "placeholder", lang, key, message)
+
+    if "english" in check_names:
+        for key, i in ref.english_ids:
+            if values[i] is not None:
+                message = english_issue(ref, key, values[i])
+                if message:
+                    yield _issue("english", "english", lang, key, message)
+
+    if "lengths" in check_names:
+        for key, value in locale.strings.items():
+            message = length_issue(lang, key, value)
+            if message:
+                yield _issue("lengths", "length", lang, key, message)
+
+    for name in check_names:
+        check = CHECKS[name][1]
+        if isinstance(check, CheckerCall):
+            batch = ref.batch(locale)
+            for row, message in collect(check.checker, batch):
+                yield _issue(name, "issue", lang, batch.keys[row], message)
+
+
+class NdjsonWriter:
+    """Write run, locale and issue records as newline-delimited JSON"""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def _write(self, record):
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def start(self, check_names, english_keys, error=None):
+        self._write({"type": "run", "checks": check_names, "english_keys": english_keys,
+                     "error": error})
+
+    def locale(self, lang, check_names):
+        self._write({"type": "locale", "lang": lang, "checks": check_names})
+
+    def issue(self, record):
+        self._write(record)
+
+    def close(self):
+        self.stream.flush()
+
+
+class SarifWriter:
+    """Write issues as one SARIF 2.1.0 run, streaming the results array"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._results = 0
+
+    def start(self, check_names, english_keys, error=None):
+        rules = [
+            {"id": rule_id, "shortDescription": {"text": description},
+             "defaultConfiguration": {"level": level}}
+            for rule_id, level, description in RULES.values()
+        ]
+        rules.extend(
+            {"id": name, "shortDescription": {"text": CHECKS[name][1].checker.title or name},
+             "defaultConfiguration": {"level": "warning"}}
+            for name in check_names if isinstance(CHECKS[name][1], CheckerCall)
+        )
+        log = {
+            "version": "2.1.0",
+            "$schema": SARIF_SCHEMA,
+            "runs": [{"tool": {"driver": {"name": "locale_engine", "rules": rules}}}],
+        }
+        if error:
+            notification = {"message": {"text": f"Could not load en.json: {error}"}}
+            log["runs"][0]["invocations"] = [{
+                "executionSuccessful": False,
+                "toolExecutionNotifications": [notification],
+            }]
+        head = json.dumps(log, ensure_ascii=False)
+        # Leave the run open so results can follow as they are found
+        self.stream.write(head[:-len("}]}")] + ', "results": [\n')
+
+    def locale(self, lang, check_names):
+        pass
+
+    def issue(self, record):
+        rule = RULES.get((record["check"], record["kind"]))
+        if rule is None:
+            # Load errors of every check share one rule; plugin checks are their own rule
+            if record["kind"] == "error":
+                rule = RULES["keys", "error"]
+            else:
+                rule = (record["check"], "warning", "")
+        rule_id, level, _ = rule
+        location = {"physicalLocation": {"artifactLocation": {"uri": record["file"]}}}
+        if "line" in record:
+            location["physicalLocation"]["region"] = {
+                "startLine": record["line"], "startColumn": record["column"]
+            }
+        if record["key"] is not None:
+            location["logicalLocations"] = [{"fullyQualifiedName": record["key"]}]
+        result = {"ruleId": rule_id, "level": level,
+                  "message": {"text": record["message"]}, "locations": [location]}
+        separator = ",\n" if self._results else ""
+        self.stream.write(separator + json.dumps(result, ensure_ascii=False))
+        self._results += 1
+
+    def close(self):
+        self.stream.write("\n]}]}\n")
+        self.stream.flush()
+
+
+WRITERS = {"ndjson": NdjsonWriter, "sarif": SarifWriter}
+
+
+def stream_checks(check_names, writer, locale_dir=".", cache=None, stream=False, similarity=None):
+    """Run the named checks, writing every issue as soon as it is found
+
+    Locales are loaded and checked one at a time. Returns {check name:
+    passed} with the same verdicts locale_engine.run_checks() reports.
+    """
+    ref = load_reference(locale_dir, cache, stream)
+    if ref.locale.error:
+        writer.start(check_names, 0, ref.locale.error)
+        writer.close()
+        return {name: False for name in check_names}
+    if similarity is not None:
+        ref.enable_similarity(similarity)
+    writer.start(check_names, len(ref.keys))
+
+    # "complete" is reported from the keys check's issues
+    issue_checks = []
+    for name in check_names:
+        name = "keys" if name == "complete" else name
+        if name not in issue_checks:
+            issue_checks.append(name)
+
+    failed = set()
+    for lang in discover_languages(locale_dir):
+        names = [name for name in issue_checks if lang not in CHECKS[name][0]]
+        if not names:
+            continue
+        start = time.perf_counter()
+        locale = ref.locale if lang == "en" else load_locale(lang, locale_dir, cache, stream)
+        writer.locale(lang, names)
+        with phase("check"):
+            for record in iter_issues(ref, locale, names):
+                failed.add(record["check"])
+                writer.issue(record)
+        record_locale(lang, time.perf_counter() - start, len(locale.strings))
+    writer.close()
+
+    return {name: name == "complete" or name not in failed for name in check_names}
+
+
+class _Sample(list):
+    """The first few items of a sequence; len() is the length of the whole sequence"""
+
+    def __init__(self, limit=SUMMARY_LIMIT):
+        super().__init__()
+        self.limit = limit
+        self.total = 0
+
+    def add(self, item):
+        self.total += 1
+        if list.__len__(self) < self.limit:
+            self.append(item)
+
+    def __len__(self):
+        return self.total
+
+
+class _EnglishKeys:
+    """Stands in for the English reference in the reports, which only count its keys"""
+
+    def __init__(self, count):
+        self.keys = range(count)
+
+
+def summarize(records):
+    """Print the locale_engine.py report of an iterable of NDJSON records
+
+    Returns {check name: passed}, or None if the stream has no run record.
+    """
+    run = None
+    languages = []
+    samples = {}  # (check, lang) -> {kind: _Sample}
+    for record in records:
+        kind = record.get("type")
+        if kind == "run":
+            run = record
+        elif kind == "locale":
+            languages.append(record["lang"])
+            for name in record["checks"]:
+                samples[name, record["lang"]] = {}
+        elif kind == "issue":
+            sample = samples[record["check"], record["lang"]].setdefault(record["kind"], _Sample())
+            if record["kind"] == "duplicate":
+                sample.add((record["key"], record["line"], record["column"]))
+            elif record["kind"] in ("missing", "extra", "untranslated"):
+                sample.add(record["key"])
+            else:
+                sample.add(record["message"])
+    if run is None:
+        return None
+    check_names = run["checks"]
+    if run["error"]:
+        print(f"[ERROR] Could not load en.json: {run['error']}")
+        return {name: False for name in check_names}
+
+    # Per-locale check function -> name of the check its issues are recorded under
+    names = {
+        check: "keys" if name == "complete" else name for name, (_, check, _) in CHECKS.items()
+    }
+
+    def result_for(check, lang):
+        kinds = samples.get((names[check], lang))
+        if kinds is None:
+            return None
+        if "error" in kinds:
+            error = kinds["error"][0]
+            return (False, error, [], []) if check is check_keys else [error]
+        if check is check_keys:
+            return keys_result(*(kinds.get(kind, _Sample()) for kind in
+                                 ("missing", "extra", "untranslated", "duplicate")))
+        return next(iter(kinds.values()), [])
+
+    return report_checks(_EnglishKeys(run["english_keys"]), check_names, languages,
+                         result_for, headers=len(check_names) > 1)
+
+
+def read_records(stream):
+    """Yield the records of an NDJSON stream, skipping blank lines"""
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print the locale_engine.py report of an NDJSON issue stream "
+                    "(locale_engine.py --format ndjson)"
+    )
+    parser.add_argument("input", nargs="?", help="NDJSON file (default: stdin)")
+    parser.add_argument("--plugin", action="append", default=[], metavar="MODULE",
+                        help="Plugin module the stream was checked with; repeatable")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "locale_report"):
+        return _run(args)
+
+
+def _run(args):
+    """Summarize the stream selected by parsed command line arguments"""
+    try:
+        add_plugins(args.plugin)
+    except (ImportError, ValueError) as e:
+        print(f"[ERROR] Could not load plugin: {e}")
+        return 1
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            outcome = summarize(read_records(f))
+    else:
+        outcome = summarize(read_records(sys.stdin))
+    if outcome is None:
+        print("[ERROR] No run record in the stream")
+        return 1
+    return 0 if all(outcome.values()) else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Index of identical values across keys and locales, for reuse suggestions
+
+ReuseIndex hashes every English value and every added locale's values once,
+so building it is linear in the number of strings and each question below is
+a dict lookup:
+
+- which English source strings are shared by several keys,
+- which keys of a locale hold the same translation,
+- for a key a locale is missing, which other key already has a translation
+  of the same English text in that locale.
+"""
+import argparse
+from locale_cache import DEFAULT_CACHE_DIR, LocaleCache
+from locale_engine import (
+    EXCLUDED_FILES,
+    FLATTEN_VERSION,
+    discover_languages,
+    english_match,
+    load_locale,
+    load_reference
+)
+from locale_profile import add_profile_arguments, profiling
+
+
+def _group(strings):
+    """Return {value: [keys]} of a {key: value} mapping, keys in mapping order"""
+    groups = {}
+    for key, value in strings.items():
+        groups.setdefault(value, []).append(key)
+    return groups
+
+
+class ReuseIndex:
+    """Hash index over the flattened string values of en.json and any number of locales"""
+
+    def __init__(self, ref):
+        """ref is the locale_engine.EnglishReference of en.json"""
+        self.english = ref.strings
+        self.entries = ref.entries
+        self.keys_by_english = _group(ref.strings)
+        self.locales = {}         # lang -> {key: value}
+        self.keys_by_value = {}   # lang -> {value: [keys]}
+
+    def add_locale(self, lang_code, strings):
+        """Index one locale's {key: value} strings"""
+        self.locales[lang_code] = strings
+        self.keys_by_value[lang_code] = _group(strings)
+
+    def shared_english(self):
+        """Return {English value: [keys]} for values used by more than one key"""
+        return {value: keys for value, keys in self.keys_by_english.items() if len(keys) > 1}
+
+    def duplicates(self, lang_code):
+        """Return {translation: [keys]} for values a locale uses for more than one key"""
+        return {
+            value: keys
+            for value, keys in self.keys_by_value[lang_code].items() if len(keys) > 1
+        }
+
+    def keys_with_value(self, lang_code, value):
+        """Return the keys of a locale holding exactly this value"""
+        return self.keys_by_value[lang_code].get(value, [])
+
+    def suggest(self, key, lang_strings):
+        """Return (source key, translation) to reuse for a key, or None
+
+        lang_strings is a locale's {key: value} mapping, or anything with a
+        get() method. The source is the first other key with the same English
+        value whose translation is not itself an English stub.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        # Every key of the group has this English value, so one compiled entry serves all
+        for other in self.keys_by_english[entry.value]:
+            if other == key:
+                continue
+            translation = lang_strings.get(other)
+            if translation is not None and english_match(entry, translation) is None:
+                return other, translation
+        return None
+
+    def suggestions(self, lang_code, keys):
+        """Return {key: (source key, translation)} for the given missing keys of an indexed locale"""
+        strings = self.locales[lang_code]
+        found = {}
+        for key in keys:
+            suggestion = self.suggest(key, strings)
+            if suggestion:
+                found[key] = suggestion
+        return found
+
+
+def _preview(value, limit=40):
+    """Return a value truncated for display"""
+    return value[:limit] + "..." if len(value) > limit else value
+
+
+def _print_groups(groups, limit):
+    """Print the largest value groups first, a few keys each"""
+    ordered = sorted(groups.items(), key=lambda item: -len(item[1]))
+    for value, keys in ordered[:limit]:
+        examples = ", ".join(keys[:3])
+        if len(keys) > 3:
+            examples += f", ... ({len(keys) - 3} more)"
+        print(f"  - '{_preview(value)}' ({len(keys)} keys): {examples}")
+    if len(ordered) > limit:
+        print(f"  ... and {len(ordered) - limit} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report shared English strings, duplicate translations and reusable translations"
+    )
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--lang", action="append", help="Only report this locale; repeatable")
+    parser.add_argument("--limit", type=int, default=10, help="Entries shown per section (default: 10)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Cache of flattened locales (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse every locale")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "locale_reuse"):
+        return _run(args)
+
+
+def _run(args):
+    """Print the reuse report selected by parsed command line arguments"""
+    cache = None if args.no_cache else LocaleCache(args.cache_dir, FLATTEN_VERSION)
+    ref = load_reference(args.dir, cache)
+    if ref.locale.error:
+        print(f"[ERROR] Could not load en.json: {ref.locale.error}")
+        return 1
+
+    index = ReuseIndex(ref)
+    shared = index.shared_english()
+    print(f"[INFO] en.json: {len(ref.strings)} strings, {len(index.keys_by_english)} distinct; "
+          f"{len(shared)} values shared by {sum(len(keys) for keys in shared.values())} keys")
+    _print_groups(shared, args.limit)
+
+    languages = args.lang or discover_languages(args.dir, EXCLUDED_FILES)
+    for lang in languages:
+        locale = load_locale(lang, args.dir, cache)
+        print()
+        if locale.error:
+            print(f"[FAIL] {lang}.json: {locale.error}")
+            continue
+
+        index.add_locale(lang, locale.strings)
+        duplicates = index.duplicates(lang)
+        missing = ref.columns(locale).missing()
+        suggestions = index.suggestions(lang, missing)
+        print(f"[INFO] {lang}.json: {len(duplicates)} translations shared by "
+              f"{sum(len(keys) for keys in duplicates.values())} keys; "
+              f"{len(suggestions)} of {len(missing)} missing keys have a reusable translation")
+        _print_groups(duplicates, args.limit)
+        for key, (source, translation) in list(suggestions.items())[:args.limit]:
+            print(f"  + {key} <- {source}: '{_preview(translation)}'")
+        if len(suggestions) > args.limit:
+            print(f"  ... and {len(suggestions) - args.limit} more suggestions")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Runtime lookup of translated strings for the bot
+
+A Locale holds one flat {dotted key: string} dict with its fallback chain
+already applied: for pt-BR the strings of en, then pt, then pt-BR are laid
+over each other once at load, so a lookup is a single dict access whatever
+locale supplied the value.
+
+format() fills a string's {placeholders} through its precompiled
+locale_template.Template and keeps the results in a bounded LRU cache,
+since the same event embeds are formatted again and again with the same
+values. cache_info() reports hits, misses and size for tuning cache_size
+against real event volume.
+
+Templates support a subset of str.format: only plain {name} placeholders
+are filled. {{ and }} are not escapes, so "{{name}}" renders as "{value}".
+Format specs, conversions, attribute and index lookups such as {n:>5},
+{n!r}, {user.name} and {args[0]} are left in the text unfilled.
+"""
+import argparse
+import functools
+from locale_catalog import LocaleCatalog
+from locale_engine import load_locale
+from locale_profile import add_profile_arguments, profiling
+from locale_template import Template
+
+DEFAULT_LOCALE = "en"
+DEFAULT_FORMAT_CACHE_SIZE = 4096
+
+
+def fallback_chain(code, default=DEFAULT_LOCALE):
+    """Return the codes to try for a locale, most specific first: pt-BR -> pt -> en"""
+    chain = []
+    parts = code.replace("_", "-").split("-")
+    for end in range(len(parts), 0, -1):
+        candidate = "-".join(parts[:end])
+        if candidate not in chain:
+            chain.append(candidate)
+    if code not in chain:
+        chain.insert(0, code)
+    if default and default not in chain:
+        chain.append(default)
+    return chain
+
+
+class Locale:
+    """Translated strings of one locale with its fallbacks resolved"""
+
+    def __init__(self, code, layers, cache_size=DEFAULT_FORMAT_CACHE_SIZE):
+        """layers: [(code, {key: value})], most specific first"""
+        self.code = code
+        self.chain = [layer_code for layer_code, _ in layers]
+        self.strings = {}
+        for _, strings in reversed(layers):
+            self.strings.update(strings)
+        self.templates = {}  # key -> Template, compiled on first use
+        self._cached_format = functools.lru_cache(maxsize=cache_size)(self._format)
+
+    @classmethod
+    def load(cls, code, locale_dir=".", fallbacks=None, cache=None,
+             cache_size=DEFAULT_FORMAT_CACHE_SIZE):
+        """Load a locale and its fallbacks from the JSON files in locale_dir
+
+        fallbacks is the chain to load, defaulting to fallback_chain(code).
+        Codes without a file are skipped; a file that fails to load raises
+        ValueError, as does a chain where no file exists.
+        """
+        layers = []
+        for layer_code in fallbacks or fallback_chain(code):
+            locale = load_locale(layer_code, locale_dir, cache)
+            if locale.error and locale.error.startswith("File not found"):
+                continue
+            if locale.error:
+                raise ValueError(f"{layer_code}.json: {locale.error}")
+            layers.append((layer_code, locale.strings))
+        if not layers:
+            raise ValueError(f"No locale file found for {code} in {locale_dir}")
+        return cls(code, layers, cache_size)
+
+    @classmethod
+    def from_catalog(cls, catalog, code, fallbacks=None, cache_size=DEFAULT_FORMAT_CACHE_SIZE):
+        """Load a locale and its fallbacks from a locale_catalog.LocaleCatalog"""
+        layers = [
+            (layer_code, catalog.strings(layer_code))
+            for layer_code in fallbacks or fallback_chain(code)
+            if layer_code in catalog.tables
+        ]
+        if not layers:
+            raise ValueError(f"No locale {code} in the catalog")
+        return cls(code, layers, cache_size)
+
+    def get(self, key, default=None):
+        """Return the string of a dotted key, or default"""
+        return self.strings.get(key, default)
+
+    def __getitem__(self, key):
+        return self.strings[key]
+
+    def __contains__(self, key):
+        return key in self.strings
+
+    def __len__(self):
+        return len(self.strings)
+
+    def template(self, key):
+        """Return the compiled Template of a key's string; raises KeyError for an unknown key"""
+        template = self.templates.get(key)
+        if template is None:
+            template = self.templates[key] = Template(self.strings[key])
+        return template
+
+    def _format(self, key, values):
+        """Format a key's string with a tuple of (name, value) pairs"""
+        return self.template(key).render(dict(values))
+
+    def format(self, key, **values):
+        """Return a key's string with its placeholders filled, cached by key and values
+
+        Placeholders without a value are left in place. Raises KeyError for
+        an unknown key. Unhashable values are formatted without the cache.
+        """
+        items = tuple(sorted(values.items()))
+        try:
+            return self._cached_format(key, items)
+        except TypeError:
+            # Unhashable values
+            return self._format(key, items)
+
+    def format_many(self, key, rows):
+        """Format a key's string once per {name: value} mapping in rows, bypassing the cache"""
+        return self.template(key).render_many(rows)
+
+    def cache_info(self):
+        """Return the format cache's (hits, misses, maxsize, currsize)"""
+        return self._cached_format.cache_info()
+
+    def cache_clear(self):
+        """Empty the format cache and reset its counters"""
+        self._cached_format.cache_clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up and format a translated string")
+    parser.add_argument("lang", help="Locale code, e.g. pt-BR")
+    parser.add_argument("key", help="Dotted key, e.g. events.moderation.member_banned.title")
+    parser.add_argument("values", nargs="*", metavar="NAME=VALUE", help="Placeholder values")
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--catalog", help="Read a compiled locale_catalog.py catalog instead")
+    parser.add_argument("--fallback", action="append",
+                        help="Fallback chain, most specific first; repeatable "
+                             "(default: the code's parents, then en)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "locale_runtime"):
+        return _run(args)
+
+
+def _run(args):
+    """Look up and format the string selected by parsed command line arguments"""
+    try:
+        if args.catalog:
+            with LocaleCatalog(args.catalog) as catalog:
+                locale = Locale.from_catalog(catalog, args.lang, args.fallback)
+        else:
+            locale = Locale.load(args.lang, args.dir, args.fallback)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    values = dict(value.split("=", 1) for value in args.values if "=" in value)
+    try:
+        print(locale.format(args.key, **values))
+    except KeyError:
+        print(f"[FAIL] {args.key} not found in {' -> '.join(locale.chain)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
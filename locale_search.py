@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Trigram inverted index over the key paths and values of every locale
+
+Each (language, key) pair with a string value is a document. The index maps
+every three-character slice of the lowercased key paths to the key ids that
+contain it, and every slice of the lowercased values to the documents that
+contain it. A substring query intersects the posting lists of the query's
+trigrams and only verifies the few candidates left, so searching every
+locale costs about as much as searching one. Queries shorter than three
+characters have no trigrams and scan the lowercased strings instead.
+
+Key paths are sorted before ids are assigned, so a key path prefix (the
+dashboard's category filter) is a contiguous id range found by bisection.
+
+generate_stats writes the index as gzipped JSON next to the dashboard bundle:
+
+  version     SEARCH_VERSION; readers ignore indexes of other versions
+  languages   language codes, doc language ids index into it
+  keys        sorted key paths, doc key ids index into it
+  docs        flat [language id, key id, ...] pairs, sorted by language then key
+  values      the value of each doc
+  key_grams   {trigram: key ids}, delta encoded
+  value_grams {trigram: doc ids}, delta encoded
+"""
+import argparse
+import bisect
+import gzip
+import json
+import os
+import time
+from collections import namedtuple
+from pathlib import Path
+from locale_cache import DEFAULT_CACHE_DIR, LocaleCache
+from locale_engine import FLATTEN_VERSION, GENERATED_FILES, discover_languages, load_locale
+from locale_profile import add_profile_arguments, profiling
+
+SEARCH_FILE = "search_index.json.gz"
+
+# Bump whenever the layout above changes
+SEARCH_VERSION = 1
+
+Match = namedtuple("Match", ["lang", "key", "value"])
+
+
+def trigrams(text):
+    """Return the set of three-character slices of text"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _delta_encode(ids):
+    """Return sorted ids as differences from the previous id"""
+    previous = 0
+    deltas = []
+    for i in ids:
+        deltas.append(i - previous)
+        previous = i
+    return deltas
+
+
+def _delta_decode(deltas):
+    """Return the ids of a delta encoded posting list"""
+    ids = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        ids.append(total)
+    return ids
+
+
+def _postings(texts):
+    """Return {trigram: increasing ids} of a list of texts"""
+    postings = {}
+    for i, text in enumerate(texts):
+        for gram in trigrams(text):
+            postings.setdefault(gram, []).append(i)
+    return postings
+
+
+class SearchIndex:
+    """Substring and prefix search over the keys and values of many locales"""
+
+    def __init__(self, languages, keys, docs, values, key_grams=None, value_grams=None):
+        """docs is a list of (language id, key id), sorted, aligned to values
+
+        The trigram postings are built here unless given (see load()).
+        """
+        self.languages = languages
+        self.keys = keys
+        self.docs = docs
+        self.values = values
+        self.lang_ids = {lang: i for i, lang in enumerate(languages)}
+        self.keys_lower = [key.lower() for key in keys]
+        self.values_lower = [value.lower() for value in values]
+        # key id -> ids of the docs with that key
+        self.key_docs = [[] for _ in keys]
+        for doc, (_, key_id) in enumerate(docs):
+            self.key_docs[key_id].append(doc)
+        self.key_grams = key_grams if key_grams is not None else _postings(self.keys_lower)
+        self.value_grams = value_grams if value_grams is not None else _postings(self.values_lower)
+
+    @classmethod
+    def from_locales(cls, locales):
+        """Build the index of {lang: {key: value}} string mappings"""
+        languages = list(locales)
+        keys = sorted({key for strings in locales.values() for key in strings})
+        key_ids = {key: i for i, key in enumerate(keys)}
+        docs = []
+        values = []
+        for lang_id, strings in enumerate(locales.values()):
+            for key_id, value in sorted((key_ids[key], value) for key, value in strings.items()):
+                docs.append((lang_id, key_id))
+                values.append(value)
+        return cls(languages, keys, docs, values)
+
+    def _matching(self, query, texts, grams, prefix):
+        """Return the ids of texts containing query (starting with it when prefix is set)"""
+        query_grams = trigrams(query)
+        if query_grams:
+            lists = sorted((grams.get(gram, ()) for gram in query_grams), key=len)
+            candidates = set(lists[0])
+            for ids in lists[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(ids)
+        else:
+            candidates = range(len(texts))
+        if prefix:
+            return [i for i in candidates if texts[i].startswith(query)]
+        return [i for i in candidates if query in texts[i]]
+
+    def key_range(self, key_prefix):
+        """Return the range of key ids whose path starts with key_prefix"""
+        start = bisect.bisect_left(self.keys, key_prefix)
+        # Every path with the prefix sorts before the prefix followed by the highest character
+        end = bisect.bisect_left(self.keys, key_prefix + "\U0010ffff", start)
+        return range(start, end)
+
+    def search(self, query="", languages=None, key_prefix=None, prefix=False, limit=None):
+        """Return the Matches whose key path or value contains query, case-insensitively
+
+        With prefix set, the key path or value must start with query instead.
+        languages limits the search to some language codes and key_prefix to
+        key paths starting with it, like the dashboard's category filter.
+        Matches come in language, then key order.
+        """
+        query = query.lower()
+        keys = self.key_range(key_prefix) if key_prefix else None
+        if not query:
+            if keys is None:
+                docs = range(len(self.docs))
+            else:
+                docs = [doc for key_id in keys for doc in self.key_docs[key_id]]
+        else:
+            docs = set(self._matching(query, self.values_lower, self.value_grams, prefix))
+            for key_id in self._matching(query, self.keys_lower, self.key_grams, prefix):
+                docs.update(self.key_docs[key_id])
+            if keys is not None:
+                docs = [doc for doc in docs if self.docs[doc][1] in keys]
+
+        lang_ids = None
+        if languages is not None:
+            lang_ids = {self.lang_ids[lang] for lang in languages if lang in self.lang_ids}
+        matches = []
+        for doc in sorted(docs):
+            lang_id, key_id = self.docs[doc]
+            if lang_ids is not None and lang_id not in lang_ids:
+                continue
+            matches.append(Match(self.languages[lang_id], self.keys[key_id], self.values[doc]))
+            if limit is not None and len(matches) >= limit:
+                break
+        return matches
+
+    def save(self, path=SEARCH_FILE):
+        """Write the index as gzipped JSON, byte-identical for identical content"""
+        data = {
+            "version": SEARCH_VERSION,
+            "languages": self.languages,
+            "keys": self.keys,
+            "docs": [i for doc in self.docs for i in doc],
+            "values": self.values,
+            "key_grams": {gram: _delta_encode(ids) for gram, ids in sorted(self.key_grams.items())},
+            "value_grams": {gram: _delta_encode(ids) for gram, ids in sorted(self.value_grams.items())},
+        }
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(body, mtime=0))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SEARCH_FILE):
+        """Load an index written by save(), or return None if it is missing or outdated"""
+        try:
+            with gzip.open(path, 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != SEARCH_VERSION:
+            return None
+        flat = data["docs"]
+        return cls(
+            data["languages"], data["keys"], list(zip(flat[::2], flat[1::2])), data["values"],
+            {gram: _delta_decode(ids) for gram, ids in data["key_grams"].items()},
+            {gram: _delta_decode(ids) for gram, ids in data["value_grams"].items()},
+        )
+
+
+def load_directory(locale_dir=".", cache=None):
+    """Build the index of every locale file in a directory, en.json included"""
+    locales = {}
+    for lang in discover_languages(locale_dir, GENERATED_FILES):
+        locale = load_locale(lang, locale_dir, cache)
+        if locale.error:
+            print(f"[WARN] {lang}.json: {locale.error}")
+            continue
+        locales[lang] = locale.strings
+    return SearchIndex.from_locales(locales)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the key paths and values of every locale")
+    parser.add_argument("query", nargs="?", default="", help="Text to find, case-insensitive")
+    parser.add_argument("--prefix", action="store_true",
+                        help="Match key paths or values starting with the query")
+    parser.add_argument("--lang", action="append", help="Only search this locale; repeatable")
+    parser.add_argument("--category", metavar="KEY_PREFIX",
+                        help="Only search key paths starting with KEY_PREFIX (e.g. events.)")
+    parser.add_argument("--limit", type=int, default=50, help="Matches shown (default: 50)")
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--index", metavar="PATH",
+                        help=f"Search a saved index (e.g. {SEARCH_FILE}) instead of --dir")
+    parser.add_argument("--save", metavar="PATH", help="Also save the index built from --dir")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Cache of flattened locales (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse every locale")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profiling(args, "locale_search"):
+        return _run(args)
+
+
+def _run(args):
+    """Run the search selected by parsed command line arguments"""
+    start = time.perf_counter()
+    if args.index:
+        index = SearchIndex.load(args.index)
+        if index is None:
+            print(f"[ERROR] Could not load search index {args.index}")
+            return 1
+    else:
+        cache = None if args.no_cache else LocaleCache(args.cache_dir, FLATTEN_VERSION)
+        index = load_directory(args.dir, cache)
+        if args.save:
+            index.save(args.save)
+    loaded = time.perf_counter()
+
+    matches = index.search(args.query, args.lang, args.category, args.prefix)
+    elapsed_ms = (time.perf_counter() - loaded) * 1000
+    for match in matches[:args.limit]:
+        print(f"[{match.lang}] {match.key}: {match.value}")
+    if len(matches) > args.limit:
+        print(f"  ... and {len(matches) - args.limit} more")
+    print(f"[OK] {len(matches)} matches in {len(index.languages)} locales, "
+          f"{len(index.docs)} strings ({elapsed_ms:.1f} ms search, "
+          f"{(loaded - start) * 1000:.1f} ms load)")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
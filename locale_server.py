@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Local HTTP service for the dashboard's statistics and merged locale trees
+
+The service is built on generate_stats: every language is overlaid from the
+branch checkouts and its statistics are calculated once, then kept in memory
+along with the encoded (and gzipped) responses. Each request only stats the
+files the answer depends on. A language is reloaded when one of its own
+files changed; a change to en.json recalculates every language's statistics
+but keeps their merged trees.
+
+Responses are gzipped for clients that accept it and carry an ETag per
+encoding: the gzipped form's ends in -gzip, so a cache keyed on it never
+serves one encoding for the other. Open http://localhost:8000/ to get
+index.html wired to the service instead of fetching every branch's files
+and recomputing in the browser.
+
+Endpoints:
+  /api/languages         language codes, en first
+  /api/stats             {lang: stats} like translation_stats.json
+  /api/stats/<lang>      one language's stats
+  /api/keys/<lang>       missing and untranslated keys, with reuse suggestions
+  /api/tree/<lang>       the branches' files deep-merged, as the dashboard shows them
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+from collections import namedtuple
+from functools import reduce
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from generate_stats import (
+    DEFAULT_BRANCHES,
+    calculate_stats,
+    deep_merge,
+    english_reference,
+    find_languages,
+    load_branch_data,
+    load_english,
+    overlay_data
+)
+from locale_cache import content_hash
+from locale_engine import GENERATED_FILES
+from locale_profile import add_profile_arguments, profiling
+from locale_reuse import ReuseIndex
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+
+LANG_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# An encoded response body, shared by every request for it until invalidated
+Response = namedtuple("Response", ["etag", "body", "gzipped"])
+
+
+def make_response(body):
+    """Return the Response of a body, with its ETag and gzipped form"""
+    gzipped = gzip.compress(body) if len(body) >= GZIP_MIN_BYTES else None
+    return Response(f'"{content_hash(body)}"', body, gzipped)
+
+
+def accepts_gzip(accept_encoding):
+    """Return whether an Accept-Encoding header value allows a gzipped response
+
+    gzip;q=0 refuses gzip, and * stands for every coding not listed.
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def encode(payload):
+    """Encode a JSON payload once into a Response"""
+    return make_response(
+        json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    )
+
+
+class LanguageEntry:
+    """One language's loaded branch data and everything derived from it"""
+
+    def __init__(self, signature, datas):
+        self.signature = signature
+        # Branches' data, highest precedence first
+        self.datas = datas
+        self.overlay = overlay_data(datas)
+        self.stats = None      # Calculated on first use, dropped when en.json changes
+        self.responses = {}    # route -> Response
+
+
+class StatsService:
+    """In-memory statistics of the branch checkouts, refreshed per changed language
+
+    Every public method holds the lock, since handler threads share the
+    entries and the profiler's phase stack that generate_stats records into.
+    """
+
+    def __init__(self, branches=DEFAULT_BRANCHES):
+        self.branches = list(branches)
+        self.lock = threading.Lock()
+        self.entries = {}  # lang -> LanguageEntry
+        self.en_signature = None
+        self.ref = None  # EnglishReference
+        self.reuse = None
+        self.all_stats = None  # (signatures, Response) of /api/stats
+
+    def _paths(self, lang_code):
+        """Return every file generate_stats may read for a language"""
+        return [*(Path(branch) / f"{lang_code}.json" for branch in self.branches),
+                Path(f"{lang_code}.json")]
+
+    def _signature(self, lang_code):
+        """Return the (mtime, size) of each of a language's files, None where missing"""
+        signature = []
+        for path in self._paths(lang_code):
+            try:
+                stat = path.stat()
+            except OSError:
+                signature.append(None)
+            else:
+                signature.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _refresh_english(self):
+        """Reload the English reference if en.json changed; return False if it is missing"""
+        signature = self._signature('en')
+        if signature != self.en_signature:
+            en_data = load_english(self.branches)
+            self.en_signature = signature
+            self.ref = english_reference(en_data) if en_data else None
+            self.reuse = ReuseIndex(self.ref) if en_data else None
+            # Every language's stats compare against English; their trees are still valid
+            for entry in self.entries.values():
+                entry.stats = None
+                entry.responses.pop("stats", None)
+                entry.responses.pop("keys", None)
+        return self.ref is not None
+
+    def _entry(self, lang_code):
+        """Return a language's current LanguageEntry, reloading it if its files changed"""
+        if lang_code in GENERATED_FILES:
+            return None
+        signature = self._signature(lang_code)
+        entry = self.entries.get(lang_code)
+        if entry is None or entry.signature != signature:
+            datas = load_branch_data(self.branches, lang_code)
+            if not datas:
+                self.entries.pop(lang_code, None)
+                return None
+            entry = self.entries[lang_code] = LanguageEntry(signature, datas)
+        return entry
+
+    def _calculated(self, lang_code):
+        """Return a language's LanguageEntry with its stats, or None if it or en.json is missing"""
+        if not self._refresh_english():
+            return None
+        entry = self._entry(lang_code)
+        if entry is None:
+            return None
+        if entry.stats is None:
+            entry.stats = calculate_stats(lang_code, self.ref, entry.overlay, self.reuse)
+        return entry
+
+    def languages(self):
+        """Return the Response listing every language found in the branches"""
+        with self.lock:
+            return encode(find_languages(self.branches))
+
+    def stats(self, lang_code):
+        """Return the Response of one language's stats, or None"""
+        with self.lock:
+            entry = self._calculated(lang_code)
+            if entry is None:
+                return None
+            if "stats" not in entry.responses:
+                entry.responses["stats"] = encode(entry.stats)
+            return entry.responses["stats"]
+
+    def keys(self, lang_code):
+        """Return the Response of one language's missing and untranslated keys, or None"""
+        with self.lock:
+            entry = self._calculated(lang_code)
+            if entry is None:
+                return None
+            if "keys" not in entry.responses:
+                stats = entry.stats
+                entry.responses["keys"] = encode({
+                    'missingKeys': stats['missingKeys'],
+                    'untranslatedKeys': stats['untranslatedKeys'],
+                    'suggestions': stats.get('suggestions', {}),
+                })
+            return entry.responses["keys"]
+
+    def tree(self, lang_code):
+        """Return the Response of a language's merged tree, or None"""
+        with self.lock:
+            entry = self._entry(lang_code)
+            if entry is None:
+                return None
+            if "tree" not in entry.responses:
+                # deep_merge() takes the lower precedence branch first
+                entry.responses["tree"] = encode(
+                    reduce(deep_merge, reversed(entry.datas[:-1]), entry.datas[-1])
+                )
+            return entry.responses["tree"]
+
+    def all_stats_response(self):
+        """Return the Response of every language's stats, like translation_stats.json"""
+        with self.lock:
+            stats = {}
+            for lang_code in find_languages(self.branches):
+                entry = self._calculated(lang_code)
+                if entry is not None:
+                    stats[lang_code] = entry
+            signatures = tuple(
+                (lang_code, entry.signature) for lang_code, entry in stats.items()
+            ) + (self.en_signature,)
+            if self.all_stats is None or self.all_stats[0] != signatures:
+                self.all_stats = signatures, encode(
+                    {lang_code: entry.stats for lang_code, entry in stats.items()}
+                )
+            return self.all_stats[1]
+
+
+class StatsHandler(BaseHTTPRequestHandler):
+    """Serve a StatsService's responses and the dashboard page"""
+
+    service = None  # Set by make_server()
+    dashboard = Path(__file__).with_name("index.html")
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if path == "":
+            # Point the dashboard at this service
+            self.send_response(HTTPStatus.FOUND)
+            self.send_header("Location", "/index.html?api=/api")
+            self.end_headers()
+            return
+        if path == "/index.html":
+            try:
+                response = make_response(self.dashboard.read_bytes())
+            except OSError:
+                response = None
+            self._send(response, "text/html; charset=utf-8")
+            return
+
+        parts = path.split('/')[1:]
+        response = None
+        if parts == ["api", "languages"]:
+            response = self.service.languages()
+        elif parts == ["api", "stats"]:
+            response = self.service.all_stats_response()
+        elif (len(parts) == 3 and parts[0] == "api" and parts[1] in ("stats", "keys", "tree")
+              and LANG_PATTERN.fullmatch(parts[2])):
+            response = getattr(self.service, parts[1])(parts[2])
+        self._send(response)
+
+    def _send(self, response, content_type="application/json; charset=utf-8"):
+        """Send a Response, a 304 when the client has it, or a 404 for None"""
+        if response is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        body = response.body
+        etag = response.etag
+        use_gzip = (response.gzipped is not None
+                    and accepts_gzip(self.headers.get("Accept-Encoding", "")))
+        if use_gzip:
+            body = response.gzipped
+            etag = f'{etag[:-1]}-gzip"'
+
+        cached = {tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")}
+        if etag in cached or "*" in cached:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(branches=DEFAULT_BRANCHES, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Return a threading HTTP server for a StatsService over branches"""
+    handler = type("BoundStatsHandler", (StatsHandler,), {"service": StatsService(branches)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve translation statistics to the dashboard")
+    parser.add_argument("--branch", action="append", dest="branches",
+                        help="Branch checkout directory, highest precedence first; repeatable "
+                             f"(default: {' '.join(DEFAULT_BRANCHES)})")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Port to listen on (default: {DEFAULT_PORT})")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "locale_server"):
+        return _run(args)
+
+
+def _run(args):
+    """Serve the statistics as configured by parsed command line arguments"""
+    server = make_server(args.branches or DEFAULT_BRANCHES, args.host, args.port)
+    print(f"[OK] Serving translation statistics on http://{args.host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[OK] Stopped")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Near-duplicate detection of English text with MinHash and LSH
+
+Strings are compared as sets of character trigrams of their lowercased,
+placeholder-free text. SimilarityIndex stores a MinHash signature of every
+English value and files it under one bucket per LSH band, so a translated
+string is only compared against the English values that share a band with
+it instead of against all of them. Scores are the exact Jaccard similarity
+of the trigram sets.
+
+Signatures use one-permutation hashing: every trigram is hashed once and the
+hash picks both a bin and the value kept in it, with empty bins filled from
+their right neighbour. The bin agreement of two signatures estimates their
+Jaccard similarity like classic MinHash does with NUM_HASHES hash functions.
+"""
+import hashlib
+from functools import lru_cache
+from locale_analyzer import analyze
+
+SHINGLE_SIZE = 3
+NUM_HASHES = 64
+DEFAULT_THRESHOLD = 0.8
+SKETCH_CACHE_SIZE = 1 << 16
+
+# Added per bin of distance when an empty bin borrows a neighbour's value;
+# larger than any value a bin can hold, so borrowed values never collide with real ones
+_BORROW_OFFSET = 1 << 64
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Return the character n-grams of text, lowercased and without placeholders"""
+    normalized = " ".join(analyze(text).stripped.lower().split())
+    if not normalized:
+        return frozenset()
+    padded = f" {normalized} "
+    if len(padded) <= size:
+        return frozenset([padded])
+    return frozenset(padded[i:i + size] for i in range(len(padded) - size + 1))
+
+
+def signature(grams, num_hashes=NUM_HASHES):
+    """Return the one-permutation MinHash signature of a non-empty n-gram set"""
+    bins = [None] * num_hashes
+    for gram in grams:
+        h = int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'little')
+        index, value = h % num_hashes, h // num_hashes
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+
+    # Densify: an empty bin takes the next filled bin to its right, offset by the distance
+    for index in range(num_hashes):
+        if bins[index] is None:
+            distance = 1
+            while bins[(index + distance) % num_hashes] is None:
+                distance += 1
+            bins[index] = (bins[(index + distance) % num_hashes] % _BORROW_OFFSET
+                           + distance * _BORROW_OFFSET)
+    return tuple(bins)
+
+
+@lru_cache(maxsize=SKETCH_CACHE_SIZE)
+def sketch(text):
+    """Return (n-gram set, signature) of a string; the signature is None for an empty set"""
+    grams = shingles(text)
+    return grams, signature(grams) if grams else None
+
+
+def jaccard(a, b):
+    """Return the Jaccard similarity of two sets, 0.0 when both are empty"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def rows_for(threshold, num_hashes=NUM_HASHES):
+    """Return the LSH rows per band for a similarity threshold
+
+    Uses the most rows (fewest candidates) whose S-curve midpoint,
+    (1 / bands) ** (1 / rows), stays well below the threshold so that pairs
+    at the threshold are found with high probability.
+    """
+    rows = 1
+    for candidate in (2, 4, 8, 16):
+        if num_hashes % candidate:
+            break
+        bands = num_hashes // candidate
+        if (1 / bands) ** (1 / candidate) > threshold - 0.15:
+            break
+        rows = candidate
+    return rows
+
+
+class SimilarityIndex:
+    """MinHash LSH index over English values keyed by their dotted key paths"""
+
+    def __init__(self, values, threshold=DEFAULT_THRESHOLD, num_hashes=NUM_HASHES):
+        """values maps keys to English strings; threshold is the minimum Jaccard similarity"""
+        self.threshold = threshold
+        self.rows = rows_for(threshold, num_hashes)
+        self.bands = num_hashes // self.rows
+        self.shingles = {}
+        self.buckets = [{} for _ in range(self.bands)]
+        for key, value in values.items():
+            grams, sig = sketch(value)
+            if not grams:
+                continue
+            self.shingles[key] = grams
+            for band, bucket in enumerate(self.buckets):
+                bucket.setdefault(sig[band * self.rows:(band + 1) * self.rows], []).append(key)
+
+    def candidates(self, sig):
+        """Return the keys sharing at least one LSH band with a signature"""
+        found = set()
+        rows = self.rows
+        for band, bucket in enumerate(self.buckets):
+            found.update(bucket.get(sig[band * rows:(band + 1) * rows], ()))
+        return found
+
+    def score(self, key, text):
+        """Return the similarity of text to the English value of key"""
+        grams = sketch(text)[0]
+        english = self.shingles.get(key)
+        if english is None or not grams:
+            return 1.0 if english is None and not grams else 0.0
+        return jaccard(grams, english)
+
+    def best_match(self, text, key=None):
+        """Return (similarity, English key) of the closest English value at or over the threshold, or None
+
+        The English value of key itself is always compared; other values only
+        when LSH makes them candidates. Ties go to key.
+        """
+        grams, sig = sketch(text)
+        if not grams:
+            return None
+
+        best_score, best_key = 0.0, None
+        if key in self.shingles:
+            best_score, best_key = jaccard(grams, self.shingles[key]), key
+        for candidate in self.candidates(sig):
+            if candidate != key:
+                score = jaccard(grams, self.shingles[candidate])
+                if score > best_score:
+                    best_score, best_key = score, candidate
+
+        if best_key is None or best_score < self.threshold:
+            return None
+        return best_score, best_key
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""Streaming, bounded-memory flattener for very large locale files
+
+iter_flat() tokenizes a locale file chunk by chunk and yields
+(dotted_key, value) pairs as it reads them, so memory use depends on the
+chunk size and nesting depth rather than the file size. Duplicate keys are
+reported with their line and column, and syntax errors are raised as
+json.JSONDecodeError subclasses so callers handle them like json.load().
+
+Unlike json.load(), where a repeated key silently replaces the earlier
+value, both occurrences are yielded. Collecting the pairs into a dict keeps
+the last value, as json.load() would, except that a repeated key whose
+earlier value was an object still contributes that object's leaves.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+from json.decoder import scanstring
+from locale_profile import add_profile_arguments, phase, profiling, record_locale
+
+CHUNK_SIZE = 64 * 1024
+
+# Tokens this close to the end of the buffer may continue in the next chunk
+# (e.g. "1." followed by "5"), so the buffer is refilled before accepting them
+_LOOKAHEAD = 32
+
+_TOKEN = re.compile(r'''[ \t\n\r]*(?:
+    "([^"\\\x00-\x1f]*)"        # 1: string without escapes
+  | (")                         # 2: string with escapes, decoded by scanstring
+  | ([{}\[\],:])                # 3: punctuation
+  | (-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?|true|false|null)  # 4: literal
+)''', re.VERBOSE)
+
+# Fast path for the common `"key": "value",` run inside an object
+_PAIR = re.compile(
+    r'[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*"([^"\\\x00-\x1f]*)"[ \t\n\r]*,'
+)
+
+_LITERALS = {"true": True, "false": False, "null": None}
+
+STRING = "string"
+LITERAL = "literal"
+
+
+class StreamDecodeError(json.JSONDecodeError):
+    """Syntax error found while streaming, with its line and column"""
+
+    def __init__(self, msg, pos, lineno, colno):
+        ValueError.__init__(self, f"{msg}: line {lineno} column {colno} (char {pos})")
+        self.msg = msg
+        self.doc = None
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.pos, self.lineno, self.colno)
+
+
+class _Tokenizer:
+    """Chunked JSON tokenizer that keeps only the unread part of the file in memory"""
+
+    def __init__(self, fp, chunk_size=CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.base = 0        # Absolute offset of buf[0]
+        self.eof = False
+        self.line = 1        # Line number at buf[self.tracked]
+        self.line_start = 0  # Absolute offset where that line starts
+        self.tracked = 0
+        self.start = 0       # Position in buf of the last token
+
+    def _refill(self):
+        """Drop consumed text and append the next chunk; False at end of file"""
+        if self.eof:
+            return False
+        self.location(self.pos)  # Account for newlines in the text being dropped
+        self.base += self.pos
+        chunk = self.fp.read(self.chunk_size)
+        self.buf = self.buf[self.pos:] + chunk
+        self.tracked -= self.pos
+        self.start -= self.pos
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return True
+
+    def location(self, pos):
+        """Return the (line, column) of a position in the buffer"""
+        buf = self.buf
+        if pos > self.tracked:
+            newlines = buf.count("\n", self.tracked, pos)
+            if newlines:
+                self.line += newlines
+                self.line_start = self.base + buf.rfind("\n", self.tracked, pos) + 1
+            self.tracked = pos
+        return self.line, self.base + pos - self.line_start + 1
+
+    def error(self, msg, pos=None):
+        """Build a StreamDecodeError for a position in the buffer (default: last token)"""
+        pos = self.start if pos is None else pos
+        line, column = self.location(pos)
+        return StreamDecodeError(msg, self.base + pos, line, column)
+
+    def pair(self):
+        """Consume a complete `"key": "value",` without escapes, or return None
+
+        Returns (key, value) and leaves self.start at the key. Anything else,
+        including a pair cut at the end of the buffer, is left to next().
+        """
+        match = _PAIR.match(self.buf, self.pos)
+        if match is None:
+            return None
+        self.start = match.start(1) - 1
+        self.pos = match.end()
+        return match.group(1), match.group(2)
+
+    def next(self):
+        """Return the next (kind, value) token, or (None, None) at end of file"""
+        while True:
+            match = _TOKEN.match(self.buf, self.pos)
+            if match is None or len(self.buf) - match.end() < _LOOKAHEAD:
+                if self._refill():
+                    continue
+                if match is None:
+                    rest = self.buf[self.pos:]
+                    stripped = rest.lstrip(" \t\n\r")
+                    if not stripped:
+                        self.start = self.pos = len(self.buf)
+                        return None, None
+                    raise self.error("Expecting value", self.pos + len(rest) - len(stripped))
+
+            kind = match.lastindex
+            self.start = match.start(kind)
+            if kind == 1:
+                self.start -= 1  # Point at the opening quote
+                self.pos = match.end()
+                return STRING, match.group(1)
+            if kind == 3:
+                self.pos = match.end()
+                return match.group(3), None
+            if kind == 4:
+                self.pos = match.end()
+                text = match.group(4)
+                if text in _LITERALS:
+                    return LITERAL, _LITERALS[text]
+                if "." in text or "e" in text or "E" in text:
+                    return LITERAL, float(text)
+                return LITERAL, int(text)
+
+            try:
+                value, end = scanstring(self.buf, match.end(), True)
+            except json.JSONDecodeError as e:
+                # Strings cut at the chunk boundary fail as unterminated or as a cut escape
+                cut = e.msg.startswith("Unterminated") or e.pos >= len(self.buf) - 6
+                if cut and self._refill():
+                    continue
+                raise self.error(e.msg, e.pos)
+            self.pos = end
+            return STRING, value
+
+
+def _read_array(tokens):
+    """Build the Python list for an array whose '[' was just read"""
+    items = []
+    kind, value = tokens.next()
+    if kind == "]":
+        return items
+    while True:
+        items.append(_read_value(tokens, kind, value))
+        kind, _ = tokens.next()
+        if kind == "]":
+            return items
+        if kind != ",":
+            raise tokens.error("Expecting ',' delimiter")
+        kind, value = tokens.next()
+
+
+def _read_object(tokens):
+    """Build the Python dict for an object (inside an array) whose '{' was just read"""
+    obj = {}
+    kind, key = tokens.next()
+    if kind == "}":
+        return obj
+    while True:
+        if kind != STRING:
+            raise tokens.error("Expecting property name enclosed in double quotes")
+        if tokens.next()[0] != ":":
+            raise tokens.error("Expecting ':' delimiter")
+        obj[key] = _read_value(tokens, *tokens.next())
+        kind, _ = tokens.next()
+        if kind == "}":
+            return obj
+        if kind != ",":
+            raise tokens.error("Expecting ',' delimiter")
+        kind, key = tokens.next()
+
+
+def _read_value(tokens, kind, value):
+    """Return the Python value starting with the given token"""
+    if kind == STRING or kind == LITERAL:
+        return value
+    if kind == "[":
+        return _read_array(tokens)
+    if kind == "{":
+        return _read_object(tokens)
+    raise tokens.error("Expecting value")
+
+
+def iter_flat(fp, duplicates=None, chunk_size=CHUNK_SIZE):
+    """Yield (dotted_key, value) for every leaf of a locale file as it is read
+
+    fp is a text file object. Leaves are yielded in file order, like
+    get_all_keys(); arrays are yielded whole as lists. When a list is passed
+    as duplicates, (dotted_key, line, column) is appended for every key that
+    repeats within its object.
+    """
+    tokens = _Tokenizer(fp, chunk_size)
+    if tokens.next()[0] != "{":
+        raise tokens.error("Expecting object")
+
+    # One (prefix, keys seen) frame per open object
+    stack = [("", set())]
+    kind, key = tokens.next()
+    if kind == "}":
+        stack.pop()
+
+    while stack:
+        prefix, seen = stack[-1]
+        if kind != STRING:
+            raise tokens.error("Expecting property name enclosed in double quotes")
+        key_path = f"{prefix}.{key}" if prefix else key
+        if key in seen:
+            if duplicates is not None:
+                duplicates.append((key_path, *tokens.location(tokens.start)))
+        else:
+            seen.add(key)
+        if tokens.next()[0] != ":":
+            raise tokens.error("Expecting ':' delimiter")
+
+        kind, value = tokens.next()
+        if kind == "{":
+            kind, key = tokens.next()
+            if kind != "}":
+                stack.append((key_path, set()))
+                continue
+        else:
+            yield key_path, _read_value(tokens, kind, value)
+
+        # Close every object that ends here, then move to the next key
+        while stack:
+            kind, _ = tokens.next()
+            if kind == ",":
+                prefix, seen = stack[-1]
+                pair = tokens.pair()
+                while pair is not None:
+                    key, value = pair
+                    key_path = f"{prefix}.{key}" if prefix else key
+                    if key in seen:
+                        if duplicates is not None:
+                            duplicates.append((key_path, *tokens.location(tokens.start)))
+                    else:
+                        seen.add(key)
+                    yield key_path, value
+                    pair = tokens.pair()
+                kind, key = tokens.next()
+                break
+            if kind != "}":
+                raise tokens.error("Expecting ',' delimiter")
+            stack.pop()
+
+    if tokens.next()[0] is not None:
+        raise tokens.error("Extra data")
+
+
+def flatten_file(path, chunk_size=CHUNK_SIZE):
+    """Stream a locale file into (leaf key paths, {key path: string value}, duplicates)
+
+    Returns the same (keys, strings) pair as locale_engine.flatten() plus the
+    duplicate keys found by iter_flat().
+    """
+    keys = []
+    strings = {}
+    duplicates = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for key_path, value in iter_flat(f, duplicates, chunk_size):
+            keys.append(key_path)
+            if isinstance(value, str):
+                strings[key_path] = value
+    return keys, strings, duplicates
+
+
+def file_hash(path, chunk_size=CHUNK_SIZE):
+    """Return locale_cache.content_hash() of a file, reading it in chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_synthetic_locale(path, size_mb, seed=0):
+    """Write an en.json-shaped locale of roughly size_mb megabytes"""
+    rng = random.Random(seed)
+    words = ["Member", "Banned", "Channel", "Role", "Updated", "Reason", "User", "ID",
+             "Message", "Deleted", "Server", "Created", "by", "the", "{user}", "{channel}"]
+    target = size_mb * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "events": {\n')
+        group = 0
+        while written < target:
+            if group:
+                f.write(',\n')
+            entries = ",\n".join(
+                f'      "key_{i}": {json.dumps(" ".join(rng.choices(words, k=rng.randint(2, 12))))}'
+                for i in range(rng.randint(5, 30))
+            )
+            block = f'    "group_{group}": {{\n{entries}\n    }}'
+            f.write(block)
+            written += len(block)
+            group += 1
+        f.write('\n  }\n}\n')
+
+
+def _measure(label, func):
+    """Print func's wall time and tracemalloc peak (from a second run) and return its result"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows allocation-heavy code a lot, so memory is measured separately
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label}: {elapsed:.2f}s, peak {peak / 1024 / 1024:.1f} MiB")
+    return result
+
+
+def benchmark(size_mb):
+    """Compare json.load + flatten with iter_flat on a synthetic locale"""
+    from locale_engine import flatten
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "synthetic.json")
+        write_synthetic_locale(path, size_mb)
+        print(f"[BENCH] {os.path.getsize(path) / 1024 / 1024:.1f} MiB synthetic locale")
+
+        def load_and_flatten():
+            with open(path, 'r', encoding='utf-8') as f:
+                return len(flatten(json.load(f))[0])
+
+        def stream_count():
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                return sum(1 for _ in iter_flat(f))
+
+        loaded = _measure("json.load + flatten", load_and_flatten)
+        streamed = _measure("iter_flat (count only)", stream_count)
+        if loaded != streamed:
+            print(f"[FAIL] Leaf counts differ: {loaded} vs {streamed}")
+            return False
+        print(f"[OK] {streamed} leaves")
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream and flatten locale files")
+    parser.add_argument("files", nargs="*", help="Locale files to flatten")
+    parser.add_argument("--benchmark", type=int, metavar="MB",
+                        help="Benchmark against json.load on a synthetic locale of this size")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    if args.benchmark:
+        return 0 if benchmark(args.benchmark) else 1
+
+    with profiling(args, "locale_stream"):
+        return _flatten_files(args.files)
+
+
+def _flatten_files(paths):
+    """Flatten files given on the command line and report their duplicate keys"""
+    all_ok = True
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            with phase("stream"):
+                keys, strings, duplicates = flatten_file(path)
+        except json.JSONDecodeError as e:
+            print(f"[FAIL] {path}: Invalid JSON: {e}")
+            all_ok = False
+            continue
+        for key_path, line, column in duplicates:
+            print(f"[WARN] {path}: duplicate key {key_path} at line {line} column {column}")
+        print(f"[OK] {path}: {len(keys)} keys")
+        record_locale(path, time.perf_counter() - start, len(strings))
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    exit(main())
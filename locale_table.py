@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Interned key table and id-aligned value columns for locale data
+
+A KeyTable built from en.json gives every dotted key path a dense integer id,
+and stores each path once as an interned string. LocaleColumns holds one
+locale's values in a list indexed by those ids, plus a bitmap of the ids the
+locale defines. Missing keys then come from one bitmap operation against the
+table, and a locale keeps no key strings of its own except keys that are
+not in en.json.
+
+Bitmaps are plain ints with bit i set for id i, built and read through
+'0'/'1' strings so both directions stay linear in the table size.
+"""
+import sys
+
+
+class KeyTable:
+    """Dotted key paths of the reference locale, each with a dense integer id"""
+
+    def __init__(self, keys):
+        self.keys = []
+        self.ids = {}
+        for key in keys:
+            if key not in self.ids:
+                key = sys.intern(key)
+                self.ids[key] = len(self.keys)
+                self.keys.append(key)
+        # Bitmap with every id set
+        self.all = (1 << len(self.keys)) - 1
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.ids
+
+    def bitmap(self, ids):
+        """Return the bitmap with the given ids set"""
+        flags = bytearray(b"0") * len(self.keys)
+        for i in ids:
+            flags[i] = 49  # ord("1")
+        return int(flags[::-1], 2) if flags else 0
+
+    def iter_ids(self, bitmap):
+        """Yield the ids set in a bitmap in increasing order"""
+        bits = bin(bitmap)[:1:-1]  # Little-endian '0'/'1' string
+        i = bits.find("1")
+        while i != -1:
+            yield i
+            i = bits.find("1", i + 1)
+
+    def keys_of(self, bitmap):
+        """Return the key paths of the ids set in a bitmap, in id order"""
+        keys = self.keys
+        return [keys[i] for i in self.iter_ids(bitmap)]
+
+
+class LocaleColumns:
+    """One locale's values aligned to a KeyTable
+
+    values[id] is the string value of that key, or None when the key is
+    missing or its value is not a string. present is the bitmap of ids the
+    locale defines and extra lists its keys that are not in the table.
+    """
+
+    __slots__ = ("table", "values", "present", "extra")
+
+    def __init__(self, table, keys, strings):
+        """Build columns from flattened locale data (all leaf keys, {key: string})"""
+        ids = table.ids
+        values = [None] * len(table)
+        flags = bytearray(b"0") * len(table)
+        extra = []
+        for key in keys:
+            i = ids.get(key)
+            if i is None:
+                extra.append(key)
+            else:
+                flags[i] = 49  # ord("1")
+                values[i] = strings.get(key)
+
+        self.table = table
+        self.values = values
+        self.present = int(flags[::-1], 2) if flags else 0
+        self.extra = extra
+
+    @classmethod
+    def from_locale(cls, table, locale):
+        """Build columns from a locale_engine.LocaleData"""
+        return cls(table, locale.keys, locale.strings)
+
+    def missing(self):
+        """Return the table keys this locale does not define, in id order"""
+        return self.table.keys_of(self.table.all & ~self.present)
+
+    def get(self, key):
+        """Return the string value of a key, or None"""
+        i = self.table.ids.get(key)
+        return None if i is None else self.values[i]
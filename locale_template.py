@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Precompiled placeholder templates for formatting strings on every event
+
+A Template splits a string once into literal text and {name} placeholders,
+found by the same scan as find_placeholders() (locale_analyzer.analyze()).
+Rendering fills the placeholder slots of a copy of that piece list and joins
+it: no regex and no str.format parsing per event. render_many() renders a
+batch of events against one template.
+
+Only the {name} placeholders the placeholder check knows are substituted;
+every other brace is literal text, and a placeholder without a value is left
+as it is, like locale_runtime.Locale.format() did with str.format_map().
+Unlike str.format, {{ and }} are not escapes ("{{name}}" renders as
+"{value}"), and placeholders with a format spec, conversion, attribute or
+index ({n:>5}, {n!r}, {user.name}, {args[0]}) are left as literal text.
+"""
+import argparse
+from locale_analyzer import analyze
+from locale_profile import add_profile_arguments, profiling
+
+
+class Template:
+    """A string pre-split into literal pieces and placeholder slots"""
+
+    __slots__ = ("text", "names", "_pieces", "_slots")
+
+    def __init__(self, text):
+        features = analyze(text)
+        pieces = []
+        slots = []  # (index in pieces, placeholder name)
+        last = 0
+        for name, (start, end) in zip(features.placeholders, features.spans):
+            if start > last:
+                pieces.append(text[last:start])
+            slots.append((len(pieces), name))
+            # The placeholder's own text stays when no value is given
+            pieces.append(text[start:end])
+            last = end
+        if last < len(text):
+            pieces.append(text[last:])
+
+        self.text = text
+        self.names = features.placeholders
+        self._pieces = tuple(pieces)
+        self._slots = tuple(slots)
+
+    def __repr__(self):
+        return f"Template({self.text!r})"
+
+    def render(self, values):
+        """Return the text with placeholders filled from a {name: value} mapping"""
+        if not self._slots:
+            return self.text
+        pieces = list(self._pieces)
+        for i, name in self._slots:
+            if name in values:
+                value = values[name]
+                pieces[i] = value if type(value) is str else str(value)
+        return "".join(pieces)
+
+    def render_many(self, rows):
+        """Render the template once per {name: value} mapping in rows, returning a list"""
+        if not self._slots:
+            return [self.text for _ in rows]
+        template = self._pieces
+        slots = self._slots
+        join = "".join
+        results = []
+        for values in rows:
+            pieces = list(template)
+            for i, name in slots:
+                if name in values:
+                    value = values[name]
+                    pieces[i] = value if type(value) is str else str(value)
+            results.append(join(pieces))
+        return results
+
+
+def compile_templates(strings):
+    """Compile every value of a {key: string} mapping, returning {key: Template}"""
+    return {key: Template(value) for key, value in strings.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a string with precompiled placeholders")
+    parser.add_argument("text", help="String with {name} placeholders")
+    parser.add_argument("values", nargs="*", metavar="NAME=VALUE", help="Placeholder values")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "locale_template"):
+        return _run(args)
+
+
+def _run(args):
+    """Render the string given by parsed command line arguments"""
+    template = Template(args.text)
+    print(template.render(dict(value.split("=", 1) for value in args.values if "=" in value)))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
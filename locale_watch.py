@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""Watch the locale files and report new and resolved issues as they are edited
+
+LocaleWatcher keeps the English reference, every parsed locale and every
+locale's current issues in memory. Each poll only stats the files. A file
+whose size or mtime changed is re-read once the changes have been quiet for
+the debounce interval, and is re-parsed only if its content hash changed.
+Then only the changed keys are re-checked: keys added, removed or edited in
+that file, or in every locale for keys that changed in en.json. With
+--similarity, a change to en.json re-checks every key, since any English
+value may be the near-duplicate of a translation. The difference in issues
+is printed.
+"""
+import argparse
+import time
+from pathlib import Path
+from locale_cache import content_hash
+from locale_engine import (
+    GENERATED_FILES,
+    EnglishReference,
+    english_issue,
+    length_issue,
+    load_reference,
+    parse_locale,
+    placeholder_issue
+)
+from locale_incremental import changed_keys
+from locale_profile import add_profile_arguments, profiling
+
+DEFAULT_INTERVAL = 0.2
+DEFAULT_DEBOUNCE = 0.3
+
+# Issue kinds in report order
+ISSUE_KINDS = ["error", "missing", "extra", "placeholders", "english", "lengths"]
+
+
+def key_issues(ref, locale, key):
+    """Return {(kind, key): message} of every issue one key of a locale has"""
+    lang = locale.code
+    issues = {}
+    if lang != "en":
+        in_en, in_lang = key in ref.keys, key in locale.keys
+        if in_en and not in_lang:
+            issues["missing", key] = f"{lang}.json: {key} is missing"
+        elif in_lang and not in_en:
+            issues["extra", key] = f"{lang}.json: {key} is not in en.json"
+
+    value = locale.strings.get(key)
+    if value is None:
+        return issues
+    if lang != "en":
+        issue = placeholder_issue(ref, key, value)
+        if issue:
+            issues["placeholders", key] = f"{lang}.json: {issue}"
+        issue = english_issue(ref, key, value)
+        if issue:
+            issues["english", key] = f"{lang}.json: {issue}"
+    issue = length_issue(lang, key, value)
+    if issue:
+        issues["lengths", key] = issue
+    return issues
+
+
+def locale_issues(ref, locale, keys=None):
+    """Return the issues of the given keys of a locale, or of every key"""
+    if locale.error:
+        return {("error", None): f"{locale.code}.json: {locale.error}"}
+    if keys is None:
+        keys = locale.keys if locale.code == "en" else ref.keys | locale.keys
+    issues = {}
+    for key in keys:
+        issues.update(key_issues(ref, locale, key))
+    return issues
+
+
+class LocaleWatcher:
+    """In-memory locales and issues of a directory, updated per changed file"""
+
+    def __init__(self, locale_dir=".", debounce=DEFAULT_DEBOUNCE, similarity=None):
+        self.locale_dir = Path(locale_dir)
+        self.debounce = debounce
+        self.similarity = similarity
+        self.locales = {}   # lang -> LocaleData
+        self.hashes = {}    # lang -> content hash of the parsed file
+        self.stats = {}     # lang -> (mtime_ns, size) last seen
+        self.issues = {}    # lang -> {(kind, key): message}
+        self.pending = {}   # lang -> monotonic time of its last observed change
+        self.ref = None
+
+    def _paths(self):
+        """Return {lang: path} of the locale files currently in the directory"""
+        return {
+            path.stem: path
+            for path in self.locale_dir.glob("*.json")
+            if path.stem not in GENERATED_FILES
+        }
+
+    def _set_reference(self, en):
+        """Use a new English locale as the reference"""
+        self.ref = EnglishReference(en)
+        if self.similarity is not None:
+            self.ref.enable_similarity(self.similarity)
+
+    def start(self):
+        """Load and check everything once"""
+        self.ref = load_reference(self.locale_dir)
+        if self.similarity is not None:
+            self.ref.enable_similarity(self.similarity)
+
+        for lang, path in self._paths().items():
+            stat = path.stat()
+            self.stats[lang] = (stat.st_mtime_ns, stat.st_size)
+            if lang == "en":
+                locale = self.ref.locale
+                content = path.read_bytes()
+            else:
+                content = path.read_bytes()
+                locale = parse_locale(lang, content)
+            self.hashes[lang] = content_hash(content)
+            self.locales[lang] = locale
+        for lang, locale in self.locales.items():
+            self.issues[lang] = locale_issues(self.ref, locale)
+
+    def poll(self, now=None):
+        """Stat every file and process the ones whose changes have settled
+
+        Returns a list of (lang, new issues, resolved issues, keys re-checked,
+        milliseconds) for every locale whose issues were recomputed.
+        """
+        now = time.monotonic() if now is None else now
+        paths = self._paths()
+        for lang in set(self.stats) | set(paths):
+            path = paths.get(lang)
+            try:
+                stat = path.stat() if path else None
+            except OSError:
+                stat = None
+            current = (stat.st_mtime_ns, stat.st_size) if stat else None
+            if current != self.stats.get(lang):
+                self.stats[lang] = current
+                self.pending[lang] = now
+
+        settled = [lang for lang, changed in self.pending.items() if now - changed >= self.debounce]
+        # Process en.json first so locales are re-checked against the new reference
+        settled.sort(key=lambda lang: lang != "en")
+        changes = []
+        for lang in settled:
+            del self.pending[lang]
+            changes.extend(self._process(lang, paths.get(lang)))
+        return changes
+
+    def _process(self, lang, path):
+        """Re-read one settled file and return its issue changes"""
+        start = time.perf_counter()
+        if path is None or self.stats.get(lang) is None:
+            # Removed: forget it and report its issues as gone
+            self.locales.pop(lang, None)
+            self.hashes.pop(lang, None)
+            self.stats.pop(lang, None)
+            old = self.issues.pop(lang, {})
+            return [(lang, {}, old, 0, (time.perf_counter() - start) * 1000)] if old else []
+
+        try:
+            content = path.read_bytes()
+        except OSError:
+            return []
+        digest = content_hash(content)
+        if digest == self.hashes.get(lang):
+            return []  # Saved without changes
+        self.hashes[lang] = digest
+
+        old = self.locales.get(lang)
+        new = parse_locale(lang, content)
+        self.locales[lang] = new
+        if old is None or old.error or new.error:
+            keys = None  # Check the whole file
+        else:
+            keys = changed_keys(old, new)
+
+        if lang != "en":
+            return [self._recheck(lang, keys, start)]
+
+        # en.json: rebuild the reference, then re-check its changed keys everywhere
+        if new.error:
+            self.issues[lang] = locale_issues(self.ref, new)
+            return [(lang, {}, {}, 0, (time.perf_counter() - start) * 1000)]
+        self._set_reference(new)
+        if self.similarity is not None:
+            keys = None  # Near-duplicates are found among all English values
+        changes = []
+        for other in self.locales:
+            # Locales need the whole check when the English key set can't be diffed
+            changes.append(self._recheck(other, keys, start))
+        return [change for change in changes if change[1] or change[2]]
+
+    def _recheck(self, lang, keys, start):
+        """Recompute the issues of some keys (None for all) of a locale"""
+        locale = self.locales[lang]
+        old = self.issues.get(lang, {})
+        if keys is None or locale.error or ("error", None) in old:
+            issues = locale_issues(self.ref, locale)
+            checked = len(locale.keys | self.ref.keys)
+        else:
+            issues = {item: message for item, message in old.items() if item[1] not in keys}
+            issues.update(locale_issues(self.ref, locale, keys))
+            checked = len(keys)
+        self.issues[lang] = issues
+
+        new_issues = {item: issues[item] for item in issues.keys() - old.keys()}
+        new_issues.update(
+            (item, issues[item]) for item in issues.keys() & old.keys() if issues[item] != old[item]
+        )
+        resolved = {item: old[item] for item in old.keys() - issues.keys()}
+        return lang, new_issues, resolved, checked, (time.perf_counter() - start) * 1000
+
+
+def _ordered(issues):
+    """Return issue messages in kind, then key order"""
+    return [
+        issues[item]
+        for item in sorted(issues, key=lambda item: (ISSUE_KINDS.index(item[0]), item[1] or ""))
+    ]
+
+
+def print_change(lang, new_issues, resolved, checked, elapsed_ms):
+    """Print the issue diff of one re-checked locale"""
+    print(f"[WATCH] {lang}.json: {len(new_issues)} new, {len(resolved)} resolved "
+          f"({checked} keys re-checked in {elapsed_ms:.1f} ms)")
+    for message in _ordered(resolved):
+        print(f"  - [FIXED] {message}")
+    for message in _ordered(new_issues):
+        print(f"  + [NEW] {message}")
+
+
+def watch(locale_dir=".", interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE, similarity=None):
+    """Poll locale_dir until interrupted, printing issue diffs as files change"""
+    watcher = LocaleWatcher(locale_dir, debounce, similarity)
+    watcher.start()
+    total = sum(len(issues) for issues in watcher.issues.values())
+    print(f"[WATCH] Watching {len(watcher.locales)} locale files in {locale_dir} "
+          f"({total} current issues); press Ctrl+C to stop")
+    for lang in sorted(watcher.issues):
+        if watcher.issues[lang]:
+            print(f"  {lang}.json: {len(watcher.issues[lang])} issues")
+
+    try:
+        while True:
+            for change in watcher.poll():
+                print_change(*change)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n[WATCH] Stopped")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch locale files and report issue changes")
+    parser.add_argument("--dir", default=".", help="Directory containing the locale files")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help=f"Seconds between polls (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"Seconds a file must stay unchanged before it is re-read "
+                             f"(default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--similarity", type=float, metavar="THRESHOLD",
+                        help="Also flag near-duplicates of English (see locale_engine.py)")
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with profiling(args, "locale_watch"):
+        return watch(args.dir, args.interval, args.debounce, args.similarity)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,128 @@
+"""AsyncLocaleLoader and HttpClient against a local HTTP/1.1 stand-in server"""
+import asyncio
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from locale_async import AsyncLocaleLoader, HttpClient, HttpSource, load_sources
+
+FILES = {
+    "en": {"greeting": "Hello"},
+    "fr": {"greeting": "Bonjour"},
+    "de": {"greeting": "Hallo"},
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves FILES under /plain/, /chunked/, /gzip/ and /slow/"""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests.append(self.path)
+        mode, _, name = self.path.strip("/").partition("/")
+        lang = name[:-len(".json")]
+        if lang not in FILES:
+            self._send(404, b"Not found")
+            return
+        body = json.dumps(FILES[lang]).encode('utf-8')
+        if mode == "slow":
+            time.sleep(self.server.delay)
+        if mode == "chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(body), 5):
+                chunk = body[start:start + 5]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif mode == "gzip":
+            self._send(200, gzip.compress(body), {"Content-Encoding": "gzip"})
+        else:
+            self._send(200, body)
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    httpd.lock = threading.Lock()
+    httpd.connections = 0
+    httpd.requests = []
+    httpd.delay = 0.3
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get_all(urls):
+    async def run():
+        client = HttpClient()
+        try:
+            return [await client.get(url) for url in urls]
+        finally:
+            await client.close()
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("mode", ["plain", "chunked", "gzip"])
+def test_bodies(server, mode):
+    status, body = _get_all([f"{server.url}/{mode}/fr.json"])[0]
+    assert status == 200
+    assert json.loads(body) == FILES["fr"]
+
+
+def test_keep_alive_reuses_one_connection(server):
+    urls = [f"{server.url}/{mode}/{lang}.json"
+            for mode in ("plain", "chunked", "gzip") for lang in FILES]
+    responses = _get_all(urls)
+    assert [status for status, _ in responses] == [200] * len(urls)
+    assert server.connections == 1
+
+
+def test_missing_file_is_none(server):
+    loaded, errors = load_sources([HttpSource(f"{server.url}/plain")], ["fr", "xx"])
+    assert loaded == {"en": [FILES["en"]], "fr": [FILES["fr"]], "xx": []}
+    assert errors == {}
+
+
+def test_timeout_is_per_source(server):
+    slow = HttpSource(f"{server.url}/slow", timeout=0.05)
+    fast = HttpSource(f"{server.url}/plain", timeout=5)
+    loaded, errors = load_sources([slow, fast], ["fr"])
+    assert loaded["fr"] == [FILES["fr"]]
+    assert errors[slow.name, "fr"] == "timed out after 0.05s"
+    assert (fast.name, "fr") not in errors
+
+
+def test_concurrent_requests_share_one_fetch(server):
+    source = HttpSource(f"{server.url}/slow")
+
+    async def run():
+        async with AsyncLocaleLoader() as loader:
+            return await asyncio.gather(*(loader.fetch(source, "de") for _ in range(5)))
+
+    bodies = asyncio.run(run())
+    assert [json.loads(body) for body in bodies] == [FILES["de"]] * 5
+    assert server.requests == ["/slow/de.json"]
@@ -0,0 +1,64 @@
+"""Compiled catalogs must give back the JSON files' values and check results"""
+import json
+from locale_catalog import LocaleCatalog, compile_catalog, main
+
+EN = {"common": {"hello": "Hello {user}", "bye": "Goodbye"}, "title": "Settings"}
+FR = {"title": "Paramètres " + "t" * 260, "common": {"hello": "Bonjour {usr}", "bye": "Goodbye"},
+      "embed": {"description": "x" * 1100}}
+DE = {"common": {"hello": "Hallo {user}", "bye": "Tschüss"}, "title": "Einstellungen"}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+
+def _setup(tmp_path):
+    for lang, data in {"en": EN, "fr": FR, "de": DE}.items():
+        _write(tmp_path / f"{lang}.json", data)
+    _write(tmp_path / "translation_stats.json", {"de": {"total": 3}})
+    return ["--dir", str(tmp_path), "--catalog", str(tmp_path / "locales.catalog"), "--no-cache"]
+
+
+def test_compile_verify_round_trip(tmp_path, capsys):
+    args = _setup(tmp_path)
+    assert main(["compile", *args]) == 0
+    assert main(["verify", *args]) == 0
+    output = capsys.readouterr().out
+    for lang in ("en", "fr", "de"):
+        assert f"[OK] {lang}: catalog matches {lang}.json" in output
+
+    with LocaleCatalog(tmp_path / "locales.catalog") as catalog:
+        assert sorted(catalog.languages) == ["de", "en", "fr"]
+        assert catalog.get("fr", "common.hello") == "Bonjour {usr}"
+        assert catalog.get("de", "embed.description") is None
+        assert bytes(catalog.get_bytes("de", "common.bye")) == "Tschüss".encode('utf-8')
+        assert catalog.strings("fr") == {"common.bye": "Goodbye", "common.hello": "Bonjour {usr}",
+                                         "embed.description": "x" * 1100,
+                                         "title": FR["title"]}
+
+
+def test_verify_catches_edited_json(tmp_path, capsys):
+    args = _setup(tmp_path)
+    main(["compile", *args])
+    _write(tmp_path / "de.json", {**DE, "title": "Optionen"})
+    assert main(["verify", *args]) == 1
+    assert "[FAIL] de: values differ from the JSON file" in capsys.readouterr().out
+
+
+def test_non_string_locale_is_skipped_with_a_warning(tmp_path, capsys):
+    args = _setup(tmp_path)
+    _write(tmp_path / "es.json", {**DE, "count": 3})
+    assert main(["compile", *args]) == 0
+    assert main(["verify", *args]) == 0
+    output = capsys.readouterr().out
+    assert output.count("[WARN] es") == 2
+    assert "count is not a string" in output
+    with LocaleCatalog(tmp_path / "locales.catalog") as catalog:
+        assert "es" not in catalog.languages
+        assert "de" in catalog.languages
+
+
+def test_shared_values_are_stored_once(tmp_path):
+    path = tmp_path / "shared.catalog"
+    compile_catalog({"a": {"k": "same"}, "b": {"k": "same", "l": "same"}}, path)
+    assert path.read_bytes().count(b"same") == 1
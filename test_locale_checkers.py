@@ -0,0 +1,66 @@
+"""Plugin checkers must run and report through locale_engine.py --plugin"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ENGINE = Path(__file__).parent / "locale_engine.py"
+
+PLUGIN = '''
+from locale_checkers import Checker, register
+
+
+@register
+class TrailingSpaceChecker(Checker):
+    name = "trailing-space"
+    title = "Check for trailing whitespace"
+
+    def check(self, batch):
+        return [f"{key}: trailing whitespace" if value != value.rstrip() else None
+                for key, value in zip(batch.keys, batch.values)]
+'''
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def _engine(tmp_path, *args):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(tmp_path), str(ENGINE.parent)]))
+    return subprocess.run(
+        [sys.executable, str(ENGINE), "--dir", str(tmp_path / "locales"), "--no-cache",
+         "--plugin", "trailing_rules", "--check", "trailing-space", *args],
+        cwd=tmp_path, env=env, capture_output=True, text=True
+    )
+
+
+def _setup(tmp_path):
+    (tmp_path / "trailing_rules.py").write_text(PLUGIN, encoding='utf-8')
+    locales = tmp_path / "locales"
+    locales.mkdir()
+    _write(locales / "en.json", {"a": "Hello", "b": "World"})
+    _write(locales / "fr.json", {"a": "Bonjour ", "b": "Monde"})
+    _write(locales / "de.json", {"a": "Hallo", "b": "Welt"})
+    _write(locales / "translation_stats.json", {"de": {"completeness": "100.0 "}})
+
+
+def test_plugin_rule_runs_through_the_engine(tmp_path):
+    _setup(tmp_path)
+    result = _engine(tmp_path)
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert "[OK] de.json: No issues found" in result.stdout
+    assert "[FAIL] fr.json has issues:\n  - a: trailing whitespace" in result.stdout
+    # Generated files are not locales
+    assert "translation_stats" not in result.stdout
+
+    assert _engine(tmp_path, "--jobs", "2").stdout == result.stdout
+
+
+def test_plugin_rule_streams_issues(tmp_path):
+    _setup(tmp_path)
+    result = _engine(tmp_path, "--format", "ndjson")
+    issues = [record for record in map(json.loads, result.stdout.splitlines())
+              if record["type"] == "issue"]
+    assert issues == [{"type": "issue", "check": "trailing-space", "kind": "issue", "lang": "fr",
+                       "file": "fr.json", "key": "a", "message": "a: trailing whitespace"}]
@@ -0,0 +1,120 @@
+"""The check scripts, now backed by locale_engine, must print what the original scripts printed"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from locale_engine import main
+
+REPO = Path(__file__).parent
+
+EN = {
+    "common": {"hello": "Hello {user}", "bye": "Goodbye", "ok": "OK", "emoji": "👋"},
+    "embed": {"title": "Server {name} settings",
+              "description": "A description of the moderation dashboard"},
+    "count": "{count} members",
+}
+LOCALES = {
+    # Missing, extra, untranslated, wrong placeholders and over-long values
+    "fr": {
+        "common": {"hello": "Bonjour {usr}", "bye": "Goodbye", "ok": "OK", "emoji": "👋",
+                   "extra": "En plus"},
+        "embed": {"title": "Paramètres " + "t" * 260, "description": "x" * 1100},
+    },
+    "de": {
+        "common": {"hello": "Hallo {user}", "bye": "Tschüss", "ok": "OK", "emoji": "👋"},
+        "embed": {"title": "Servereinstellungen {name}",
+                  "description": "Eine Beschreibung des Moderations-Dashboards"},
+        "count": "{count} Mitglieder",
+    },
+    "es": {
+        "common": {"hello": "hello {user}!", "bye": "Adiós", "ok": "OK", "emoji": "👋"},
+        "embed": {"title": "Ajustes de {name}", "description": "Una descripción"},
+        "count": "{count} miembros",
+        "list": ["a"],
+    },
+    "translation_stats": {"en": {"total": 5, "missingKeys": []}},
+}
+
+# Captured by running the scripts as they were before locale_engine existed
+EXPECTED = {
+    "validate_locales.py": (1, """\
+English file has 7 keys
+
+[OK] de.json: All keys present and translated
+[FAIL] es.json: Extra 1 keys
+[FAIL] fr.json: Missing 1 keys; 1 untranslated (English stubs); Extra 1 keys
+  - Missing 1 keys: count
+  - Untranslated 1 keys (English stubs): common.bye
+
+[FAIL] Some locale files have issues
+"""),
+    "check_placeholders.py": (1, """\
+[OK] de.json: All placeholders preserved
+[OK] es.json: All placeholders preserved
+[FAIL] fr.json has placeholder issues:
+  - common.hello: missing {'user'}, extra {'usr'}
+  - embed.title: missing {'name'}, extra set()
+[OK] translation_stats.json: All placeholders preserved
+
+[FAIL] Some placeholders are missing or incorrect
+"""),
+    "check_english.py": (1, """\
+[OK] de.json: No untranslated English text detected
+[OK] es.json: No untranslated English text detected
+[FAIL] fr.json has potential untranslated English text:
+  - common.bye: 'Goodbye' (exact match)
+[OK] translation_stats.json: No untranslated English text detected
+
+[FAIL] Some translation files may contain untranslated English text
+"""),
+    "check_lengths.py": (1, """\
+Found 2 potential length issues:
+  - fr.json: embed.title (271 chars) may exceed title limit (256)
+  - fr.json: embed.description (1100 chars) exceeds field_value limit (1024)
+"""),
+    "check_complete.py": (0, """\
+[COMPLETE] de.json: 100% complete (7/7 keys translated)
+
+[INFO] 1 translation file(s) are complete:
+  - de.json (7 keys)
+"""),
+}
+
+
+@pytest.fixture
+def locale_dir(tmp_path):
+    for lang, data in {"en": EN, **LOCALES}.items():
+        (tmp_path / f"{lang}.json").write_text(json.dumps(data, ensure_ascii=False, indent=2),
+                                               encoding='utf-8')
+    return tmp_path
+
+
+def _run(locale_dir, script, *args):
+    env = dict(os.environ, PYTHONPATH=str(REPO), PYTHONHASHSEED="0")
+    result = subprocess.run([sys.executable, str(REPO / script), *args], cwd=locale_dir,
+                            env=env, capture_output=True, text=True, encoding='utf-8')
+    return result.returncode, result.stdout
+
+
+@pytest.mark.parametrize("script", sorted(EXPECTED))
+def test_script_output_matches_original(locale_dir, script):
+    assert _run(locale_dir, script) == EXPECTED[script]
+
+
+@pytest.mark.parametrize("extra", [[], ["--similarity", "0.8"]])
+def test_jobs_output_matches_serial_run(locale_dir, extra):
+    serial = _run(locale_dir, "locale_engine.py", "--no-cache", "--jobs", "1", *extra)
+    assert serial[0] == 1
+    assert "[FAIL] fr.json" in serial[1]
+    assert _run(locale_dir, "locale_engine.py", "--no-cache", "--jobs", "4", *extra) == serial
+
+
+@pytest.mark.parametrize("args", [["--since", "HEAD"], ["--jobs", "2"]])
+@pytest.mark.parametrize("output_format", ["ndjson", "sarif"])
+def test_streaming_formats_reject_unsupported_options(args, output_format, capsys):
+    with pytest.raises(SystemExit) as exc_info:
+        main(["--format", output_format, *args])
+    assert exc_info.value.code == 2
+    assert f"{args[0]} cannot be combined with --format {output_format}" in capsys.readouterr().err
@@ -0,0 +1,60 @@
+"""--since runs must report what a full run reports"""
+import json
+import subprocess
+from locale_engine import CHECK_ORDER, run_checks
+from locale_incremental import run_incremental_checks, verdict_store
+from locale_watch import LocaleWatcher
+
+WELCOME = "Welcome to the moderation dashboard for servers"
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def _git(tmp_path, *args):
+    subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+
+def _repo(tmp_path):
+    """A repo whose en.json then gains a value fr.json's b is a near-duplicate of"""
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "config", "user.email", "test@example.com")
+    _git(tmp_path, "config", "user.name", "test")
+    _write(tmp_path / "en.json", {"a": "Open the settings panel",
+                                  "b": "Something completely different here"})
+    _write(tmp_path / "fr.json", {"a": "Ouvrir le panneau des paramètres",
+                                  "b": "Welcome to the moderation dashboard for server"})
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+
+
+def test_since_with_similarity_matches_full_run(tmp_path, capsys):
+    _repo(tmp_path)
+    verdicts = verdict_store(tmp_path / "cache")
+    # Store the base verdicts, then change en.json so only a differs
+    run_incremental_checks(CHECK_ORDER, "HEAD", tmp_path, verdicts=verdicts, similarity=0.8)
+    capsys.readouterr()
+    _write(tmp_path / "en.json", {"a": WELCOME, "b": "Something completely different here"})
+
+    incremental = run_incremental_checks(CHECK_ORDER, "HEAD", tmp_path, verdicts=verdicts,
+                                         headers=True, similarity=0.8)
+    since_output = capsys.readouterr().out
+    full = run_checks(CHECK_ORDER, tmp_path, headers=True, similarity=0.8)
+    full_output = capsys.readouterr().out
+
+    assert "near-duplicate match of a" in full_output
+    assert since_output == full_output
+    assert incremental == full
+
+
+def test_watcher_rechecks_all_keys_when_en_changes_with_similarity(tmp_path):
+    _repo(tmp_path)
+    watcher = LocaleWatcher(tmp_path, debounce=0, similarity=0.8)
+    watcher.start()
+    assert ("english", "b") not in watcher.issues["fr"]
+
+    _write(tmp_path / "en.json", {"a": WELCOME, "b": "Something completely different here"})
+    watcher.stats["en"] = None  # Treat en.json as changed whatever its mtime
+    watcher.poll()
+    assert "near-duplicate match of a" in watcher.issues["fr"]["english", "b"]
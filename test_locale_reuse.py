@@ -0,0 +1,19 @@
+"""ReuseIndex suggestions for missing keys"""
+from generate_stats import english_reference
+from locale_reuse import ReuseIndex
+
+EN = {"ban": {"user": "User {id}", "reason": "Reason"}, "kick": {"user": "User {id}", "reason": "Reason"},
+      "mute": {"user": "User {id}", "reason": "Reason"}}
+
+
+def test_suggest_skips_english_stubs():
+    index = ReuseIndex(english_reference(EN))
+    index.add_locale("fr", {"ban.user": "user {name}", "kick.user": "Utilisateur {id}",
+                            "ban.reason": "Raison"})
+    assert index.suggestions("fr", ["mute.user", "mute.reason", "kick.reason", "unknown"]) == {
+        "mute.user": ("kick.user", "Utilisateur {id}"),
+        "mute.reason": ("ban.reason", "Raison"),
+        "kick.reason": ("ban.reason", "Raison"),
+    }
+    assert index.shared_english() == {"User {id}": ["ban.user", "kick.user", "mute.user"],
+                                      "Reason": ["ban.reason", "kick.reason", "mute.reason"]}
@@ -0,0 +1,114 @@
+"""locale_server's conditional and gzipped responses"""
+import gzip
+import http.client
+import json
+import os
+import threading
+import pytest
+from locale_server import accepts_gzip, make_server
+
+EN = {"greeting": "Hello", "long": "Translation " * 200}
+FR = {"greeting": "Bonjour", "long": "Traduction " * 200}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # The service also reads the current directory
+    monkeypatch.chdir(tmp_path)
+    branch = tmp_path / "main"
+    branch.mkdir()
+    for lang, data in {"en": EN, "fr": FR}.items():
+        (branch / f"{lang}.json").write_text(json.dumps(data), encoding='utf-8')
+    (branch / "translation_stats.json").write_text("{}", encoding='utf-8')
+
+    httpd = make_server([str(branch)], port=0)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    httpd.branch = branch
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(server, path, **headers):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", False),
+    ("gzip", True),
+    ("deflate, gzip;q=0.5", True),
+    ("gzip;q=0", False),
+    ("GZIP; Q=0.0, br", False),
+    ("*", True),
+    ("*;q=0", False),
+    ("gzip;q=0, *", False),
+    ("br, *;q=0.1", True),
+    ("gzip;q=oops", False),
+])
+def test_accepts_gzip(header, expected):
+    assert accepts_gzip(header) is expected
+
+
+def test_etag_and_not_modified(server):
+    status, headers, body = _get(server, "/api/tree/fr")
+    assert status == 200
+    assert json.loads(body) == FR
+    assert "Content-Encoding" not in headers
+    etag = headers["ETag"]
+
+    status, headers, body = _get(server, "/api/tree/fr", **{"If-None-Match": f'"other", {etag}'})
+    assert (status, body) == (304, b"")
+    assert headers["ETag"] == etag
+    assert headers["Vary"] == "Accept-Encoding"
+
+
+def test_gzip_has_its_own_etag(server):
+    _, plain_headers, plain = _get(server, "/api/tree/fr")
+    status, headers, body = _get(server, "/api/tree/fr", **{"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == plain
+    assert headers["ETag"] == plain_headers["ETag"][:-1] + '-gzip"'
+
+    # The plain form's ETag does not validate the gzipped one
+    status, _, _ = _get(server, "/api/tree/fr", **{"Accept-Encoding": "gzip",
+                                                   "If-None-Match": plain_headers["ETag"]})
+    assert status == 200
+    status, _, _ = _get(server, "/api/tree/fr", **{"Accept-Encoding": "gzip",
+                                                   "If-None-Match": headers["ETag"]})
+    assert status == 304
+
+
+def test_gzip_refused_with_zero_quality(server):
+    status, headers, body = _get(server, "/api/tree/fr", **{"Accept-Encoding": "gzip;q=0"})
+    assert status == 200
+    assert "Content-Encoding" not in headers
+    assert json.loads(body) == FR
+
+
+def test_changed_file_changes_the_etag(server):
+    _, headers, _ = _get(server, "/api/stats/fr")
+    path = server.branch / "fr.json"
+    path.write_text(json.dumps({"greeting": "Salut"}), encoding='utf-8')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    status, _, _ = _get(server, "/api/stats/fr", **{"If-None-Match": headers["ETag"]})
+    assert status == 200
+
+
+@pytest.mark.parametrize("path", ["/api/tree/xx", "/api/stats/translation_stats", "/api/nope"])
+def test_not_found(server, path):
+    assert _get(server, path)[0] == 404
+
+
+def test_languages(server):
+    status, _, body = _get(server, "/api/languages")
+    assert status == 200
+    assert json.loads(body) == ["en", "fr"]
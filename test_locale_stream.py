@@ -0,0 +1,65 @@
+"""The streaming flattener must give what json.load() + flatten() give"""
+import json
+from pathlib import Path
+import pytest
+from locale_engine import flatten
+from locale_stream import flatten_file, write_synthetic_locale
+
+REPO = Path(__file__).parent
+
+TRICKY = {
+    "plain": "Hello {user}",
+    "escapes": "Tab\there, \"quoted\", back\\slash, é中\U0001f600 and \\u0041",
+    "empty": "",
+    "numbers": {"int": -12, "float": 1.5e-3, "zero": 0},
+    "literals": [True, False, None],
+    "nested": {"deep": {"deeper": {"value": "x"}}, "empty": {}},
+    "list": ["a", {"b": 1}, []],
+    "unicode key ü": "v",
+}
+
+
+def _json_flatten(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return flatten(json.load(f))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64, 65536])
+def test_tricky_values_match_json_load(tmp_path, chunk_size):
+    path = tmp_path / "tricky.json"
+    path.write_text(json.dumps(TRICKY, indent=2, ensure_ascii=False), encoding='utf-8')
+    keys, strings, duplicates = flatten_file(path, chunk_size)
+    assert (keys, strings) == _json_flatten(path)
+    assert duplicates == []
+
+
+def test_repo_locales_match_json_load():
+    paths = sorted(REPO.glob("*.json"))
+    assert paths
+    for path in paths:
+        keys, strings, _ = flatten_file(path, chunk_size=4096)
+        assert (keys, strings) == _json_flatten(path), path.name
+
+
+def test_synthetic_locale_matches_json_load(tmp_path):
+    path = tmp_path / "synthetic.json"
+    write_synthetic_locale(path, 1)
+    keys, strings, _ = flatten_file(path, chunk_size=1000)
+    assert (keys, strings) == _json_flatten(path)
+
+
+def test_duplicate_keys_are_reported_with_their_location(tmp_path):
+    path = tmp_path / "dup.json"
+    path.write_text('{\n  "a": "1",\n  "b": {"c": "2", "c": "3"},\n  "a": "4"\n}\n',
+                    encoding='utf-8')
+    keys, strings, duplicates = flatten_file(path)
+    assert strings == {"a": "4", "b.c": "3"}
+    assert duplicates == [("b.c", 3, 19), ("a", 4, 3)]
+
+
+@pytest.mark.parametrize("text", ['{"a": "1",}', '{"a" "1"}', '["a"]', '{"a": "1"} x', '{"a": tru}'])
+def test_syntax_errors_raise_json_errors(tmp_path, text):
+    path = tmp_path / "bad.json"
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError):
+        flatten_file(path)